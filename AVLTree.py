@@ -8,6 +8,8 @@ class AVLTree(BST[T]):
     represent the empty tree; that is, a AVL tree must *always*
     have at least one node."""
 
+    __slots__ = ('_balance_factor',)
+
     def __init__(self, data: T, parent: Optional['AVLTree[T]'] = None):
         """Create a AVL node with the given DATA and PARENT.
         Note that DATA cannot be None."""
@@ -18,10 +20,11 @@ class AVLTree(BST[T]):
         super().__init__(data, parent)
         # Postcondition: self._invariant() (checked by superclass constructor)
 
-    def _invariant(self) -> bool:
-        """Class invariant for the AVL tree."""
+    def _node_invariant(self) -> bool:
+        """Class invariant for a single node of the AVL tree.  BST's
+        _invariant() checks it for every node in the tree."""
         # The AVL tree has to be a valid BST
-        valid: bool = super()._invariant() 
+        valid: bool = super()._node_invariant() 
         
         # Check the balance factor
         valid = valid and (-1 <= self._balance_factor <= 1)
@@ -40,22 +43,21 @@ class AVLTree(BST[T]):
         
         return valid
 
+    def _finish_built_node(self) -> None:
+        """Set up the cached data of a node built by from_sorted(), once
+        both of its subtrees are finished, including its balance factor."""
+        super()._finish_built_node()
+        leftHeight: int = 0 if self._left is None else self._left.height()
+        rightHeight: int = 0 if self._right is None else self._right.height()
+        self._balance_factor = leftHeight - rightHeight
+
     # Mutator methods
     def add(self, value: T) -> None:
         """Add a value to the tree, inserting in its proper place."""
-        if value < self.data(): # type: ignore
-            if self.hasLeftChild(): # Recursive 
-                cast(AVLTree[T], self.leftChild()).add(value)
-            else:
-                self._left = AVLTree[T](value, self)
-                self._left._update_balance()
-        elif value > self.data(): # type: ignore
-            if self.hasRightChild(): # Recursive 
-                cast(AVLTree[T], self.rightChild()).add(value)
-            else:
-                self._right = AVLTree[T](value, self)
-                self._right._update_balance()
-        # Elif value == self.data(), don't re-insert it.
+        newNode: Optional[BST[T]] = self._addLeaf(value)
+        if newNode is not None:
+            cast(AVLTree[T], newNode)._update_balance()
+        # If newNode is None, value was already in the tree.
         # Just do nothing.
         #assert self._invariant()
 
@@ -63,18 +65,86 @@ class AVLTree(BST[T]):
         """Called after adding a node to the tree.  If self is out of
         balance (abs(child._balance_factor > 1)), rebalance it.
         Otherwise, update self's parent's balance factor, based on
-        self's."""
-        if self._balance_factor < -1 or self._balance_factor > 1:
-            self._rebalance()
-        elif not self.isRoot():
-            parent: AVLTree[T] = cast(AVLTree[T], self.parent())
-            if parent.hasLeftChild() and self is parent.leftChild():
+        self's, and continue up the tree until the change is absorbed."""
+        node: AVLTree[T] = self
+        while True:
+            if node._balance_factor < -1 or node._balance_factor > 1:
+                node._rebalance()
+                break
+            elif node.isRoot():
+                break
+            parent: AVLTree[T] = cast(AVLTree[T], node.parent())
+            if parent.hasLeftChild() and node is parent.leftChild():
                 parent._balance_factor += 1
-            else: # self is parent's right child
+            else: # node is parent's right child
                 parent._balance_factor -= 1
-                
-            if parent._balance_factor != 0:
-                parent._update_balance()
+
+            if parent._balance_factor == 0:
+                break
+            node = parent
+
+    # Removal.  BST.remove() and BST._removeThisNode() do the searching
+    # and the successor handling; the two methods below extend the cases
+    # that actually unlink a node, so that the balance factors are
+    # retraced afterwards.
+
+    def _removeLeaf(self) -> None:
+        """Remove this node, in the case that this node is a leaf, and
+        rebalance the tree above it."""
+        parent: Optional[AVLTree[T]] = cast(Optional[AVLTree[T]], self._parent)
+        fromLeft: bool = parent is not None and parent._left is self
+        super()._removeLeaf()
+        # If we get here, self wasn't the root, so parent is not None
+        cast(AVLTree[T], parent)._retrace_removal(fromLeft)
+
+    def _removeParentOfOne(self) -> None:
+        """Remove this node, in the case that this node has one child, and
+        rebalance the tree above it."""
+        # The child's balance factor comes up along with its data
+        if self.hasLeftChild():
+            child: AVLTree[T] = cast(AVLTree[T], self.leftChild())
+        else:
+            child = cast(AVLTree[T], self.rightChild())
+        super()._removeParentOfOne()
+        self._balance_factor = child._balance_factor
+        # This subtree is now one level shorter
+        if not self.isRoot():
+            parent: AVLTree[T] = cast(AVLTree[T], self.parent())
+            parent._retrace_removal(parent._left is self)
+
+    def _retrace_removal(self, fromLeft: bool) -> None:
+        """Called after one of this node's subtrees (the left one if
+        FROMLEFT, otherwise the right one) has become one level shorter.
+        Update the balance factors on the way up the tree, rotating where
+        needed, until the change in height is absorbed."""
+        node: AVLTree[T] = self
+        while True:
+            if fromLeft:
+                node._balance_factor -= 1
+            else:
+                node._balance_factor += 1
+
+            if node._balance_factor < -1 or node._balance_factor > 1:
+                # The rotation shortens this subtree, unless the taller
+                # child was itself balanced
+                if node._balance_factor < 0:
+                    tallerChild: AVLTree[T] = cast(AVLTree[T], node.rightChild())
+                else:
+                    tallerChild = cast(AVLTree[T], node.leftChild())
+                absorbed: bool = tallerChild._balance_factor == 0
+                node._rebalance() # node is still the root of the subtree
+                if absorbed:
+                    break
+            elif node._balance_factor != 0:
+                # Was balanced; one side is still as tall as before
+                break
+
+            # This subtree got shorter, so tell the parent
+            if node.isRoot():
+                break
+            parent: AVLTree[T] = cast(AVLTree[T], node.parent())
+            fromLeft = parent._left is node
+            node = parent
 
     def _rebalance(self) -> None:
         """Rebalance the tree at this node."""
@@ -123,6 +193,11 @@ class AVLTree(BST[T]):
             1 - min(0, old_child_bal)
         self._balance_factor = old_child_bal + \
             1 + max(rot_child._balance_factor, 0)
+
+        # Update the cached sizes and heights, bottom-up.  The rotated
+        # subtree's size is unchanged, but its height may not be.
+        rot_child._update_metadata()
+        self._update_ancestors()
         
         # Post:
         #assert self._invariant()
@@ -156,4 +231,9 @@ class AVLTree(BST[T]):
         old_child_bal: int = rot_child._balance_factor
         rot_child._balance_factor = self._balance_factor - 1 \
             - max(0, old_child_bal)
-        self._balance_factor = old_child_bal - 1 + min(0, rot_child._balance_factor)
\ No newline at end of file
+        self._balance_factor = old_child_bal - 1 + min(0, rot_child._balance_factor)
+
+        # Update the cached sizes and heights, bottom-up.  The rotated
+        # subtree's size is unchanged, but its height may not be.
+        rot_child._update_metadata()
+        self._update_ancestors()
@@ -1,4 +1,4 @@
-from typing import cast, List, Optional, TypeVar
+from typing import cast, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 from BinTree import BinTree
 
 T = TypeVar('T') # Must support comparisons
@@ -9,17 +9,18 @@ class BST(BinTree[T]):
     that is, a binary search tree must *always*
     have at least one node."""
 
+    __slots__ = ()  # No attributes beyond BinTree's
+
     def __init__(self, data: T, parent: Optional['BST[T]'] = None):
         """Create a BST node with the given DATA and PARENT.
         Note that DATA cannot be None."""
-        self._parent: Optional[BST[T]] = parent
-
-        super().__init__(data)
+        super().__init__(data, parent)
         # Post: self._invariant() (checked by superclass constructor)
 
-    def _invariant(self) -> bool:
-        """Class invariant."""
-        valid: bool = super()._invariant()
+    def _node_invariant(self) -> bool:
+        """The part of the class invariant that can be checked by looking
+        at this node and its immediate children only."""
+        valid: bool = BinTree._invariant(self)
         valid = valid and self._data is not None
 
         if self.hasLeftChild():
@@ -29,32 +30,78 @@ class BST(BinTree[T]):
             # Child's parent link is correct
             valid = valid and self == cast(BST, self.leftChild()).parent()
             
-            # Maximum value in the left subtree < this node's data
-            maxLeftNode: BinTree[T] = self.leftChild() # Actually a BST, but...
-            while maxLeftNode.hasRightChild():
-                maxLeftNode = maxLeftNode.rightChild()
-            valid = valid and maxLeftNode.data() < self.data() # type: ignore
-
-            # Left subtree is a BST
-            valid = valid and self.leftChild()._invariant()
-            
         if self.hasRightChild():
             # Must be a BST, not just a BinTree
             valid = valid and isinstance(self.rightChild(), BST)
 
             # Child's parent link is correct
             valid = valid and self == cast(BST, self.rightChild()).parent()
+        return valid
 
-            # Minimum value in the right subtree > this node's data
-            minRightNode: BinTree[T] = self.rightChild() # Actually  BST, but...
-            while minRightNode.hasLeftChild():
-                minRightNode = minRightNode.leftChild()
-            valid = valid and minRightNode.data() > self.data() # type: ignore
-
-            # Right subtree is a BST
-            valid = valid and self.rightChild()._invariant()
+    def _invariant(self) -> bool:
+        """Class invariant, for the whole tree rooted at this node.
+        Every node must satisfy _node_invariant(), and an inorder
+        traversal must produce strictly increasing values (which is
+        equivalent to the usual BST property).  This walks the tree
+        iteratively, so it works on trees of any depth."""
+        valid: bool = True
+        previous: Optional[BinTree[T]] = None
+        for node in self._inorder_nodes():
+            valid = valid and cast(BST[T], node)._node_invariant()
+            if previous is not None:
+                valid = valid and previous.data() < node.data() # type: ignore
+            previous = node
         return valid
 
+    # Bulk loading
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[T]) -> 'BST[T]':
+        """Build a perfectly balanced tree from VALUES, which must be in
+        increasing order, in O(n) time.  Repeated values are ignored, as
+        they are by add().  Raise a ValueError if VALUES is empty (there
+        is no empty BST) or out of order."""
+        items: List[T] = []
+        for value in values:
+            if items and not items[-1] < value: # type: ignore
+                if items[-1] == value: # Duplicate; skip it
+                    continue
+                raise ValueError('Values must be in increasing order.')
+            items.append(value)
+        if not items:
+            raise ValueError('Cannot build a tree with no values.')
+        root: BST[T] = cast(BST[T], cls._build_balanced(items, 0, len(items), None))
+        # Post:
+        assert root._invariant()
+        return root
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[T]) -> 'BST[T]':
+        """Build a perfectly balanced tree from VALUES, in any order.
+        This sorts the values, so it takes O(n log n) time.  Raise a
+        ValueError if VALUES is empty."""
+        return cls.from_sorted(sorted(values)) # type: ignore
+
+    @classmethod
+    def _build_balanced(cls, items: Sequence[T], lo: int, hi: int,
+                        parent: Optional['BST[T]']) -> Optional['BST[T]']:
+        """Build a balanced tree from items[lo:hi] as a child of PARENT,
+        and return its root (None if the slice is empty).  The recursion
+        is only O(log n) deep."""
+        if lo >= hi:
+            return None
+        mid: int = (lo + hi) // 2
+        node: BST[T] = cls(items[mid], parent)
+        node._left = cls._build_balanced(items, lo, mid, node)
+        node._right = cls._build_balanced(items, mid + 1, hi, node)
+        node._finish_built_node()
+        return node
+
+    def _finish_built_node(self) -> None:
+        """Set up the cached data of a node built by from_sorted(), once
+        both of its subtrees are finished."""
+        self._update_metadata()
+
     # Query methods are all the same as in BinTree, except...
     def isRoot(self) -> bool:
         """If the node has no parent, it's the root."""
@@ -66,22 +113,63 @@ class BST(BinTree[T]):
         assert not self.isRoot()
         return cast(BST[T], self._parent)
 
+    def _find(self, value: T) -> Optional['BST[T]']:
+        """Return the node in the tree rooted at SELF that holds VALUE,
+        or None if VALUE is not in the tree."""
+        node: Optional[BinTree[T]] = self
+        while node is not None:
+            if value == node._data:
+                return cast(BST[T], node)
+            elif value < node._data: # type: ignore
+                node = node._left
+            else:
+                node = node._right
+        return None
+
     def __contains__(self, value: T) -> bool:
         """Boolean method to figure out whether or not a given VALUE is
         in the tree rooted at SELF.  This method overloads the 'in'
         operator."""
-        inTree: bool = False
-        if value == self.data():
-            inTree = True
-        elif value < self.data(): # type: ignore
-            if self.hasLeftChild():
-                inTree = value in cast(BST[T], self.leftChild())
-            # If no left child, inTree will stay False
-        elif value > self.data(): # type: ignore
-            if self.hasRightChild():
-                inTree = value in cast(BST[T], self.rightChild())
-            # If no right child, inTree will stay False
-        return inTree
+        return self._find(value) is not None
+
+    # Order statistics.  These use the subtree sizes cached by BinTree, so
+    # each runs in O(height) time.
+
+    def rank(self, value: T) -> int:
+        """Return the number of values in the tree that are less than
+        VALUE.  VALUE does not have to be in the tree."""
+        result: int = 0
+        node: Optional[BinTree[T]] = self
+        while node is not None:
+            if value <= node._data: # type: ignore
+                node = node._left
+            else:
+                # This node and its whole left subtree are less than VALUE
+                result += 1
+                if node._left is not None:
+                    result += node._left._size
+                node = node._right
+        return result
+
+    def select(self, k: int) -> T:
+        """Return the K-th smallest value in the tree, counting from 0.
+        Raise an IndexError if K is not in range(len(self))."""
+        if not (0 <= k < len(self)):
+            raise IndexError('Index ' + str(k) + ' out of range')
+        node: BinTree[T] = self
+        while True:
+            leftSize: int = 0 if node._left is None else node._left._size
+            if k < leftSize:
+                node = cast(BinTree[T], node._left)
+            elif k == leftSize:
+                return node.data()
+            else:
+                k -= leftSize + 1
+                node = cast(BinTree[T], node._right)
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """Return the number of values v in the tree with lo <= v < hi."""
+        return max(0, self.rank(hi) - self.rank(lo))
 
     def findSuccessor(self) -> Optional['BST[T]']:
         """Find this node's successor in an inorder traversal of the tree.
@@ -111,52 +199,196 @@ class BST(BinTree[T]):
         then L < S.  But L is still in N's right subtree, so then S
         wouldn't be the smallest node in N's right subtree.  So S can't
         possibly have two children (it might have one, a right child).
+
+        If N has no right child, S is above N: it is the first ancestor
+        of N that has N in its *left* subtree.  So we follow the parent
+        links up for as long as we're coming from a right child.  This
+        doesn't change the tree, and a whole inorder walk done this way
+        takes amortized O(1) time per step.
         """
-        # Successor node S
-        successor: Optional[BST[T]] = None
-        if self.hasRightChild():
-            successor = cast(BST, self.rightChild()) # Root of N's right subtree
-            # Follow down S's left subtree to find the smallest node in N's
-            # right subtree
-            while successor.hasLeftChild():
-                successor = cast(BST, successor.leftChild())
-        # At this point, we know self has no right subtree, so its successor
-        # can't be in its right subtree.  Therefore, we have to go upwards.
-        # If self is root and has no right subtree, it has no successor.
-        elif not self.isRoot():
-            # If self is in its parent's left subtree, its parent is its
-            # successor.
-            if self.parent().hasLeftChild() and self is self.parent().leftChild():
-                successor = self.parent()
+        return self._successorNode()
+
+    def findPredecessor(self) -> Optional['BST[T]']:
+        """Find this node's predecessor in an inorder traversal of the tree.
+        If this is the first node in an inorder traversal, return None.
+        This is the mirror image of findSuccessor()."""
+        return self._predecessorNode()
+
+    def _successorNode(self, top: Optional['BST[T]'] = None) -> Optional['BST[T]']:
+        """Return this node's inorder successor within the subtree rooted
+        at TOP (the whole tree, if TOP is None), or None if there isn't
+        one."""
+        node: BinTree[T] = self
+        if node._right is not None:
+            # Smallest node in the right subtree
+            node = node._right
+            while node._left is not None:
+                node = node._left
+            return cast(BST[T], node)
+        # Go up until we come from a left child
+        while node is not top and node._parent is not None:
+            parent: BinTree[T] = node._parent
+            if parent._left is node:
+                return cast(BST[T], parent)
+            node = parent
+        return None
+
+    def _predecessorNode(self, top: Optional['BST[T]'] = None) -> Optional['BST[T]']:
+        """Return this node's inorder predecessor within the subtree rooted
+        at TOP (the whole tree, if TOP is None), or None if there isn't
+        one."""
+        node: BinTree[T] = self
+        if node._left is not None:
+            # Largest node in the left subtree
+            node = node._left
+            while node._right is not None:
+                node = node._right
+            return cast(BST[T], node)
+        # Go up until we come from a right child
+        while node is not top and node._parent is not None:
+            parent: BinTree[T] = node._parent
+            if parent._right is node:
+                return cast(BST[T], parent)
+            node = parent
+        return None
+
+    # Range queries.  These work on the subtree rooted at SELF.  They all
+    # descend the tree once, in O(height) time, and then (for irange() and
+    # cursors) step from node to node using the parent links.
+
+    def _minNode(self) -> 'BST[T]':
+        """Return the node holding the smallest value in the tree."""
+        node: BinTree[T] = self
+        while node._left is not None:
+            node = node._left
+        return cast(BST[T], node)
+
+    def _maxNode(self) -> 'BST[T]':
+        """Return the node holding the largest value in the tree."""
+        node: BinTree[T] = self
+        while node._right is not None:
+            node = node._right
+        return cast(BST[T], node)
+
+    def _ceilingNode(self, value: T, strict: bool = False) -> Optional['BST[T]']:
+        """Return the node holding the smallest value >= VALUE (> VALUE,
+        if STRICT), or None if there is no such node."""
+        result: Optional[BinTree[T]] = None
+        node: Optional[BinTree[T]] = self
+        while node is not None:
+            if value < node._data or (not strict and value == node._data): # type: ignore
+                result = node # A candidate; look for a smaller one
+                node = node._left
+            else:
+                node = node._right
+        return cast(Optional[BST[T]], result)
+
+    def _floorNode(self, value: T, strict: bool = False) -> Optional['BST[T]']:
+        """Return the node holding the largest value <= VALUE (< VALUE,
+        if STRICT), or None if there is no such node."""
+        result: Optional[BinTree[T]] = None
+        node: Optional[BinTree[T]] = self
+        while node is not None:
+            if value > node._data or (not strict and value == node._data): # type: ignore
+                result = node # A candidate; look for a larger one
+                node = node._right
+            else:
+                node = node._left
+        return cast(Optional[BST[T]], result)
+
+    def min(self) -> T:
+        """Return the smallest value in the tree."""
+        return self._minNode().data()
+
+    def max(self) -> T:
+        """Return the largest value in the tree."""
+        return self._maxNode().data()
+
+    def floor(self, value: T) -> Optional[T]:
+        """Return the largest value in the tree that is <= VALUE, or None
+        if every value in the tree is greater than VALUE."""
+        node: Optional[BST[T]] = self._floorNode(value)
+        return None if node is None else node.data()
+
+    def ceiling(self, value: T) -> Optional[T]:
+        """Return the smallest value in the tree that is >= VALUE, or None
+        if every value in the tree is less than VALUE."""
+        node: Optional[BST[T]] = self._ceilingNode(value)
+        return None if node is None else node.data()
+
+    def irange(self, lo: Optional[T] = None, hi: Optional[T] = None,
+               inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[T]:
+        """Generator that yields the values v in the tree with lo <= v <= hi,
+        in increasing order (decreasing, if REVERSE).  A bound of None
+        means that side is unbounded.  INCLUSIVE says whether LO and HI
+        themselves are included.  The tree must not be modified while
+        the generator is running."""
+        node: Optional[BST[T]]
+        if not reverse:
+            if lo is None:
+                node = self._minNode()
+            else:
+                node = self._ceilingNode(lo, strict=not inclusive[0])
+            while node is not None:
+                value: T = node.data()
+                if hi is not None and (value > hi or (value == hi and not inclusive[1])): # type: ignore
+                    break
+                yield value
+                node = node._successorNode(self)
+        else:
+            if hi is None:
+                node = self._maxNode()
             else:
-                # Self must be in its parent's right subtree, which means
-                # self must be the largest item in its parent's right subtree
-                # (if it weren't the largest, self would have a right subtree).
-                # Its successor will be its parent's successor *excluding*
-                # self (and self's descendants in the parent's right subtree).
-
-                # Temporarily remove self (and its descendants) from the tree
-                self.parent()._right = None
-                successor = self.parent().findSuccessor()
-                # Now, put self back to avoid fouling up the tree
-                self.parent()._right = self
-        return successor
+                node = self._floorNode(hi, strict=not inclusive[1])
+            while node is not None:
+                value = node.data()
+                if lo is not None and (value < lo or (value == lo and not inclusive[0])): # type: ignore
+                    break
+                yield value
+                node = node._predecessorNode(self)
+
+    def cursor(self, value: Optional[T] = None, reverse: bool = False) -> 'BSTCursor[T]':
+        """Return a cursor on the tree, positioned at the smallest value
+        >= VALUE (or, if REVERSE, the largest value <= VALUE).  If VALUE
+        is None, the cursor starts at the smallest (largest) value."""
+        node: Optional[BST[T]]
+        if value is None:
+            node = self._maxNode() if reverse else self._minNode()
+        elif reverse:
+            node = self._floorNode(value)
+        else:
+            node = self._ceilingNode(value)
+        return BSTCursor[T](self, node)
 
     # Mutator methods
+    def _addLeaf(self, value: T) -> Optional['BST[T]']:
+        """Insert VALUE as a new leaf in its proper place, and return the
+        new node.  The new node has the same class as SELF.  If VALUE is
+        already in the tree, do nothing and return None."""
+        node: BST[T] = self
+        newNode: Optional[BST[T]] = None
+        while newNode is None:
+            if value < node.data(): # type: ignore
+                if node._left is None:
+                    newNode = type(self)(value, node)
+                    node._left = newNode
+                else:
+                    node = cast(BST[T], node._left)
+            elif value > node.data(): # type: ignore
+                if node._right is None:
+                    newNode = type(self)(value, node)
+                    node._right = newNode
+                else:
+                    node = cast(BST[T], node._right)
+            else: # value == node.data(), don't re-insert it.
+                return None
+        node._update_ancestors()
+        return newNode
+
     def add(self, value: T) -> None:
         """Add a value to the tree, inserting in its proper place."""
-        if value < self.data(): # type: ignore
-            if self.hasLeftChild(): # Recursive 
-                cast(BST[T], self.leftChild()).add(value)
-            else:
-                self._left = BST[T](value, self)
-        elif value > self.data(): # type: ignore
-            if self.hasRightChild(): # Recursive 
-                cast(BST[T], self.rightChild()).add(value)
-            else:
-                self._right = BST[T](value, self)
-        # Elif value == self.data(), don't re-insert it.
-        # Just do nothing.
+        self._addLeaf(value)
         assert self._invariant()
 
     def _removeLeaf(self) -> None:
@@ -165,13 +397,17 @@ class BST(BinTree[T]):
         assert (not self.hasLeftChild()) and (not self.hasRightChild())
         if self.isRoot():
             raise ValueError('Cannot delete the last node in the tree.')
-        elif self == self.parent().leftChild():
-            self.parent()._left = None
-        elif self == self.parent().rightChild():
-            self.parent()._right = None
+        parent: BST[T] = self.parent()
+        if parent.hasLeftChild() and self is parent.leftChild():
+            parent._left = None
+        elif parent.hasRightChild() and self is parent.rightChild():
+            parent._right = None
+        parent._update_ancestors()
         # Make this node the empty tree, so we know not to apply
         # the postcondition
         self._data = None
+        self._parent = None
+        self._update_metadata()
         # Post
         assert self._data is None
         # and no references to the current node remain in the tree
@@ -195,6 +431,7 @@ class BST(BinTree[T]):
         self._right = child._right
         if self._right is not None:
             cast(BST, self._right)._parent = self
+        self._update_ancestors()
         # Post:
         assert self.data() == child.data() \
             and self._left == child._left and self._right == child._right \
@@ -215,29 +452,61 @@ class BST(BinTree[T]):
         # Copy this node's successor to this node, and remove
         #     the successor from this node's right subtree
         else: 
-            successor_data: T = cast(BST, self.findSuccessor()).data()
-            self._data = successor_data
-            # Remove it from the right subtree
-            cast(BST, self.rightChild()).remove(successor_data)
+            successor: BST[T] = cast(BST[T], self.findSuccessor())
+            self._data = successor.data()
+            # Remove it from the right subtree.  The successor has
+            # at most one child, so this can't come back here.
+            successor._removeThisNode()
 
     def remove(self, value: T) -> None:
         """Function to remove the given VALUE from the tree, and
         return the root of the resulting tree.  The tricky part here
         is making sure to preserve the BST property of the tree.
         Raise a ValueError if VALUE is not present."""
-        if value < self.data(): # type: ignore
-            # Check the left subtree, if it exists
-            if self.hasLeftChild():
-                cast(BST[T], self.leftChild()).remove(value)
-            else: # No subtree, value isn't here
-                raise ValueError('Value ' + str(value) + ' not in tree')
-        elif value > self.data(): # type: ignore
-            # Check the right subtree, if it exists
-            if self.hasRightChild():
-                cast(BST[T], self.rightChild()).remove(value)
-            else: # No subtree, value isn't here
-                raise ValueError('Value ' + str(value) + ' not in tree')
-        else: # value == self.data(), remove this node
-            self._removeThisNode()
+        node: Optional[BST[T]] = self._find(value)
+        if node is None: # Value isn't here
+            raise ValueError('Value ' + str(value) + ' not in tree')
+        node._removeThisNode()
         # Post:
         assert (self._data is None) or (value not in self and self._invariant())
+
+
+class BSTCursor(Generic[T]):
+    """Class to represent a position in a BST, which can move to the
+    next or previous value in order.  Each move takes amortized O(1)
+    time, using the parent links; the tree itself is never changed.
+    Changing the tree (with add() or remove()) invalidates its cursors.
+    Create a cursor with BST.cursor()."""
+
+    __slots__ = ('_tree', '_node')
+
+    def __init__(self, tree: BST[T], node: Optional[BST[T]]):
+        """Create a cursor on the tree rooted at TREE, positioned at NODE.
+        If NODE is None, the cursor is off the end of the tree."""
+        self._tree: BST[T] = tree
+        self._node: Optional[BST[T]] = node
+
+    def isValid(self) -> bool:
+        """Query method that returns True when the cursor is positioned
+        at a value (that is, it hasn't moved off either end)."""
+        return self._node is not None
+
+    def value(self) -> T:
+        """Query method that returns the value at the cursor."""
+        if self._node is None:
+            raise ValueError('Cursor is not positioned at a value.')
+        return self._node.data()
+
+    def moveNext(self) -> bool:
+        """Move to the next larger value.  Return True if there was one;
+        otherwise the cursor becomes invalid and stays that way."""
+        if self._node is not None:
+            self._node = self._node._successorNode(self._tree)
+        return self._node is not None
+
+    def movePrev(self) -> bool:
+        """Move to the next smaller value.  Return True if there was one;
+        otherwise the cursor becomes invalid and stays that way."""
+        if self._node is not None:
+            self._node = self._node._predecessorNode(self._tree)
+        return self._node is not None
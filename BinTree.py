@@ -1,4 +1,5 @@
-from typing import cast, Generic, List, Optional, Sized, TypeVar
+from collections import deque
+from typing import cast, Deque, Generic, Iterator, List, Optional, Sized, TypeVar
 
 T = TypeVar('T')
 
@@ -9,11 +10,20 @@ class BinTree(Generic[T], Sized):
     represented *either* by a node with no children and the
     data set to None, *or* by None itself."""
 
-    def __init__(self, data: Optional[T] = None):
-        """Construct an empty tree."""
+    # No per-node __dict__; trees can have a great many nodes
+    __slots__ = ('_data', '_left', '_right', '_parent', '_size', '_height')
+
+    def __init__(self, data: Optional[T] = None,
+                 parent: Optional['BinTree[T]'] = None):
+        """Construct a tree containing DATA (an empty tree if DATA is None),
+        optionally as a child of PARENT."""
         self._data: Optional[T] = data
         self._left: Optional[BinTree[T]] = None
         self._right: Optional[BinTree[T]] = None
+        self._parent: Optional[BinTree[T]] = parent
+        # Cached subtree metadata, kept up to date by the mutators
+        self._size: int = 0 if data is None else 1
+        self._height: int = self._size
         assert self._invariant()
 
     # Internal methods
@@ -22,9 +32,50 @@ class BinTree(Generic[T], Sized):
         """Class invariant.  Effectively, this asserts that either
         self is an empty tree (_data, _left, and _right are all None) or
         self is a node within a tree (_data is not None)."""        
-        return (self._data is not None) or \
+        valid: bool = (self._data is not None) or \
             (self._data is None and self._left is None
                  and self._right is None)
+        # The cached size and height agree with the children's
+        valid = valid and self._size == self._computed_size() \
+            and self._height == self._computed_height()
+        return valid
+
+    def _computed_size(self) -> int:
+        """Compute the size of this subtree from the cached sizes of
+        the children."""
+        result: int = 0
+        if not self.isEmpty():
+            result = 1
+            if self._left is not None:
+                result += self._left._size
+            if self._right is not None:
+                result += self._right._size
+        return result
+
+    def _computed_height(self) -> int:
+        """Compute the height of this subtree from the cached heights of
+        the children."""
+        result: int = 0
+        if not self.isEmpty():
+            leftHeight: int = 0 if self._left is None else self._left._height
+            rightHeight: int = 0 if self._right is None else self._right._height
+            result = 1 + max(leftHeight, rightHeight)
+        return result
+
+    def _update_metadata(self) -> None:
+        """Recompute the cached size and height of this node from its
+        children.  The children's metadata must already be correct."""
+        self._size = self._computed_size()
+        self._height = self._computed_height()
+
+    def _update_ancestors(self) -> None:
+        """Recompute the cached metadata of this node and of every node
+        on the path from it up to the root.  Called after any change to
+        the structure of the subtree rooted at this node."""
+        node: Optional[BinTree[T]] = self
+        while node is not None:
+            node._update_metadata()
+            node = node._parent
 
     # Query methods
 
@@ -62,33 +113,15 @@ class BinTree(Generic[T], Sized):
         return cast(BinTree[T], self._right)
 
     def __len__(self) -> int:
-        """Find the number of nodes in the tree."""
-        result: int = 0 # Handles the case of an empty tree
-        if not self.isEmpty():
-            result = 1 # Current node
-            if self.hasLeftChild():
-                result = result + len(self.leftChild())
-            if self.hasRightChild(): # not elif!
-                result = result + len(self.rightChild())
-        return result
+        """Find the number of nodes in the tree.  Runs in constant time,
+        since every node caches the size of its subtree."""
+        return self._size
 
     def height(self) -> int:
-        """Find the height of the tree."""
-        result: int = 0 # Handles the case of an empty tree
-        if not self.isEmpty():
-            result = 1 # Current node
-            
-            leftSubtreeHeight: int = 0
-            if self.hasLeftChild():
-                leftSubtreeHeight = self.leftChild().height()
+        """Find the height of the tree.  Runs in constant time, since
+        every node caches the height of its subtree."""
+        return self._height
 
-            rightSubtreeHeight: int = 0
-            if self.hasRightChild():
-                rightSubtreeHeight = self.rightChild().height()
-
-            result += max(leftSubtreeHeight, rightSubtreeHeight)
-        return result
-            
     # Mutator methods
 
     def addLeft(self, item: T) -> None:
@@ -98,9 +131,13 @@ class BinTree(Generic[T], Sized):
         if self.isEmpty():
             self._data = item
         else:
-            newNode: BinTree[T] = BinTree[T](item)
+            newNode: BinTree[T] = BinTree[T](item, self)
             newNode._left = self._left
+            if newNode._left is not None:
+                newNode._left._parent = newNode
             self._left = newNode
+            newNode._update_metadata()
+        self._update_ancestors()
         # Post:
         assert self._invariant()
 
@@ -111,9 +148,13 @@ class BinTree(Generic[T], Sized):
         if self.isEmpty():
             self._data = item
         else:
-            newNode: BinTree[T] = BinTree[T](item)
+            newNode: BinTree[T] = BinTree[T](item, self)
             newNode._right = self._right
+            if newNode._right is not None:
+                newNode._right._parent = newNode
             self._right = newNode
+            newNode._update_metadata()
+        self._update_ancestors()
         # Post:
         assert self._invariant()
 
@@ -121,7 +162,10 @@ class BinTree(Generic[T], Sized):
         """Remove the current node's left child.  If the left child has
         children, they are removed from the tree as well.  If
         the current node has no left child, do nothing."""
+        if self._left is not None:
+            self._left._parent = None
         self._left = None
+        self._update_ancestors()
         # Post:
         (self._left is None) and self._invariant()
 
@@ -129,43 +173,110 @@ class BinTree(Generic[T], Sized):
         """Remove the current node's right child.  If the right child
         has children, they are removed from the tree as well.  If
         the current node has no right child, do nothing."""
+        if self._right is not None:
+            self._right._parent = None
         self._right = None
+        self._update_ancestors()
         # Post:
         (self._right is None) and self._invariant()
 
     # Traversals
+    #
+    # The iter_* methods are generators that walk the tree with an explicit
+    # stack instead of recursion, so they yield values lazily, use O(height)
+    # extra space (O(width) for level order), and work on arbitrarily deep
+    # trees.  The tree must not be modified while one of them is running.
+    # The list-returning methods are kept for convenience.
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the values in the tree, in inorder."""
+        return self.iter_inorder()
+
+    def iter_preorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree, ordered by a
+        depth-first preorder traversal."""
+        if self.isEmpty():
+            return
+        stack: List[BinTree[T]] = [self]
+        while stack:
+            node: BinTree[T] = stack.pop()
+            yield cast(T, node._data)
+            # Push the right child first, so the left child is visited first
+            if node._right is not None:
+                stack.append(node._right)
+            if node._left is not None:
+                stack.append(node._left)
+
+    def _inorder_nodes(self) -> Iterator['BinTree[T]']:
+        """Generator that yields the nodes (not the values) of the tree,
+        ordered by a depth-first inorder traversal."""
+        stack: List[BinTree[T]] = []
+        node: Optional[BinTree[T]] = None if self.isEmpty() else self
+        while stack or node is not None:
+            # Go as far left as possible, remembering the path
+            while node is not None:
+                stack.append(node)
+                node = node._left
+            node = stack.pop()
+            yield node
+            node = node._right
+
+    def iter_inorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree, ordered by a
+        depth-first inorder traversal."""
+        for node in self._inorder_nodes():
+            yield cast(T, node._data)
+
+    def iter_postorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree, ordered by a
+        depth-first postorder traversal."""
+        stack: List[BinTree[T]] = []
+        node: Optional[BinTree[T]] = None if self.isEmpty() else self
+        last_visited: Optional[BinTree[T]] = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node._left
+            else:
+                top: BinTree[T] = stack[-1]
+                # Visit the right subtree before the node itself, unless
+                # we've just come back up from it
+                if top._right is not None and top._right is not last_visited:
+                    node = top._right
+                else:
+                    yield cast(T, top._data)
+                    last_visited = stack.pop()
+
+    def iter_levelorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree, ordered by a
+        breadth-first (level-order) traversal."""
+        if self.isEmpty():
+            return
+        queue: Deque[BinTree[T]] = deque([self])
+        while queue:
+            node: BinTree[T] = queue.popleft()
+            yield cast(T, node._data)
+            if node._left is not None:
+                queue.append(node._left)
+            if node._right is not None:
+                queue.append(node._right)
+
     def preorder(self) -> List[T]:
         """Create and return a list of the values in the tree,
         ordered by a depth-first preorder traversal."""
-        result: List[T] = []
-        if not self.isEmpty():
-            result.append(self.data())
-            if self.hasLeftChild():
-                result.extend(self.leftChild().preorder())
-            if self.hasRightChild():
-                result.extend(self.rightChild().preorder())
-        return result
+        return list(self.iter_preorder())
 
     def inorder(self) -> List[T]:
         """Create and return a list of the values in the tree,
         ordered by a depth-first inorder traversal."""
-        result: List[T] = []
-        if not self.isEmpty():
-            if self.hasLeftChild():
-                result.extend(self.leftChild().inorder())
-            result.append(self.data())
-            if self.hasRightChild():
-                result.extend(self.rightChild().inorder())
-        return result
+        return list(self.iter_inorder())
 
     def postorder(self) -> List[T]:
         """Create and return a list of the values in the tree,
         ordered by a depth-first postorder traversal."""
-        result: List[T] = []
-        if not self.isEmpty():
-            if self.hasLeftChild():
-                result.extend(self.leftChild().postorder())
-            if self.hasRightChild():
-                result.extend(self.rightChild().postorder())
-            result.append(self.data())
-        return result
+        return list(self.iter_postorder())
+
+    def levelorder(self) -> List[T]:
+        """Create and return a list of the values in the tree,
+        ordered by a breadth-first (level-order) traversal."""
+        return list(self.iter_levelorder())
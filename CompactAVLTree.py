@@ -0,0 +1,562 @@
+from array import array
+from collections import deque
+from typing import Any, cast, Deque, Generic, Iterable, Iterator, List, \
+    MutableSequence, Optional, Sized, Tuple, TypeVar
+
+T = TypeVar('T') # Must support comparisons
+
+NIL: int = -1   # Index used in place of a missing node
+
+class CompactAVLTree(Generic[T], Sized):
+    """Class to represent an AVL tree whose nodes are stored compactly.
+    Instead of one Python object per node, the tree keeps parallel arrays
+    indexed by node number: the keys, the indices of each node's left
+    child, right child and parent (NIL for none), and each node's subtree
+    size and height (from which the balance factors are computed).  Slots
+    freed by remove() are kept on a free list and reused by add().
+
+    If the keys are all numbers of one kind, pass the matching array
+    TYPECODE (such as 'q' or 'd') and the keys are stored unboxed too;
+    otherwise they are kept in an ordinary list.  Either way, a node costs
+    a few dozen bytes rather than the few hundred of an AVLTree node.
+
+    The public interface matches that of AVLTree (add, remove, in, len,
+    height, traversals, order statistics, range queries and cursors),
+    except that there are no node objects to hand out, and this tree may
+    be empty."""
+
+    def __init__(self, data: Optional[T] = None, typecode: Optional[str] = None):
+        """Create a tree containing DATA, or an empty tree if DATA is None.
+        TYPECODE, if given, is the array typecode used to store the keys."""
+        self._typecode: Optional[str] = typecode
+        self._keys: MutableSequence[Any] = [] if typecode is None else array(typecode)
+        self._left: array = array('i')
+        self._right: array = array('i')
+        self._parent: array = array('i')
+        self._size: array = array('i')
+        self._height: array = array('b')
+        self._root: int = NIL
+        self._free: int = NIL   # Free slots are chained through _left
+        if data is not None:
+            self.add(data)
+        assert self._invariant()
+
+    # Internal methods
+
+    def _invariant(self) -> bool:
+        """Class invariant: the parent links, sizes and heights are
+        consistent, every node is balanced, and an inorder traversal
+        produces strictly increasing keys."""
+        valid: bool = self._root == NIL or self._parent[self._root] == NIL
+        previous: Optional[int] = None
+        node: int = self._first(self._root)
+        while node != NIL:
+            left: int = self._left[node]
+            right: int = self._right[node]
+            for child in (left, right):
+                valid = valid and (child == NIL or self._parent[child] == node)
+            valid = valid and self._size[node] == \
+                1 + self._sizeOf(left) + self._sizeOf(right)
+            valid = valid and self._height[node] == \
+                1 + max(self._heightOf(left), self._heightOf(right))
+            valid = valid and -1 <= self._balance(node) <= 1
+            if previous is not None:
+                valid = valid and self._keys[previous] < self._keys[node]
+            previous = node
+            node = self._next(node)
+        return valid
+
+    def _heightOf(self, node: int) -> int:
+        """Height of the subtree rooted at NODE (0 for NIL)."""
+        return 0 if node == NIL else self._height[node]
+
+    def _sizeOf(self, node: int) -> int:
+        """Size of the subtree rooted at NODE (0 for NIL)."""
+        return 0 if node == NIL else self._size[node]
+
+    def _balance(self, node: int) -> int:
+        """Balance factor of NODE: left height minus right height."""
+        return self._heightOf(self._left[node]) - self._heightOf(self._right[node])
+
+    def _update(self, node: int) -> None:
+        """Recompute the size and height of NODE from its children."""
+        left: int = self._left[node]
+        right: int = self._right[node]
+        self._size[node] = 1 + self._sizeOf(left) + self._sizeOf(right)
+        self._height[node] = 1 + max(self._heightOf(left), self._heightOf(right))
+
+    def _newNode(self, key: T, parent: int) -> int:
+        """Allocate a leaf holding KEY with the given PARENT, reusing a free
+        slot if there is one, and return its index."""
+        if self._free != NIL:
+            node: int = self._free
+            self._free = self._left[node]
+            self._keys[node] = key
+            self._left[node] = NIL
+            self._right[node] = NIL
+            self._parent[node] = parent
+            self._size[node] = 1
+            self._height[node] = 1
+        else:
+            node = len(self._keys)
+            self._keys.append(key)
+            self._left.append(NIL)
+            self._right.append(NIL)
+            self._parent.append(parent)
+            self._size.append(1)
+            self._height.append(1)
+        return node
+
+    def _freeNode(self, node: int) -> None:
+        """Put the slot of NODE, already unlinked from the tree, on the
+        free list."""
+        if self._typecode is None:
+            self._keys[node] = None # Don't keep the key object alive
+        self._left[node] = self._free
+        self._free = node
+
+    def _replaceChild(self, parent: int, old: int, new: int) -> None:
+        """Make NEW take OLD's place as a child of PARENT (or as the root,
+        if PARENT is NIL)."""
+        if parent == NIL:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+        if new != NIL:
+            self._parent[new] = parent
+
+    def _rotateLeft(self, node: int) -> int:
+        """Rotate left at NODE, and return the new root of the subtree."""
+        child: int = self._right[node]
+        inner: int = self._left[child]
+        self._replaceChild(self._parent[node], node, child)
+        self._right[node] = inner
+        if inner != NIL:
+            self._parent[inner] = node
+        self._left[child] = node
+        self._parent[node] = child
+        self._update(node)
+        self._update(child)
+        return child
+
+    def _rotateRight(self, node: int) -> int:
+        """Rotate right at NODE, and return the new root of the subtree."""
+        child: int = self._left[node]
+        inner: int = self._right[child]
+        self._replaceChild(self._parent[node], node, child)
+        self._left[node] = inner
+        if inner != NIL:
+            self._parent[inner] = node
+        self._right[child] = node
+        self._parent[node] = child
+        self._update(node)
+        self._update(child)
+        return child
+
+    def _rebalance(self, node: int) -> int:
+        """Update NODE's size and height, rotating if it is out of balance.
+        Return the root of the subtree that now stands where NODE was."""
+        balance: int = self._balance(node)
+        if balance > 1:
+            if self._balance(self._left[node]) < 0:
+                self._rotateLeft(self._left[node])
+            return self._rotateRight(node)
+        elif balance < -1:
+            if self._balance(self._right[node]) > 0:
+                self._rotateRight(self._right[node])
+            return self._rotateLeft(node)
+        self._update(node)
+        return node
+
+    def _retrace(self, node: int) -> None:
+        """Rebalance and update every node from NODE up to the root."""
+        while node != NIL:
+            node = self._parent[self._rebalance(node)]
+
+    def _find(self, key: T) -> int:
+        """Return the index of the node holding KEY, or NIL."""
+        node: int = self._root
+        keys = self._keys
+        while node != NIL:
+            nodeKey = keys[node]
+            if key == nodeKey:
+                return node
+            node = self._left[node] if key < nodeKey else self._right[node]
+        return NIL
+
+    def _first(self, node: int) -> int:
+        """Index of the smallest node in the subtree rooted at NODE."""
+        if node != NIL:
+            while self._left[node] != NIL:
+                node = self._left[node]
+        return node
+
+    def _last(self, node: int) -> int:
+        """Index of the largest node in the subtree rooted at NODE."""
+        if node != NIL:
+            while self._right[node] != NIL:
+                node = self._right[node]
+        return node
+
+    def _next(self, node: int) -> int:
+        """Index of NODE's inorder successor, or NIL."""
+        if self._right[node] != NIL:
+            return self._first(self._right[node])
+        parent: int = self._parent[node]
+        while parent != NIL and self._right[parent] == node:
+            node = parent
+            parent = self._parent[node]
+        return parent
+
+    def _prev(self, node: int) -> int:
+        """Index of NODE's inorder predecessor, or NIL."""
+        if self._left[node] != NIL:
+            return self._last(self._left[node])
+        parent: int = self._parent[node]
+        while parent != NIL and self._left[parent] == node:
+            node = parent
+            parent = self._parent[node]
+        return parent
+
+    def _ceilingNode(self, key: T, strict: bool = False) -> int:
+        """Index of the node with the smallest key >= KEY (> KEY, if
+        STRICT), or NIL."""
+        result: int = NIL
+        node: int = self._root
+        while node != NIL:
+            nodeKey = self._keys[node]
+            if key < nodeKey or (not strict and key == nodeKey):
+                result = node
+                node = self._left[node]
+            else:
+                node = self._right[node]
+        return result
+
+    def _floorNode(self, key: T, strict: bool = False) -> int:
+        """Index of the node with the largest key <= KEY (< KEY, if
+        STRICT), or NIL."""
+        result: int = NIL
+        node: int = self._root
+        while node != NIL:
+            nodeKey = self._keys[node]
+            if key > nodeKey or (not strict and key == nodeKey):
+                result = node
+                node = self._right[node]
+            else:
+                node = self._left[node]
+        return result
+
+    # Bulk loading
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[T],
+                    typecode: Optional[str] = None) -> 'CompactAVLTree[T]':
+        """Build a perfectly balanced tree from VALUES, which must be in
+        increasing order, in O(n) time.  Repeated values are ignored.
+        Raise a ValueError if VALUES is out of order."""
+        tree: CompactAVLTree[T] = cls(None, typecode)
+        for value in values:
+            if tree._keys and not tree._keys[-1] < value:
+                if tree._keys[-1] == value: # Duplicate; skip it
+                    continue
+                raise ValueError('Values must be in increasing order.')
+            tree._keys.append(value)
+        # Node i holds the i-th smallest key, so only the links need building
+        n: int = len(tree._keys)
+        tree._left = array('i', [NIL]) * n
+        tree._right = array('i', [NIL]) * n
+        tree._parent = array('i', [NIL]) * n
+        tree._size = array('i', [0]) * n
+        tree._height = array('b', [0]) * n
+        tree._root = tree._buildBalanced(0, n, NIL)
+        # Post:
+        assert tree._invariant()
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[T],
+                      typecode: Optional[str] = None) -> 'CompactAVLTree[T]':
+        """Build a perfectly balanced tree from VALUES, in any order.
+        This sorts the values, so it takes O(n log n) time."""
+        return cls.from_sorted(sorted(values), typecode) # type: ignore
+
+    def _buildBalanced(self, lo: int, hi: int, parent: int) -> int:
+        """Link up nodes lo..hi-1 as a balanced subtree under PARENT, and
+        return its root (NIL if empty).  Only O(log n) deep."""
+        if lo >= hi:
+            return NIL
+        mid: int = (lo + hi) // 2
+        self._parent[mid] = parent
+        self._left[mid] = self._buildBalanced(lo, mid, mid)
+        self._right[mid] = self._buildBalanced(mid + 1, hi, mid)
+        self._update(mid)
+        return mid
+
+    # Query methods
+
+    def isEmpty(self) -> bool:
+        """Query method that returns True when the tree is empty."""
+        return self._root == NIL
+
+    def __len__(self) -> int:
+        """Find the number of values in the tree, in constant time."""
+        return self._sizeOf(self._root)
+
+    def height(self) -> int:
+        """Find the height of the tree, in constant time."""
+        return self._heightOf(self._root)
+
+    def __contains__(self, value: T) -> bool:
+        """Boolean method to figure out whether or not a given VALUE is
+        in the tree.  This method overloads the 'in' operator."""
+        return self._find(value) != NIL
+
+    def rank(self, value: T) -> int:
+        """Return the number of values in the tree that are less than
+        VALUE.  VALUE does not have to be in the tree."""
+        result: int = 0
+        node: int = self._root
+        while node != NIL:
+            if value <= self._keys[node]:
+                node = self._left[node]
+            else:
+                result += 1 + self._sizeOf(self._left[node])
+                node = self._right[node]
+        return result
+
+    def select(self, k: int) -> T:
+        """Return the K-th smallest value in the tree, counting from 0.
+        Raise an IndexError if K is not in range(len(self))."""
+        if not (0 <= k < len(self)):
+            raise IndexError('Index ' + str(k) + ' out of range')
+        node: int = self._root
+        while True:
+            leftSize: int = self._sizeOf(self._left[node])
+            if k < leftSize:
+                node = self._left[node]
+            elif k == leftSize:
+                return cast(T, self._keys[node])
+            else:
+                k -= leftSize + 1
+                node = self._right[node]
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """Return the number of values v in the tree with lo <= v < hi."""
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    def min(self) -> T:
+        """Return the smallest value in the tree."""
+        if self.isEmpty():
+            raise ValueError('Cannot get data from an empty tree.')
+        return cast(T, self._keys[self._first(self._root)])
+
+    def max(self) -> T:
+        """Return the largest value in the tree."""
+        if self.isEmpty():
+            raise ValueError('Cannot get data from an empty tree.')
+        return cast(T, self._keys[self._last(self._root)])
+
+    def floor(self, value: T) -> Optional[T]:
+        """Return the largest value in the tree that is <= VALUE, or None."""
+        node: int = self._floorNode(value)
+        return None if node == NIL else cast(T, self._keys[node])
+
+    def ceiling(self, value: T) -> Optional[T]:
+        """Return the smallest value in the tree that is >= VALUE, or None."""
+        node: int = self._ceilingNode(value)
+        return None if node == NIL else cast(T, self._keys[node])
+
+    def irange(self, lo: Optional[T] = None, hi: Optional[T] = None,
+               inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[T]:
+        """Generator that yields the values v in the tree with lo <= v <= hi,
+        in increasing order (decreasing, if REVERSE).  A bound of None
+        means that side is unbounded.  INCLUSIVE says whether LO and HI
+        themselves are included."""
+        keys = self._keys
+        node: int
+        if not reverse:
+            node = self._first(self._root) if lo is None \
+                else self._ceilingNode(lo, strict=not inclusive[0])
+            while node != NIL:
+                value = keys[node]
+                if hi is not None and (value > hi or (value == hi and not inclusive[1])):
+                    break
+                yield value
+                node = self._next(node)
+        else:
+            node = self._last(self._root) if hi is None \
+                else self._floorNode(hi, strict=not inclusive[1])
+            while node != NIL:
+                value = keys[node]
+                if lo is not None and (value < lo or (value == lo and not inclusive[0])):
+                    break
+                yield value
+                node = self._prev(node)
+
+    def cursor(self, value: Optional[T] = None,
+               reverse: bool = False) -> 'CompactAVLTreeCursor[T]':
+        """Return a cursor on the tree, positioned at the smallest value
+        >= VALUE (or, if REVERSE, the largest value <= VALUE).  If VALUE
+        is None, the cursor starts at the smallest (largest) value."""
+        node: int
+        if value is None:
+            node = self._last(self._root) if reverse else self._first(self._root)
+        elif reverse:
+            node = self._floorNode(value)
+        else:
+            node = self._ceilingNode(value)
+        return CompactAVLTreeCursor[T](self, node)
+
+    # Mutator methods
+
+    def add(self, value: T) -> None:
+        """Add a value to the tree, inserting in its proper place."""
+        if self._root == NIL:
+            self._root = self._newNode(value, NIL)
+            return
+        node: int = self._root
+        keys = self._keys
+        while True:
+            nodeKey = keys[node]
+            if value < nodeKey:
+                if self._left[node] == NIL:
+                    self._left[node] = self._newNode(value, node)
+                    break
+                node = self._left[node]
+            elif value > nodeKey:
+                if self._right[node] == NIL:
+                    self._right[node] = self._newNode(value, node)
+                    break
+                node = self._right[node]
+            else: # Already in the tree; do nothing
+                return
+        self._retrace(node)
+
+    def remove(self, value: T) -> None:
+        """Remove the given VALUE from the tree, rebalancing as needed.
+        Raise a ValueError if VALUE is not present."""
+        node: int = self._find(value)
+        if node == NIL:
+            raise ValueError('Value ' + str(value) + ' not in tree')
+        if self._left[node] != NIL and self._right[node] != NIL:
+            # Two children: move the successor's key here, and remove the
+            # successor's node instead.  It has at most one child.
+            successor: int = self._first(self._right[node])
+            self._keys[node] = self._keys[successor]
+            node = successor
+        child: int = self._left[node] if self._left[node] != NIL else self._right[node]
+        parent: int = self._parent[node]
+        self._replaceChild(parent, node, child)
+        self._freeNode(node)
+        self._retrace(parent)
+
+    # Traversals
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the values in the tree, in inorder."""
+        return self.iter_inorder()
+
+    def iter_inorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree in inorder.  Uses
+        the parent links, so needs no stack at all."""
+        return self.irange()
+
+    def iter_preorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree in preorder."""
+        stack: List[int] = [] if self._root == NIL else [self._root]
+        while stack:
+            node: int = stack.pop()
+            yield cast(T, self._keys[node])
+            if self._right[node] != NIL:
+                stack.append(self._right[node])
+            if self._left[node] != NIL:
+                stack.append(self._left[node])
+
+    def iter_postorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree in postorder."""
+        stack: List[int] = []
+        node: int = self._root
+        lastVisited: int = NIL
+        while stack or node != NIL:
+            if node != NIL:
+                stack.append(node)
+                node = self._left[node]
+            else:
+                top: int = stack[-1]
+                if self._right[top] != NIL and self._right[top] != lastVisited:
+                    node = self._right[top]
+                else:
+                    yield cast(T, self._keys[top])
+                    lastVisited = stack.pop()
+
+    def iter_levelorder(self) -> Iterator[T]:
+        """Generator that yields the values in the tree in level order."""
+        queue: Deque[int] = deque([] if self._root == NIL else [self._root])
+        while queue:
+            node: int = queue.popleft()
+            yield cast(T, self._keys[node])
+            if self._left[node] != NIL:
+                queue.append(self._left[node])
+            if self._right[node] != NIL:
+                queue.append(self._right[node])
+
+    def preorder(self) -> List[T]:
+        """Create and return a list of the values in the tree, in preorder."""
+        return list(self.iter_preorder())
+
+    def inorder(self) -> List[T]:
+        """Create and return a list of the values in the tree, in inorder."""
+        return list(self.iter_inorder())
+
+    def postorder(self) -> List[T]:
+        """Create and return a list of the values in the tree, in postorder."""
+        return list(self.iter_postorder())
+
+    def levelorder(self) -> List[T]:
+        """Create and return a list of the values in the tree, in level order."""
+        return list(self.iter_levelorder())
+
+
+class CompactAVLTreeCursor(Generic[T]):
+    """Class to represent a position in a CompactAVLTree, which can move
+    to the next or previous value in order, like a BSTCursor.  It holds
+    a node index, and each move takes amortized O(1) time, using the
+    parent links.  Changing the tree (with add() or remove())
+    invalidates its cursors.  Create a cursor with
+    CompactAVLTree.cursor()."""
+
+    __slots__ = ('_tree', '_node')
+
+    def __init__(self, tree: CompactAVLTree[T], node: int):
+        """Create a cursor on TREE, positioned at the node with index
+        NODE.  If NODE is NIL, the cursor is off the end of the tree."""
+        self._tree: CompactAVLTree[T] = tree
+        self._node: int = node
+
+    def isValid(self) -> bool:
+        """Query method that returns True when the cursor is positioned
+        at a value (that is, it hasn't moved off either end)."""
+        return self._node != NIL
+
+    def value(self) -> T:
+        """Query method that returns the value at the cursor."""
+        if self._node == NIL:
+            raise ValueError('Cursor is not positioned at a value.')
+        return cast(T, self._tree._keys[self._node])
+
+    def moveNext(self) -> bool:
+        """Move to the next larger value.  Return True if there was one;
+        otherwise the cursor becomes invalid and stays that way."""
+        if self._node != NIL:
+            self._node = self._tree._next(self._node)
+        return self._node != NIL
+
+    def movePrev(self) -> bool:
+        """Move to the next smaller value.  Return True if there was one;
+        otherwise the cursor becomes invalid and stays that way."""
+        if self._node != NIL:
+            self._node = self._tree._prev(self._node)
+        return self._node != NIL
@@ -0,0 +1,187 @@
+import threading
+from typing import ItemsView, ValuesView
+from Skiplist import Skiplist
+
+class ConcurrentSkiplist(Skiplist):
+    """A Skiplist that can be shared between threads.  Readers never take
+    a lock, so they never wait for writers; writers take one lock, so
+    only one of them changes the list at a time.
+
+    This works because a writer only ever changes a link with a single
+    assignment, which other threads see either before or after, never
+    halfway through, and it does so in a safe order:
+
+      * A new node's own next and down links are set before any other
+        node points to it, so a reader that reaches it can follow them.
+      * Deleting a node unlinks it but leaves its own next link alone,
+        so a reader standing on it can still move on along the level.
+      * A link is only ever changed to point to a node with a larger
+        key, so following next links always visits keys in order.
+
+    The readers here read each link once, into a local variable, rather
+    than the base class's "if current.next ...: current = current.next",
+    which can see two different values.  A search finds every key that
+    is in the list for the whole of the search.  Iterators and range
+    queries are weakly consistent: they never fail and never repeat a
+    key, but may or may not see changes made while they run.
+
+    The link widths that at() and index_of() use are not changed in a
+    safe order, so those two take the lock as well."""
+
+    def __init__(self, seed=None, max_level=None):
+        """Create an empty skiplist, as Skiplist does."""
+        super().__init__(seed, max_level)
+        # Reentrant, because some writers call others (e.g. delete_at()
+        # calls delete())
+        self._lock = threading.RLock()
+
+    # Writers: take the lock, and use the base class's code
+
+    def insert(self, key, value):
+        """Insert a new (key, value) pair into the skiplist.  If KEY is
+        already in the skiplist, replace its value with VALUE instead."""
+        with self._lock:
+            super().insert(key, value)
+
+    def update_sorted(self, pairs):
+        """Insert each (key, value) pair from PAIRS, as Skiplist does.
+        The lock is held for the whole batch."""
+        with self._lock:
+            super().update_sorted(pairs)
+
+    def delete(self, key):
+        """Deletes the item with key KEY from the skiplist.
+        If no such item exists, raise KeyError."""
+        with self._lock:
+            super().delete(key)
+
+    def pop_min(self):
+        """Remove the item with the smallest key, and return it as a
+        (key, value) pair.  If the skiplist is empty, raise KeyError."""
+        with self._lock:
+            return super().pop_min()
+
+    def delete_at(self, index):
+        """Remove the item at position INDEX in sorted order, and return
+        it as a (key, value) pair.  Raise IndexError if there is no such
+        position."""
+        with self._lock:
+            return super().delete_at(index)
+
+    def at(self, index):
+        """Return the key at position INDEX in sorted order."""
+        with self._lock:
+            return super().at(index)
+
+    def index_of(self, key):
+        """Return the position of KEY in sorted order."""
+        with self._lock:
+            return super().index_of(key)
+
+    def pop(self, key, *default):
+        """Remove KEY and return its value, as one atomic step.  If KEY
+        is not present, return DEFAULT if given, else raise KeyError."""
+        with self._lock:
+            return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        """Return the value of KEY, first inserting it with value DEFAULT
+        if it is not present, as one atomic step."""
+        with self._lock:
+            return super().setdefault(key, default)
+
+    # Lock-free readers
+
+    def search(self, key):
+        """Searches for an item with key KEY in the list,
+        and return its value.  If nothing in the list has
+        key KEY, raise KeyError."""
+        current = self._head
+        while current is not None:
+            following = current.next # Read the link only once
+            if (following is None) or (following.key > key):
+                current = current.down # Next level down
+            elif following.key < key:
+                current = following # Move along the current level
+            else: # following.key == key
+                return following.data # Which may be None
+        raise KeyError('Key {0} is not in skiplist'.format(key))
+
+    def _bottom_before(self, key, inclusive=False):
+        """Return the last node on the bottom level whose key is less than
+        KEY (less than or equal, if INCLUSIVE), the bottom head node if
+        there is no such key, or None if the skiplist is empty."""
+        current = self._head
+        if current is None:
+            return None
+        while True:
+            following = current.next
+            while (following is not None) and ((following.key < key) or
+                    (inclusive and following.key == key)):
+                current = following # Move along the current level
+                following = current.next
+            if current.down is None:
+                return current
+            current = current.down # Next level down
+
+    def _bottom_head(self):
+        """Return the head node of the bottom level, or None if the
+        skiplist is empty."""
+        current = self._head
+        if current is not None:
+            while current.down is not None:
+                current = current.down
+        return current
+
+    def _first_node(self, key=None):
+        """Return the first node on the bottom level whose key is >= KEY
+        (or the very first node, if KEY is None), or None."""
+        if key is None:
+            before = self._bottom_head()
+        else:
+            before = self._bottom_before(key)
+        if before is None:
+            return None
+        node = before.next
+        # Keys less than KEY may have been linked in after BEFORE since
+        # _bottom_before() looked at its next link
+        while node is not None and key is not None and node.key < key:
+            node = node.next
+        return node
+
+    def floor(self, key):
+        """Return the largest key in the skiplist that is <= KEY, or None
+        if there is no such key."""
+        node = self._bottom_before(key, inclusive=True)
+        return node.key if isinstance(node, Skiplist.DataNode) else None
+
+    def __iter__(self):
+        """Iterator over a ConcurrentSkiplist, using a generator."""
+        node = self._first_node()
+        while node is not None:
+            yield node.key
+            node = node.next
+
+    # The standard views look each key up again, which fails if another
+    # thread deletes it in between, so walk the bottom level instead.
+
+    class _ItemsView(ItemsView):
+        def __iter__(self):
+            return self._mapping._items_range(None, None)
+
+    class _ValuesView(ValuesView):
+        def __iter__(self):
+            for key, value in self._mapping._items_range(None, None):
+                yield value
+
+    def items(self, lo=None, hi=None):
+        """With no arguments, return a view of the (key, value) pairs.
+        Otherwise, return a generator of the (key, value) pairs with
+        lo <= key < hi, as Skiplist does."""
+        if lo is None and hi is None:
+            return ConcurrentSkiplist._ItemsView(self)
+        return self._items_range(lo, hi)
+
+    def values(self):
+        """Return a view of the values, in key order."""
+        return ConcurrentSkiplist._ValuesView(self)
@@ -1,4 +1,55 @@
-from typing import Dict, List, Tuple
+import functools
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (Any, Callable, Deque, Dict, Generator, Iterable, Iterator,
+                    List, Optional, Protocol, Tuple, TypeVar, Union)
+
+# The general-purpose searches work on either kind of string.  Indexing
+# bytes gives ints, so "characters" are ints there.  A search takes a
+# pattern and a text of the same kind, AnyText.
+Text = Union[str, bytes]
+AnyText = TypeVar('AnyText', str, bytes)
+
+class _Table(Protocol):
+    """A table indexed by character: a list indexed by byte value, for
+    bytes, or a _SparseTable, for str."""
+
+    def __getitem__(self, c: Any, /) -> int: ...
+
+    def __setitem__(self, c: Any, value: int, /) -> None: ...
+
+
+class _SparseTable(dict):
+    """A dict that gives DEFAULT for any key it doesn't hold, without
+    storing it: a table indexed by character that only needs entries for
+    the characters in a pattern."""
+
+    def __init__(self, default: int) -> None:
+        super().__init__()
+        self.default: int = default
+
+    def __missing__(self, key) -> int:
+        return self.default
+
+    def memo(self) -> '_SparseTable':
+        """Return a copy of the table to use for one search.  The copy
+        stores the default for each key it is asked about, so only the
+        first lookup of a character goes through __missing__(), which
+        is much slower than finding the key."""
+        copy = _MemoTable(self.default)
+        copy.update(self)
+        return copy
+
+
+class _MemoTable(_SparseTable):
+    """A _SparseTable that remembers its misses.  See _SparseTable.memo()."""
+
+    def __missing__(self, key) -> int:
+        self[key] = self.default
+        return self.default
+
 
 class Matcher:
     """Class to do pattern-matching in strings."""
@@ -9,8 +60,192 @@ class Matcher:
         the starting index.  If PATTERN does not occur in TEXT, return -1."""
         return Matcher.simple_matcher(pattern, text)
 
+    ALGORITHMS = ('simple', 'DFA', 'KMP', 'BM', 'Horspool')
+    DEBUG = False       # Run the *_matcher() methods' checked, slow loops
+    CACHE_SIZE = 512    # Number of compiled patterns to keep
+    _cache: Optional['functools._lru_cache_wrapper[CompiledPattern]'] = None  # Made by _compile()
+    CHUNK_SIZE = 1 << 20  # Bytes of a file to search at a time
+    SEGMENT_SIZE = 1 << 22  # Smallest piece of text worth a process
+
+    @staticmethod
+    def compile(pattern: Text, algorithm: str = 'KMP',
+                alphabet: Optional[Iterable] = None,
+                ignore_case: bool = False) -> 'CompiledPattern':
+        """Preprocess PATTERN (a str or bytes) for the named ALGORITHM
+        (one of Matcher.ALGORITHMS), and return a CompiledPattern that
+        can search any number of texts of the same type without
+        preprocessing again.  The most recently used patterns are
+        cached, so compiling the same pattern again is cheap.  ALPHABET
+        is only used by the DFA, and defaults to the characters in
+        PATTERN; it may be a string of the same type as PATTERN, or any
+        iterable of its characters.  If IGNORE_CASE, upper and lower
+        case match each other."""
+        if algorithm != 'DFA':
+            alphabet = None # So that it doesn't change the cache key
+        elif alphabet is not None and not isinstance(alphabet, (str, bytes)):
+            # The cache needs a hashable key, and the DFA a string
+            characters = sorted(set(alphabet))
+            alphabet = bytes(characters) if isinstance(pattern, bytes) else ''.join(characters)
+        return Matcher._compile(pattern, algorithm, alphabet, ignore_case)
+
+    @staticmethod
+    def _compile(pattern: Text, algorithm: str, alphabet: Optional[Text],
+                 ignore_case: bool) -> 'CompiledPattern':
+        """Return the cached CompiledPattern for these arguments, making
+        it if need be.  The cache is made on first use, and made again,
+        empty, if Matcher.CACHE_SIZE has changed since."""
+        cache = Matcher._cache
+        if cache is None or cache.cache_info().maxsize != Matcher.CACHE_SIZE:
+            cache = Matcher._cache = functools.lru_cache(maxsize=Matcher.CACHE_SIZE)(CompiledPattern)
+        return cache(pattern, algorithm, alphabet, ignore_case)
+
+    @staticmethod
+    def purge() -> None:
+        """Clear the cache of compiled patterns."""
+        if Matcher._cache is not None:
+            Matcher._cache.cache_clear()
+
+    @staticmethod
+    def finditer(pattern: Text, text: Text, algorithm: str = 'KMP',
+                 alphabet: Optional[Iterable] = None,
+                 ignore_case: bool = False) -> Iterator[int]:
+        """Generate the starting index of every occurrence of PATTERN in
+        TEXT, in order, including occurrences that overlap, using the
+        named ALGORITHM (one of Matcher.ALGORITHMS).  Matches are found
+        lazily, and the pattern is preprocessed only once (and cached),
+        so finding every match costs no more than one search through
+        TEXT.  ALPHABET is only used by the DFA.  If IGNORE_CASE, upper
+        and lower case match each other."""
+        return Matcher.compile(pattern, algorithm, alphabet,
+                               ignore_case).finditer(text)
+
+    @staticmethod
+    def search_file(path: Union[str, os.PathLike], pattern: Text,
+                    algorithm: str = 'KMP', ignore_case: bool = False,
+                    chunk_size: Optional[int] = None) -> Iterator[int]:
+        """Generate the byte offset of every occurrence of PATTERN in the
+        file at PATH, in order, including occurrences that overlap.  The
+        file is memory-mapped and searched CHUNK_SIZE bytes at a time, so
+        the memory used doesn't depend on the size of the file.  A str
+        PATTERN is encoded as UTF-8; IGNORE_CASE only folds ASCII
+        letters."""
+        if isinstance(pattern, str):
+            pattern = pattern.encode('utf-8')
+        return Matcher.compile(pattern, algorithm, None, ignore_case) \
+            .search_file(path, chunk_size)
+
+    @staticmethod
+    def _segments(size: int, processes: Optional[int],
+                  segment_size: Optional[int]) -> Tuple[int, List[Tuple[int, int]]]:
+        """Split range(SIZE) into segments for parallel_finditer() and
+        parallel_search_file(), and return the number of processes to
+        use and the (start, end) of each segment."""
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError('processes must be positive')
+        if segment_size is None:
+            # A few segments per process, so that they share out the work
+            # evenly even if some segments are slower
+            segment_size = max(Matcher.SEGMENT_SIZE, -(-size // (4 * processes)))
+        if segment_size < 1:
+            raise ValueError('segment_size must be positive')
+        starts = range(0, size, segment_size)
+        return processes, [(start, min(start + segment_size, size)) for start in starts]
+
+    @staticmethod
+    def parallel_finditer(pattern: Text, text: Text, algorithm: str = 'KMP',
+                          ignore_case: bool = False, processes: Optional[int] = None,
+                          segment_size: Optional[int] = None) -> List[int]:
+        """Return the starting index of every occurrence of PATTERN in
+        TEXT, in order, as finditer() would, but split TEXT into segments
+        of SEGMENT_SIZE and search them in a pool of PROCESSES processes
+        (by default, one per CPU).  Each segment is searched together
+        with the first len(PATTERN)-1 characters of the next one, and
+        only reports matches that start inside it, so matches that cross
+        a boundary are found exactly once.  Text too short to split is
+        searched in this process."""
+        processes, segments = Matcher._segments(len(text), processes, segment_size)
+        if len(pattern) == 0 or processes == 1 or len(segments) <= 1:
+            return list(Matcher.finditer(pattern, text, algorithm, None, ignore_case))
+        overlap = len(pattern) - 1
+        with ProcessPoolExecutor(processes) as pool:
+            results = pool.map(_search_segment,
+                               [(pattern, algorithm, ignore_case, start, end - start,
+                                 text[start:end + overlap]) for start, end in segments])
+            return [offset for result in results for offset in result]
+
+    @staticmethod
+    def parallel_search_file(path: Union[str, os.PathLike], pattern: Text,
+                             algorithm: str = 'KMP', ignore_case: bool = False,
+                             processes: Optional[int] = None,
+                             segment_size: Optional[int] = None,
+                             chunk_size: Optional[int] = None) -> List[int]:
+        """Return the byte offset of every occurrence of PATTERN in the
+        file at PATH, in order, as search_file() would, but search
+        segments of the file in a pool of processes, as
+        parallel_finditer() does.  Each process maps the file itself, so
+        no text is copied between processes."""
+        if isinstance(pattern, str):
+            pattern = pattern.encode('utf-8')
+        compiled = Matcher.compile(pattern, algorithm, None, ignore_case)
+        processes, segments = Matcher._segments(os.path.getsize(path),
+                                                processes, segment_size)
+        if len(pattern) == 0 or processes == 1 or len(segments) <= 1:
+            return list(compiled.search_file(path, chunk_size))
+        if chunk_size is None:
+            chunk_size = Matcher.CHUNK_SIZE
+        with ProcessPoolExecutor(processes) as pool:
+            results = pool.map(_search_file_segment,
+                               [(os.fspath(path), pattern, algorithm, ignore_case,
+                                 chunk_size, start, end) for start, end in segments])
+            return [offset for result in results for offset in result]
+
+    @staticmethod
+    def compile_set(patterns: Iterable[Text],
+                    ignore_case: bool = False) -> 'PatternSet':
+        """Build an Aho-Corasick automaton that searches for all of
+        PATTERNS at once, and return it as a PatternSet.  Its finditer()
+        reports every (pattern number, offset) match in one pass through
+        the text, however many patterns there are."""
+        return PatternSet(patterns, ignore_case)
+
+    @staticmethod
+    def fold_case(text: Text) -> Text:
+        """Return TEXT in lower case, one character at a time, so that
+        the result is the same length and offsets in it are offsets in
+        TEXT.  (The few characters whose lower case is longer than one
+        character are left alone.)  str.lower() turns a capital sigma at
+        the end of a word into 'ς' and elsewhere into 'σ', so every 'ς'
+        becomes 'σ', and a pattern folds the same wherever it occurs."""
+        if isinstance(text, bytes):
+            return text.lower() # ASCII letters only
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        return folded.replace('ς', 'σ')
+
+    @staticmethod
+    def _simple_iter(pattern: AnyText, text: AnyText) -> Iterator[int]:
+        """Generator for finditer() with the simple matcher.  It still
+        tries every position in turn, but compares the pattern there
+        with startswith(), which runs in C, instead of a character at
+        a time."""
+        startswith = text.startswith
+        for i in range(len(text) - len(pattern) + 1):
+            if startswith(pattern, i):
+                yield i
+
     @staticmethod
     def simple_matcher(pattern:str, text:str) -> int:
+        """Find the first occurrence of PATTERN in TEXT by trying each
+        position in turn, and return the starting index, or -1.  Unless
+        Matcher.DEBUG is set, this uses the fast loop in _simple_iter();
+        the loop below is the step-by-step version."""
+        if not Matcher.DEBUG:
+            return Matcher.compile(pattern, 'simple').search(text)
+        if len(pattern) > len(text):
+            return -1
         i = j = 0
 
         while True:
@@ -28,6 +263,11 @@ class Matcher:
 
     @staticmethod
     def _find_next_state(pattern, state, symbol) -> int:
+        """The DFA's transition function, straight from its definition:
+        the length of the longest prefix of PATTERN that is a suffix of
+        pattern[:state] + symbol.  This takes O(m**2) time per transition,
+        so _make_DFA() doesn't use it; it's the reference for checking
+        that _make_DFA() is right."""
         result = 0
         for i in range(state+1, 0, -1):
             if (pattern[:state] + symbol)[-i:] == pattern[:i]:
@@ -36,43 +276,86 @@ class Matcher:
         return result
 
     @staticmethod
-    def _make_DFA(pattern, alphabet) -> Dict[Tuple[int, str], int]:
-        DFA: Dict[Tuple[int, str], int] = {}
-        for state in range(len(pattern)):
-            for symbol in alphabet:
-                key: Tuple[int, str] = (state, symbol)
-                DFA[key] = Matcher._find_next_state(pattern, state, symbol)
-        return DFA
+    def _make_DFA(pattern, alphabet) -> Tuple[Dict[Union[str, int], int], List[int]]:
+        """Build the DFA for PATTERN, in O(m * |alphabet|) time.  Return
+        a dict that numbers the symbols, and the transition table, as a
+        flat list: the next state from STATE on symbol number C is at
+        index STATE * width + C, where width is the number of symbols
+        plus one.  The extra, last, symbol number stands for any
+        character that isn't in ALPHABET or PATTERN; it always leads
+        back to state 0.  The table includes the accepting state, so
+        that matching can go on after a match."""
+        symbols: Dict[Union[str, int], int] = {}
+        for symbol in alphabet + pattern:
+            symbols.setdefault(symbol, len(symbols))
+        width: int = len(symbols) + 1
+        DFA: List[int] = [0] * ((len(pattern) + 1) * width)
+        if len(pattern) > 0:
+            DFA[symbols[pattern[0]]] = 1
+        # restart is the state the DFA would be in if it had been started
+        # one character later, i.e. the state the KMP failure link goes
+        # to.  On a mismatch, state j acts just like state restart.
+        restart: int = 0
+        for state in range(1, len(pattern) + 1):
+            row: int = state * width
+            DFA[row:row + width] = DFA[restart * width:(restart + 1) * width]
+            if state < len(pattern):
+                number: int = symbols[pattern[state]]
+                DFA[row + number] = state + 1
+                restart = DFA[restart * width + number]
+        return symbols, DFA
 
     @staticmethod
     def DFA_matcher(pattern: str, text: str, alphabet: str) -> int:
-        DFA: Dict[Tuple[int, str], int] = Matcher._make_DFA(pattern, alphabet)
+        symbols, DFA = Matcher._make_DFA(pattern, alphabet)
+        other: int = len(symbols)   # Symbol number for everything else
+        width: int = len(symbols) + 1
         state: int = 0
         i: int = 0
         result: int = -1
         while i < len(text) and state < len(pattern):
-            key = (state, text[i])
-            state = DFA[key]
+            state = DFA[state * width + symbols.get(text[i], other)]
             i = i + 1
         if state == len(pattern):
             result = (i - len(pattern))
         return result
 
     @staticmethod
-    def mismatched_links(pattern: str) -> List[int]:
+    def _DFA_iter(pattern: AnyText, text: AnyText, symbols: Dict[Union[str, int], int],
+                  DFA: List[int], state: int = 0, base: int = 0) -> Generator[int, None, int]:
+        """Generator for finditer() with the DFA matcher.  The accepting
+        state has transitions too, so the DFA just keeps reading.  As
+        with _KMP_iter(), STATE and BASE let it carry on from where it
+        returned, in the next piece of a text."""
+        other: int = len(symbols)
+        width: int = len(symbols) + 1
+        m: int = len(pattern)
+        number = symbols.get
+        for i, c in enumerate(text):
+            state = DFA[state * width + number(c, other)]
+            if state == m:
+                yield base + i + 1 - m
+        return state
+
+    @staticmethod
+    def mismatched_links(pattern: Text, accepting: bool = False) -> List[int]:
         """Construct and return the table of links to follow
         when a mismatch occurs, as a list of integers.  This
         code assumes that state[k] corresponds to the character
         at pattern[k-1].  Thus, state 0 is the initial state
-        that matches nothing and just reads a character."""
+        that matches nothing and just reads a character.
+        If ACCEPTING, also include a link for the accepting
+        state len(pattern)+1, to follow to keep going after a
+        match."""
         # Extend the pattern to make the indices line up
-        aug_pattern: str = "0" + pattern 
+        aug_pattern: Text = b"0" + pattern if isinstance(pattern, bytes) else "0" + pattern
         
         # Initialize links to all 0's
-        links: List[int] = [0] * len(aug_pattern)
+        states: int = len(aug_pattern) + (1 if accepting else 0)
+        links: List[int] = [0] * states
      
         # Loop finds a mismatch state for each state in the DFA
-        for state in range(2, len(aug_pattern)):
+        for state in range(2, states):
             # s is the candidate state to go to
             # Start s as the previous state's mismatch destination
             s = links[state - 1]
@@ -98,7 +381,12 @@ class Matcher:
         """Matching using the Knuth-Morris-Pratt algorithm.
         Note that in this implementation, state k corresponds
         to the character pattern[k-1].  The special state that
-        always reads a character is state 0."""
+        always reads a character is state 0.
+        Unless Matcher.DEBUG is set, this uses the fast loop in
+        _KMP_iter(); the loop below checks its invariant at every
+        character."""
+        if not Matcher.DEBUG:
+            return Matcher.compile(pattern, 'KMP').search(text)
         mismatched: List[int] = Matcher.mismatched_links(pattern)
         state: int = 1
         i: int = 0
@@ -127,6 +415,28 @@ class Matcher:
 
         return result
 
+    @staticmethod
+    def _KMP_iter(pattern: AnyText, text: AnyText, mismatched: List[int],
+                  state: int = 1, base: int = 0) -> Generator[int, None, int]:
+        """Generator for finditer() with the Knuth-Morris-Pratt matcher.
+        MISMATCHED must include the link for the accepting state, which
+        is followed after each match, so overlapping matches are found.
+        To search text that comes in pieces, start each piece in the
+        STATE that the generator returned at the end of the last one,
+        with BASE the offset of the piece's start."""
+        m: int = len(pattern)
+        accepting: int = m + 1
+        for i, c in enumerate(text):
+            # Handle a mismatch (if there is one)
+            while (state > 0) and (c != pattern[state-1]):
+                state = mismatched[state]
+            state = state + 1 # Advance the state by 1
+
+            if state == accepting:
+                yield base + i + 1 - m
+                state = mismatched[state]
+        return state
+
     # BOYER-MOORE: this implementation comes from 
     # https://en.wikipedia.org/wiki/Boyer%E2%80%93Moore_string-search_algorithm,
     # downloaded 2022-11-17.
@@ -135,6 +445,10 @@ class Matcher:
     # To remove this feature, define alphabet_index as ord(c), and replace instances of "26"
     # with "256" or any maximum code-point you want. For Unicode you may want to match in UTF-8
     # bytes instead of creating a 0x10FFFF-sized table.
+    #
+    # Matcher.compile(P, 'BM') and Matcher.compile(P, 'Horspool') don't have this limit: they use
+    # last_occurrence_table() or horspool_table(), which have 256 entries for bytes, and hold
+    # only the pattern's characters for str.
 
     ALPHABET_SIZE = 26
 
@@ -146,7 +460,7 @@ class Matcher:
         return val
 
     @staticmethod
-    def match_length(S: str, idx1: int, idx2: int) -> int:
+    def match_length(S: Text, idx1: int, idx2: int) -> int:
         """Return the length of the match of the substrings of S beginning at idx1 and idx2."""
         if idx1 == idx2:
             return len(S) - idx1
@@ -158,7 +472,7 @@ class Matcher:
         return match_count
 
     @staticmethod
-    def fundamental_preprocess(S: str) -> List[int]:
+    def fundamental_preprocess(S: Text) -> List[int]:
         """Return Z, the Fundamental Preprocessing of S.
 
         Z[i] is the length of the substring beginning at i which is also a prefix of S.
@@ -215,7 +529,7 @@ class Matcher:
         return R
 
     @staticmethod
-    def good_suffix_table(S: str) -> List[int]:
+    def good_suffix_table(S: Text) -> List[int]:
         """
         Generates L for S, an array used in the implementation of the strong good suffix rule.
         L[i] = k, the largest position in S such that S[i:] (the suffix of S starting at i) matches
@@ -236,7 +550,7 @@ class Matcher:
         return L
 
     @staticmethod
-    def full_shift_table(S: str) -> List[int]:
+    def full_shift_table(S: Text) -> List[int]:
         """
         Generates F for S, an array used in a special case of the good suffix rule in the Boyer-Moore
         string search algorithm. F[i] is the length of the longest suffix of S[i:] that is also a
@@ -258,12 +572,17 @@ class Matcher:
         the first occurrence of P in T, and incorporates numerous ways of 
         pre-processing the pattern to determine the optimal amount to shift the
         string and skip comparisons. In practice it runs in O(m) (and even
-        sublinear) time, where m is the length of T. This implementation
-        performs a case-insensitive search on ASCII alphabetic characters,
-        spaces not included.
+        sublinear) time, where m is the length of T. The search is exact
+        (case-sensitive) and takes any text; for a case-insensitive search,
+        use Matcher.compile(P, 'BM', ignore_case=True).search(T).
+        Unless Matcher.DEBUG is set, this uses the fast loop in _BM_iter().
+        The loop below is the reference version, and its tables only cover
+        ASCII letters, so with DEBUG set P and T must be ASCII alphabetic.
         """
         if len(P) == 0 or len(T) == 0 or len(T) < len(P):
             return -1
+        if not Matcher.DEBUG:
+            return Matcher.compile(P, 'BM').search(T)
 
         matches = [-1]
 
@@ -293,6 +612,332 @@ class Matcher:
                 else:               # Matched suffix appears in P
                     suffix_shift = len(P) - 1 - L[i + 1]
                 shift = max(char_shift, suffix_shift)
-                previous_k = k if shift >= i + 1 else previous_k  # Galil's rule
+                # Galil's rule: only a good suffix shift that moves P past
+                # the mismatch leaves a known match with a prefix of P,
+                # and only for the next alignment
+                if shift == suffix_shift and shift >= i + 1:
+                    previous_k = k
+                else:
+                    previous_k = -1
                 k += shift
         return matches[0]
+
+    @staticmethod
+    def suffix_shift_table(P: Text) -> List[int]:
+        """
+        Generates S for P, the shifts that the good suffix rule gives, as one flat list: if P[i]
+        is the rightmost character of P that doesn't match, shift P by S[i + 1].  S[0] is the
+        shift after a full match, which is P's period.  This folds good_suffix_table(),
+        full_shift_table() and their special cases into a single lookup.
+        """
+        m = len(P)
+        L = Matcher.good_suffix_table(P)
+        F = Matcher.full_shift_table(P)
+        S = [m - F[1] if m > 1 else 1]
+        for i in range(m):
+            if i + 1 == m:          # Mismatch happened on first attempt
+                S.append(1)
+            elif L[i + 1] == -1:    # Matched suffix does not appear anywhere in P
+                S.append(m - F[i + 1])
+            else:                   # Matched suffix appears in P
+                S.append(m - 1 - L[i + 1])
+        return S
+
+    @staticmethod
+    def _BM_iter(P: AnyText, T: AnyText, last: _Table,
+                 S: List[int]) -> Iterator[int]:
+        """Generator for finditer() with the Boyer-Moore matcher, given
+        P's last occurrence table and suffix shift table.  This uses the
+        simple form of the bad character rule (shift the last occurrence
+        of the mismatched character up to it), which needs only one
+        table entry per character.  After a match, P shifts by its
+        period, S[0]; the part of P that still overlaps the match is a
+        border of P, so it is known to match, and Galil's rule skips
+        comparing it again."""
+        if isinstance(last, _SparseTable):
+            last = last.memo()
+        m = len(P)
+        n = len(T)
+        k = m - 1           # Represents alignment of end of P relative to T
+        previous_k = -1     # Represents alignment in previous phase (Galil's rule)
+        while k < n:
+            i = m - 1       # Character to compare in P
+            h = k           # Character to compare in T
+            while i >= 0 and h > previous_k and P[i] == T[h]:  # Matches starting from end of P
+                i -= 1
+                h -= 1
+            if i == -1 or h == previous_k:  # Match has been found (Galil's rule)
+                yield k - m + 1
+                previous_k = k
+                k += S[0]
+                continue
+            # No match, shift by max of bad character and good suffix rules
+            char_shift = i - last[T[h]]
+            suffix_shift = S[i + 1]
+            if char_shift > suffix_shift:
+                previous_k = -1
+                k += char_shift
+            else:
+                # Galil's rule: only a good suffix shift that moves P past
+                # the mismatch leaves a known match with a prefix of P,
+                # and only for the next alignment
+                previous_k = k if suffix_shift > i else -1
+                k += suffix_shift
+
+    @staticmethod
+    def last_occurrence_table(P: Text) -> _Table:
+        """Return a table giving, for each character c, the index of the
+        last occurrence of c in P, or -1 if c isn't in P.  For bytes,
+        this is a list of 256 entries, indexed by byte value; for str,
+        it's a sparse table, holding only the characters in P."""
+        table: _Table = [-1] * 256 if isinstance(P, bytes) else _SparseTable(-1)
+        for i, c in enumerate(P):
+            table[c] = i
+        return table
+
+    @staticmethod
+    def horspool_table(P: Text) -> _Table:
+        """Return Horspool's shift table for P: for each character c, how
+        far to shift P when c is under P's last character, i.e. the
+        distance from the last occurrence of c in P[:-1] to the end of P,
+        or len(P) if there is none.  For bytes, this is a list of 256
+        entries; for str, it's a sparse table."""
+        m = len(P)
+        table: _Table = [m] * 256 if isinstance(P, bytes) else _SparseTable(m)
+        for i in range(m - 1):
+            table[P[i]] = m - 1 - i
+        return table
+
+    @staticmethod
+    def _Horspool_iter(P: AnyText, T: AnyText, shift: _Table) -> Iterator[int]:
+        """Generator for finditer() with the Boyer-Moore-Horspool matcher,
+        given P's Horspool shift table.  Compare the text character under
+        the end of P with P's last character, and if they match, the rest
+        of P (Horspool's algorithm allows any order, so startswith() does
+        it in C).  Whether or not it matched, shift by the entry for the
+        text character under the end of P."""
+        if isinstance(shift, _SparseTable):
+            shift = shift.memo()
+        m = len(P)
+        n = len(T)
+        final = P[m - 1]
+        startswith = T.startswith
+        k = m - 1           # Represents alignment of end of P relative to T
+        while k < n:
+            c = T[k]
+            if c == final and startswith(P, k - m + 1):
+                yield k - m + 1
+            k += shift[c]
+
+
+class CompiledPattern:
+    """A pattern, preprocessed for one of Matcher's algorithms.  Made by
+    Matcher.compile(); it holds the algorithm's tables, so searching
+    with it doesn't build them again."""
+
+    def __init__(self, pattern: Text, algorithm: str = 'KMP',
+                 alphabet: Optional[Text] = None,
+                 ignore_case: bool = False) -> None:
+        if algorithm not in Matcher.ALGORITHMS:
+            raise ValueError('Unknown algorithm {0!r}'.format(algorithm))
+        self.pattern: Text = pattern
+        self.algorithm: str = algorithm
+        self.ignore_case: bool = ignore_case
+        if ignore_case:
+            pattern = Matcher.fold_case(pattern)
+            if alphabet is not None:
+                alphabet = Matcher.fold_case(alphabet)
+        self._folded: Text = pattern
+        self._tables: tuple = ()
+        self._iter: Callable[..., Iterator[int]]
+        if algorithm == 'simple':
+            self._iter = Matcher._simple_iter
+        elif algorithm == 'DFA':
+            self._iter = Matcher._DFA_iter
+            self._tables = Matcher._make_DFA(pattern, alphabet or pattern[:0])
+        elif algorithm == 'KMP':
+            self._iter = Matcher._KMP_iter
+            self._tables = (Matcher.mismatched_links(pattern, True),)
+        elif algorithm == 'BM':
+            self._iter = Matcher._BM_iter
+            if len(pattern) > 0:
+                self._tables = (Matcher.last_occurrence_table(pattern),
+                                Matcher.suffix_shift_table(pattern))
+        else:
+            self._iter = Matcher._Horspool_iter
+            self._tables = (Matcher.horspool_table(pattern),)
+
+    def __repr__(self) -> str:
+        return 'Matcher.compile({0!r}, {1!r})'.format(self.pattern, self.algorithm)
+
+    def finditer(self, text: Text) -> Iterator[int]:
+        """Generate the starting index of every occurrence of the pattern
+        in TEXT, in order, including occurrences that overlap."""
+        if len(self.pattern) == 0: # Matches at every position
+            return iter(range(len(text) + 1))
+        return self._iter(self._folded, self._fold(text), *self._tables)
+
+    def _fold(self, text: Text) -> Text:
+        """Fold the case of TEXT, if the pattern ignores case."""
+        return Matcher.fold_case(text) if self.ignore_case else text
+
+    def search(self, text: Text) -> int:
+        """Find the first occurrence of the pattern in TEXT, and return
+        the starting index.  If it does not occur in TEXT, return -1."""
+        return next(self.finditer(text), -1)
+
+    def search_file(self, path: Union[str, os.PathLike],
+                    chunk_size: Optional[int] = None) -> Iterator[int]:
+        """Generate the byte offset of every occurrence of the (bytes)
+        pattern in the file at PATH, as Matcher.search_file() does."""
+        if not isinstance(self.pattern, bytes):
+            raise TypeError('search_file() needs a bytes pattern')
+        if chunk_size is None:
+            chunk_size = Matcher.CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        return self._search_file(path, chunk_size)
+
+    def _search_file(self, path: Union[str, os.PathLike], chunk_size: int,
+                     start: int = 0, end: Optional[int] = None) -> Iterator[int]:
+        """Generator for search_file().  Only report the matches that
+        start in the range [START, END) of the file (by default, all of
+        them), reading no further than the last of those could reach."""
+        m = len(self.pattern)
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if end is None or end > size:
+                end = size
+            if m == 0: # Matches at every position
+                yield from range(start, end + 1 if end == size else end)
+                return
+            stop = min(end + m - 1, size)   # End of the bytes to read
+            if start >= stop:
+                return # Nothing to read (and can't mmap an empty file)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if self.algorithm in ('KMP', 'DFA'):
+                    # The automaton's state carries over from one chunk to
+                    # the next, so a match can span the boundary
+                    automaton: Callable[..., Generator[int, None, int]] = (
+                        Matcher._KMP_iter if self.algorithm == 'KMP' else Matcher._DFA_iter)
+                    state = 1 if self.algorithm == 'KMP' else 0
+                    for low in range(start, stop, chunk_size):
+                        chunk = self._fold(mapped[low:min(low + chunk_size, stop)])
+                        state = yield from automaton(self._folded, chunk,
+                                                     *self._tables, state, low)
+                else:
+                    # Each chunk starts with the last m-1 bytes of the
+                    # one before.  A match that starts there didn't fit
+                    # in the chunk before, so it isn't reported twice.
+                    for position in range(start, stop, chunk_size):
+                        low = max(position - (m - 1), start)
+                        chunk = self._fold(mapped[low:min(position + chunk_size, stop)])
+                        for offset in self._iter(self._folded, chunk, *self._tables):
+                            yield low + offset
+
+
+class PatternSet:
+    """A set of patterns to search for at once, using the Aho-Corasick
+    algorithm.  Made by Matcher.compile_set().  The patterns are stored
+    in a trie, whose nodes are the states of the automaton: state s
+    stands for the string on the path from the root to s.  As in the
+    KMP matcher, each state also has a link to follow when the next
+    character doesn't extend it, here to the state for its longest
+    proper suffix that is in the trie; mismatched_links() is the
+    special case where the trie is a single path."""
+
+    def __init__(self, patterns: Iterable[Text], ignore_case: bool = False) -> None:
+        self.patterns: List[Text] = list(patterns)
+        self.ignore_case: bool = ignore_case
+        # State 0 is the root, for the empty string.  _goto[s] maps a
+        # character to the child of s, and _ids[s] lists the patterns
+        # that end at s.
+        self._goto: List[Dict] = [{}]
+        self._ids: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            if ignore_case:
+                pattern = Matcher.fold_case(pattern)
+            state = 0
+            for c in pattern:
+                child = self._goto[state].get(c)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._ids.append([])
+                    self._goto[state][c] = child
+                state = child
+            self._ids[state].append(pattern_id)
+
+        # Work out the links in breadth-first order, so that every
+        # shorter string's links are known before they're needed.
+        # _mismatched[s] is the state for s's longest proper suffix in
+        # the trie; _output[s] is the nearest state along that chain of
+        # links where some pattern ends (or -1), so that all the matches
+        # ending at a position can be listed without a search.
+        self._mismatched: List[int] = [0] * len(self._goto)
+        self._output: List[int] = [-1] * len(self._goto)
+        queue: Deque[int] = deque([0])
+        while queue:
+            state = queue.popleft()
+            for c, child in self._goto[state].items():
+                queue.append(child)
+                if state == 0:
+                    link = 0
+                else:
+                    # Like mismatched_links(): try to extend the suffix
+                    # that state's link goes to, then that one's, ...
+                    s = self._mismatched[state]
+                    while s > 0 and c not in self._goto[s]:
+                        s = self._mismatched[s]
+                    link = self._goto[s].get(c, 0)
+                self._mismatched[child] = link
+                self._output[child] = link if self._ids[link] else self._output[link]
+
+    def __len__(self) -> int:
+        """Return the number of patterns."""
+        return len(self.patterns)
+
+    def finditer(self, text: Text) -> Iterator[Tuple[int, int]]:
+        """Generate a (pattern number, offset) pair for every occurrence
+        of every pattern in TEXT, where the pattern number is its index
+        in the list of patterns.  Matches are in order of where they
+        end, and matches that end at the same place go from the longest
+        pattern to the shortest.  This takes O(len(TEXT) + matches)
+        time."""
+        if self.ignore_case:
+            text = Matcher.fold_case(text)
+        goto, mismatched, output, ids = self._goto, self._mismatched, self._output, self._ids
+        lengths = [len(pattern) for pattern in self.patterns]
+        for pattern_id in ids[0]:   # Empty patterns match at the start
+            yield (pattern_id, 0)
+        state = 0
+        for i, c in enumerate(text):
+            # Handle a mismatch (if there is one)
+            while state > 0 and c not in goto[state]:
+                state = mismatched[state]
+            state = goto[state].get(c, 0)
+
+            # Report every pattern that ends here
+            found = state if ids[state] else output[state]
+            while found >= 0:
+                for pattern_id in ids[found]:
+                    yield (pattern_id, i + 1 - lengths[pattern_id])
+                found = output[found]
+
+
+# Workers for Matcher's parallel searches.  They're module-level
+# functions, so that the process pool can send them to other processes.
+
+def _search_segment(job: Tuple[Text, str, bool, int, int, Text]) -> List[int]:
+    """Search SEGMENT, which starts at offset START in the whole text, for
+    matches that start in its first LENGTH characters."""
+    pattern, algorithm, ignore_case, start, length, segment = job
+    return [start + offset
+            for offset in Matcher.finditer(pattern, segment, algorithm, None, ignore_case)
+            if offset < length]
+
+def _search_file_segment(job: Tuple[str, bytes, str, bool, int, int, int]) -> List[int]:
+    """Search the file at PATH for matches that start in [START, END)."""
+    path, pattern, algorithm, ignore_case, chunk_size, start, end = job
+    compiled = Matcher.compile(pattern, algorithm, None, ignore_case)
+    return list(compiled._search_file(path, chunk_size, start, end))
@@ -0,0 +1,153 @@
+import random
+from typing import MutableMapping
+
+class PughSkiplist(MutableMapping):
+    """Class to represent a skiplist, using the layout from Pugh's
+    original paper.  Where Skiplist builds each key's tower out of one
+    node per level, linked by down pointers, here each key has a single
+    node holding its key and value once, plus an array of forward
+    pointers: node[i] is the next node on level i.  The list's head is
+    a node with the maximum number of levels."""
+
+    P_INV: int = 2          # 1/P
+    MAX_LEVEL: int = 32     # Enough for about P_INV**32 keys
+
+    class Node(list):
+        """Internal class to represent a skiplist node.  The node is its
+        own list of forward pointers, one per level, so that a node costs
+        only one object."""
+        __slots__ = ('key', 'data')
+
+        def __init__(self, key, value, levels):
+            super().__init__([None] * levels)
+            self.key = key
+            self.data = value
+
+    def __init__(self, seed=None, max_level=None, p_inv=None):
+        """Create an empty skiplist, with its own random number generator
+        seeded with SEED, and at most MAX_LEVEL levels, in which each level
+        holds about 1/P_INV of the keys in the level below.  SEED and
+        MAX_LEVEL come first, as for Skiplist."""
+        self._max_level = PughSkiplist.MAX_LEVEL if max_level is None else max_level
+        self._p_inv = PughSkiplist.P_INV if p_inv is None else p_inv
+        if self._max_level < 1 or self._p_inv < 2:
+            raise ValueError('Need max_level >= 1 and p_inv >= 2')
+        self._random = random.Random(seed)
+        # If P_INV is 2**k, each level is one run of k zero bits
+        self._bits = self._p_inv.bit_length() - 1
+        if self._p_inv != 1 << self._bits:
+            self._bits = 0 # Not a power of 2
+        self._head = PughSkiplist.Node(None, None, self._max_level)
+        self._levels = 0  # Number of levels in use
+        self._count = 0   # Number of keys
+
+    def _random_levels(self):
+        """Choose the number of levels for a new node.  When P_INV is a
+        power of 2, draw one random word and count its trailing zero bits
+        (with a set bit at the top, as a cap) instead of drawing once per
+        level."""
+        if self._bits:
+            cap = (self._max_level - 1) * self._bits
+            word = self._random.getrandbits(cap) | (1 << cap)
+            return 1 + ((word & -word).bit_length() - 1) // self._bits
+        levels = 1
+        while levels < self._max_level and self._random.randrange(self._p_inv) == 0:
+            levels += 1
+        return levels
+
+    def _find_predecessors(self, key):
+        """Return a list holding, for each level in use, the last node on
+        that level whose key is less than KEY (the head, if none is)."""
+        update = [self._head] * self._levels
+        node = self._head
+        for level in range(self._levels - 1, -1, -1):
+            next_node = node[level]
+            while next_node is not None and next_node.key < key:
+                node = next_node
+                next_node = node[level]
+            update[level] = node
+        return update
+
+    def insert(self, key, value):
+        """Insert a new (key, value) pair into the skiplist.  If KEY is
+        already in the skiplist, replace its value with VALUE instead."""
+        update = self._find_predecessors(key)
+        if update:
+            existing = update[0][0]
+            if existing is not None and existing.key == key:
+                existing.data = value
+                return
+
+        levels = self._random_levels()
+        if levels > self._levels: # New levels start at the head
+            update.extend([self._head] * (levels - self._levels))
+            self._levels = levels
+        newnode = PughSkiplist.Node(key, value, levels)
+        for level in range(levels):
+            newnode[level] = update[level][level]
+            update[level][level] = newnode
+        self._count += 1
+
+    def __setitem__(self, key, value):
+        """Allows insertion into the skiplist using the syntax
+        self[key] = value."""
+        self.insert(key, value)
+
+    def search(self, key):
+        """Searches for an item with key KEY in the list,
+        and return its value.  If nothing in the list has
+        key KEY, raise KeyError."""
+        node = self._head
+        for level in range(self._levels - 1, -1, -1):
+            next_node = node[level]
+            while next_node is not None and next_node.key < key:
+                node = next_node
+                next_node = node[level]
+        node = node[0]
+        if node is not None and node.key == key:
+            return node.data
+        raise KeyError('Key {0} is not in skiplist'.format(key))
+
+    def __getitem__(self, key):
+        """Allows searching the skiplist using the syntax
+        self[key]."""
+        return self.search(key)
+
+    def __contains__(self, key):
+        """Return True if KEY is in the skiplist."""
+        try:
+            self.search(key)
+        except KeyError:
+            return False
+        return True
+
+    def delete(self, key):
+        """Deletes the item with key KEY from the skiplist.
+        If no such item exists, raise KeyError."""
+        update = self._find_predecessors(key)
+        node = update[0][0] if update else None
+        if node is None or node.key != key:
+            raise KeyError('Key {0} is not in skiplist'.format(key))
+        for level in range(len(node)):
+            update[level][level] = node[level]
+        self._count -= 1
+
+        # Stop using any levels that are now empty
+        while self._levels > 0 and self._head[self._levels - 1] is None:
+            self._levels -= 1
+
+    def __delitem__(self, key):
+        """Allows deletion from the skiplist using
+        square-bracket notation."""
+        self.delete(key)
+
+    def __iter__(self):
+        """Iterator over a PughSkiplist, using a generator."""
+        node = self._head[0]
+        while node is not None:
+            yield node.key
+            node = node[0]
+
+    def __len__(self):
+        """Return the number of keys in the skiplist, in constant time."""
+        return self._count
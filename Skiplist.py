@@ -1,21 +1,28 @@
 import random
 from typing import Generic, Optional, MutableMapping, TypeVar
-from pythonds3.basic import Stack
 #from typing import Generic, TypeVar
 
 #KT = TypeVar('KT') # Key type.  Must be hashable and comparable.
 #VT = TypeVar('VT') # Value type.  Can be anything.
 
 class Skiplist(MutableMapping):
-    """Class to represent a skiplist."""
+    """Class to represent a skiplist.  The list is also indexable: each
+    link records its width, the number of positions on the bottom level
+    that it spans, so the i-th key can be found in O(log n) expected
+    time.  A link to None spans to an imaginary node just past the end,
+    at position len(self)."""
 
-    P_INV: int = 2  # 1/P
+    P_INV: int = 2          # 1/P; must be a power of 2
+    MAX_LEVEL: int = 32     # Enough for about P_INV**32 keys
 
     class Node:
         """Internal class to represent a skiplist node."""
+        __slots__ = ('_next', '_down', '_width')
+
         def __init__(self):
             self._next = None
             self._down = None
+            self._width = 1 # Right for the head of an empty list
 
         @property
         def next(self):
@@ -33,6 +40,14 @@ class Skiplist(MutableMapping):
         def down(self, value):
             self._down = value
 
+        @property
+        def width(self):
+            return self._width
+
+        @width.setter
+        def width(self, value):
+            self._width = value
+
         def addLevel(self, prior) -> 'Skiplist.Node':
             newnode = Skiplist.Node()
             newnode.down = self
@@ -45,6 +60,7 @@ class Skiplist(MutableMapping):
     class DataNode(Node):
         """Internal class to represent a skiplist data node.  Adds data storage
         (a key and value) to Node."""
+        __slots__ = ('_key', '_data')
 
         def __init__(self, key, value):
             super().__init__()
@@ -73,44 +89,228 @@ class Skiplist(MutableMapping):
             return newnode
 
 
-    def __init__(self):
-        """Create an empty skiplist."""
+    def __init__(self, seed=None, max_level=None):
+        """Create an empty skiplist, with at most MAX_LEVEL levels.  The
+        skiplist has its own random number generator, seeded with SEED,
+        so two skiplists built with the same seed and the same operations
+        have the same structure."""
+        self._max_level = Skiplist.MAX_LEVEL if max_level is None else max_level
+        if self._max_level < 1:
+            raise ValueError('Need max_level >= 1')
+        self._random = random.Random(seed)
+        # Each level is one run of this many zero bits
+        self._bits = Skiplist.P_INV.bit_length() - 1
         self._head = None
+        self._count = 0 # Number of keys
 
-    def insert(self, key, value):
-        """Insert a new (key, value) pair into the skiplist."""
-        # Adding to an empty list
-        if self._head is None: 
-            self._head = Skiplist.Node()
-            top = Skiplist.DataNode(key, value)
-            self._head.next = top
-            # Add levels to that first node
-            while random.randrange(Skiplist.P_INV) == 0:
+    @classmethod
+    def from_sorted(cls, pairs, seed=None, max_level=None):
+        """Build a skiplist from (key, value) PAIRS sorted by key, in O(n)
+        expected time."""
+        skiplist = cls(seed, max_level)
+        skiplist.update_sorted(pairs)
+        return skiplist
+
+    def _random_height(self):
+        """Choose how many levels a new tower adds above the bottom one.
+        Each level is kept with probability 1/P_INV, so rather than
+        drawing once per level, draw one random word and count its
+        trailing zero bits, log2(P_INV) bits per level.  A set bit just
+        above the word caps the tower at MAX_LEVEL levels."""
+        cap = (self._max_level - 1) * self._bits
+        word = self._random.getrandbits(cap) | (1 << cap)
+        return ((word & -word).bit_length() - 1) // self._bits
+
+    def _descend(self, current, rank, key, path, ranks):
+        """Search for KEY, starting from node CURRENT (at position RANK on
+        the bottom level; -1 for a head node) and working down.  Append to
+        PATH the last node on each level whose key is less than KEY, and
+        to RANKS that node's position.  If KEY is found, stop and return
+        the top node of its tower and its position (PATH then ends at the
+        level above it); otherwise return (None, None) (PATH then reaches
+        the bottom level)."""
+        while current:
+            if (current.next is None) or (current.next.key > key):
+                path.append(current)
+                ranks.append(rank)
+                current = current.down # Next level down
+            elif current.next.key == key:
+                return current.next, rank + current.width
+            else:
+                rank += current.width
+                current = current.next # Move along the current level
+        return None, None
+
+    def _link(self, path, ranks, key, value, height=None, widen=True):
+        """Link in a tower for a new (KEY, VALUE) pair.  PATH holds the
+        node to insert after on each level, top level first, and RANKS
+        their positions.  HEIGHT is the number of levels the tower adds
+        above the bottom one (by default, chosen at random).  Return the
+        tower's nodes, bottom level first, and the new key's position.
+        Unless WIDEN is false, also widen the links that pass over the
+        tower on the levels above it; update_sorted() does that itself,
+        once per batch."""
+        if height is None:
+            height = self._random_height()
+        level = len(path) - 1
+        position = ranks[level] + 1
+        top = Skiplist.DataNode(key, value)
+        top.next = path[level].next
+        path[level].next = top
+        Skiplist._split(path[level], ranks[level], top, position)
+        tower = [top]
+        for i in range(height):
+            level -= 1
+            if level < 0: # Add a whole new level to the skiplist
                 self._head = self._head.addLevel(None)
+                self._head.width = self._count + 1 # Spans the whole list
                 top = top.addLevel(self._head)
-        # Adding to a populated list.  Find the insertion point, saving the sequence
-        #  of previous nodes
+                Skiplist._split(self._head, -1, top, position)
+            else:
+                top = top.addLevel(path[level])
+                Skiplist._split(path[level], ranks[level], top, position)
+            tower.append(top)
+        # On the levels the tower doesn't reach, the links over it
+        # become one wider
+        if widen:
+            for higher in range(level):
+                path[higher].width += 1
+        self._count += 1
+        return tower, position
+
+    @staticmethod
+    def _split(prior, prior_rank, newnode, position):
+        """Fix the widths after NEWNODE, at POSITION on the bottom level,
+        has just been linked in after node PRIOR, at position PRIOR_RANK.
+        The node after NEWNODE has also moved up by one position."""
+        newnode.width = prior.width + prior_rank + 1 - position
+        prior.width = position - prior_rank
+
+    @staticmethod
+    def _update_tower(top, value):
+        """Set the value in every level of the tower whose top node is TOP
+        (every level holds a copy of the value), and return the tower's
+        nodes, top level first."""
+        tower = []
+        while top is not None:
+            top.data = value
+            tower.append(top)
+            top = top.down
+        return tower
+
+    def insert(self, key, value):
+        """Insert a new (key, value) pair into the skiplist.  If KEY is
+        already in the skiplist, replace its value with VALUE instead."""
+        if self._head is None: # Adding to an empty list
+            self._head = Skiplist.Node()
+        # Find the insertion point, saving the sequence of previous nodes
+        path = []
+        ranks = []
+        found, _ = self._descend(self._head, -1, key, path, ranks)
+        if found is not None:
+            Skiplist._update_tower(found, value)
         else:
-            tower = Stack()
-            current = self._head
-            while current:
-                if (current.next is None) or (current.next.key > key):
-                    tower.push(current)
-                    current = current.down
-                else:
-                    current = current.next
-
-            lowest_level = tower.pop()
-            top = Skiplist.DataNode(key, value)
-            top.next = lowest_level.next
-            lowest_level.next = top
-            while random.randrange(Skiplist.P_INV) == 0:
-                if tower.is_empty(): # Add a whole new level to the skiplist
-                    self._head = self._head.addLevel(None)
-                    top = top.addLevel(self._head)
+            self._link(path, ranks, key, value)
+
+    def update_sorted(self, pairs):
+        """Insert each (key, value) pair from PAIRS, replacing the values
+        of keys that are already present.  This is fastest when PAIRS is
+        sorted by key: the search for each key starts from where the
+        previous one ended (a "finger"), rather than from the top of the
+        list, so k sorted pairs cost about O(k + log n) rather than
+        O(k log n).  Out-of-order pairs still work; each one just starts
+        a fresh search from the top.
+
+        Each new key also widens the link over it on every level above
+        its tower.  Those links belong to the finger, so rather than
+        widening them one key at a time, the finger records how many
+        keys had been added when each of its links was last right (in
+        SETTLED), and a link is only brought up to date when it is about
+        to be read or leaves the finger."""
+        path = None # Finger: last node before the previous key, per level
+        ranks = None # and their positions
+        settled = [] # and the value of ADDED when their widths were right
+        added = 0 # Number of keys linked in so far
+        last_key = None
+        for key, value in pairs:
+            if self._head is None:
+                self._head = Skiplist.Node()
+                path = None
+            if path is None or not (last_key < key):
+                # Search from the top of the list
+                if path is not None:
+                    Skiplist._settle(path, settled, added, 0)
+                path = []
+                ranks = []
+                settled = []
+                start, start_rank = self._head, -1
+            else:
+                # Climb up from the bottom of the finger until we reach a
+                # level where the saved node still comes just before KEY.
+                # All the levels above that one are also still right.
+                level = len(path) - 1
+                while level >= 0 and path[level].next is not None \
+                        and path[level].next.key <= key:
+                    level -= 1
+                Skiplist._settle(path, settled, added, max(level, 0))
+                if level < 0:
+                    start, start_rank = self._head, -1
+                    path.clear()
+                    ranks.clear()
+                    settled.clear()
                 else:
-                    next_level = tower.pop()
-                    top = top.addLevel(next_level)
+                    start, start_rank = path[level], ranks[level]
+                    del path[level:]
+                    del ranks[level:]
+                    del settled[level:]
+            found, position = self._descend(start, start_rank, key, path, ranks)
+
+            # Move the finger onto KEY's tower, which comes just before
+            # the next key on every level that it reaches.
+            if found is not None:
+                tower = Skiplist._update_tower(found, value)
+                path.extend(tower)
+                ranks.extend([position] * len(tower))
+            else:
+                # The levels the tower reaches get split, so they must be
+                # right first
+                height = self._random_height()
+                settled.extend([added] * (len(path) - len(settled)))
+                Skiplist._settle(path, settled, added, max(len(path) - 1 - height, 0))
+                tower, position = self._link(path, ranks, key, value, height, widen=False)
+                added += 1
+                for height, node in enumerate(tower):
+                    level = len(path) - 1 - height
+                    if level >= 0:
+                        path[level] = node
+                        ranks[level] = position
+                        settled[level] = added
+                    else: # The tower added a new top level
+                        path.insert(0, node)
+                        ranks.insert(0, position)
+                        settled.insert(0, added)
+            settled.extend([added] * (len(path) - len(settled)))
+            last_key = key
+        if path is not None:
+            Skiplist._settle(path, settled, added, 0)
+
+    @staticmethod
+    def _settle(path, settled, added, start):
+        """Bring the widths of update_sorted()'s finger up to date, from
+        level START down: each key added since a link was last right
+        was added under it."""
+        for level in range(start, len(settled)):
+            path[level].width += added - settled[level]
+            settled[level] = added
+
+    def extend(self, pairs):
+        """Insert each (key, value) pair from PAIRS, which may be a
+        mapping or an iterable of pairs in any order.  The pairs are
+        sorted first, then inserted with update_sorted().  Where a key
+        appears more than once, its last value wins."""
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        self.update_sorted(sorted(pairs, key=lambda pair: pair[0]))
 
     def __setitem__(self, key, value):
         """Allows insertion into the skiplist using the syntax
@@ -122,28 +322,189 @@ class Skiplist(MutableMapping):
         and return its value.  If nothing in the list has
         key KEY, raise KeyError."""
         current = self._head # current node
-        result = None # Return value
         while current:
             if (current.next is None) or (current.next.key > key):
                 current = current.down # Next level down
             elif (current.next.key < key):
                 current = current.next # Move along the current level
             else: # current.next.key == key
-                result = current.next.data
-                current = None # To exit the loop
-        if result is None:
-            raise KeyError('Key {0} is not in skiplist'.format(key)) 
-        return result
+                return current.next.data # Which may be None
+        raise KeyError('Key {0} is not in skiplist'.format(key)) 
 
     def __getitem__(self, key):
         """Allows searching the skiplist using the syntax
         self[key]."""
         return self.search(key)
 
+    # Range queries.  Each of these descends the express lanes to its
+    # starting point in O(log n) expected time, then works along the
+    # bottom level.  The generators are lazy, so the skiplist must not be
+    # changed while one of them is running.
+
+    def _bottom_before(self, key, inclusive=False):
+        """Return the last node on the bottom level whose key is less than
+        KEY (less than or equal, if INCLUSIVE).  This is the bottom head
+        node if there is no such key."""
+        current = self._head
+        while True:
+            while (current.next is not None) and ((current.next.key < key) or
+                    (inclusive and current.next.key == key)):
+                current = current.next # Move along the current level
+            if current.down is None:
+                return current
+            current = current.down # Next level down
+
+    def _bottom_head(self):
+        """Return the head node of the bottom level."""
+        current = self._head
+        while current.down is not None:
+            current = current.down
+        return current
+
+    def _first_node(self, key=None):
+        """Return the first node on the bottom level whose key is >= KEY
+        (or the very first node, if KEY is None), or None."""
+        if self._head is None:
+            return None
+        elif key is None:
+            return self._bottom_head().next
+        return self._bottom_before(key).next
+
+    def items(self, lo=None, hi=None):
+        """With no arguments, return the usual view of the (key, value)
+        pairs.  Otherwise, return a generator of the (key, value) pairs
+        with lo <= key < hi, in order, where a bound of None means that
+        side is unbounded."""
+        if lo is None and hi is None:
+            return super().items()
+        return self._items_range(lo, hi)
+
+    def _items_range(self, lo, hi):
+        """Generator for items(LO, HI)."""
+        node = self._first_node(lo)
+        while node is not None and (hi is None or node.key < hi):
+            yield (node.key, node.data)
+            node = node.next
+
+    def keys_from(self, key):
+        """Generator that yields the keys >= KEY, in order."""
+        node = self._first_node(key)
+        while node is not None:
+            yield node.key
+            node = node.next
+
+    def floor(self, key):
+        """Return the largest key in the skiplist that is <= KEY, or None
+        if there is no such key."""
+        if self._head is None:
+            return None
+        node = self._bottom_before(key, inclusive=True)
+        return node.key if isinstance(node, Skiplist.DataNode) else None
+
+    def ceiling(self, key):
+        """Return the smallest key in the skiplist that is >= KEY, or None
+        if there is no such key."""
+        node = self._first_node(key)
+        return None if node is None else node.key
+
+    def pop_min(self):
+        """Remove the item with the smallest key, and return it as a
+        (key, value) pair.  If the skiplist is empty, raise KeyError."""
+        if self._head is None:
+            raise KeyError('pop_min from an empty skiplist')
+        first = self._bottom_head().next
+        # The smallest key's tower is first on every level it reaches
+        head = self._head
+        while head is not None:
+            if head.next is not None and head.next.key == first.key:
+                head.width += head.next.width - 1
+                head.next = head.next.next
+            else:
+                head.width -= 1
+            head = head.down
+        self._count -= 1
+
+        # Drop any levels that are now empty
+        while self._head is not None and self._head.next is None:
+            self._head = self._head.down
+        return (first.key, first.data)
+
     def delete(self, key):
         """Deletes the item with key KEY from the skiplist.
         If no such item exists, raise KeyError."""
-        pass # For HW5, replace with real code
+        # Find the last node before KEY on every level
+        path = []
+        current = self._head
+        while current:
+            if (current.next is None) or (current.next.key >= key):
+                path.append(current)
+                current = current.down # Next level down
+            else:
+                current = current.next # Move along the current level
+        if not path or path[-1].next is None or path[-1].next.key != key:
+            raise KeyError('Key {0} is not in skiplist'.format(key))
+
+        # Unlink KEY's tower where it appears; elsewhere, the link over
+        # it just gets narrower
+        for prior in path:
+            if prior.next is not None and prior.next.key == key:
+                prior.width += prior.next.width - 1
+                prior.next = prior.next.next
+            else:
+                prior.width -= 1
+        self._count -= 1
+
+        # Drop any levels that are now empty
+        while self._head is not None and self._head.next is None:
+            self._head = self._head.down
+
+    # Positional access, using the link widths
+
+    def at(self, index):
+        """Return the key at position INDEX in sorted order (counting from
+        0; negative indices count from the end), in O(log n) expected
+        time.  Raise IndexError if there is no such position."""
+        return self._node_at(index).key
+
+    def index_of(self, key):
+        """Return the position of KEY in sorted order, in O(log n)
+        expected time.  Raise ValueError if KEY is not in the skiplist."""
+        current = self._head
+        rank = -1
+        while current:
+            if (current.next is None) or (current.next.key > key):
+                current = current.down # Next level down
+            elif current.next.key < key:
+                rank += current.width
+                current = current.next # Move along the current level
+            else: # current.next.key == key
+                return rank + current.width
+        raise ValueError('Key {0} is not in skiplist'.format(key))
+
+    def delete_at(self, index):
+        """Remove the item at position INDEX in sorted order, and return
+        it as a (key, value) pair.  Raise IndexError if there is no such
+        position."""
+        node = self._node_at(index)
+        item = (node.key, node.data)
+        self.delete(node.key)
+        return item
+
+    def _node_at(self, index):
+        """Return the bottom-level node at position INDEX."""
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError('Index {0} out of range'.format(index))
+        current = self._head
+        rank = -1
+        while True:
+            while current.next is not None and rank + current.width <= index:
+                rank += current.width
+                current = current.next # Move along the current level
+            if rank == index and current.down is None:
+                return current
+            current = current.down # Next level down
 
     def __delitem__(self, key):
         """Allows deletion from the skiplist using
@@ -164,5 +525,5 @@ class Skiplist(MutableMapping):
                 yield current.key
                 
     def __len__(self):
-        """Return the length of the Skiplist."""
-        return len(list(iter(self)))
\ No newline at end of file
+        """Return the number of keys in the Skiplist, in constant time."""
+        return self._count
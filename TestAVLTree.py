@@ -1,3 +1,5 @@
+import math
+import random
 import unittest
 from AVLTree import AVLTree
 
@@ -210,6 +212,30 @@ class TestAVLTree(unittest.TestCase):
         self.assertEqual(self._3subsL.rightChild().rightChild().data(), 'F')
         self.assertEqual(self._3subsL.rightChild().rightChild()._balance_factor, 0) # type: ignore
 
+    def test_len_height(self) -> None:
+        self.assertEqual((len(self._1node), self._1node.height()), (1, 1))
+        self.assertEqual((len(self._5nodes), self._5nodes.height()), (5, 3))
+        self._5nodes.add('K') # Rotation below the root
+        self.assertEqual((len(self._5nodes), self._5nodes.height()), (6, 3))
+        self.assertEqual(len(self._5nodes.rightChild()), 3)
+        self._3subsL.add('A') # Rotation at the root
+        self.assertEqual((len(self._3subsL), self._3subsL.height()), (6, 3))
+        self.assertTrue(self._3subsL._invariant())
+
+    def test_order_statistics(self) -> None:
+        tree: AVLTree[int] = AVLTree[int](0)
+        for i in range(1, 100):
+            tree.add(i)     # Lots of rotations
+        self.assertEqual(tree.height(), 7)
+        for i in range(100):
+            self.assertEqual(tree.select(i), i)
+            self.assertEqual(tree.rank(i), i)
+        self.assertEqual(tree.count_range(10, 20), 10)
+
+    def test_slots(self) -> None:
+        self.assertFalse(hasattr(self._5nodes, '__dict__'))
+        self.assertFalse(hasattr(self._5nodes.leftChild(), '__dict__'))
+
     def test_rmAbsentL(self) -> None:
         with self.assertRaises(ValueError):
             self._1node.remove('A')
@@ -295,5 +321,60 @@ class TestAVLTree(unittest.TestCase):
         self.assertEqual(self._3subsR.rightChild()._balance_factor, 1) # type: ignore
         self.assertEqual(self._3subsR.rightChild().leftChild()._balance_factor, 0) # type: ignore
 
+    def test_from_sorted(self) -> None:
+        for n in range(1, 40):
+            with self.subTest(n=n):
+                tree = AVLTree.from_sorted(range(n))
+                self.assertIsInstance(tree, AVLTree)
+                self.assertTrue(tree._invariant())
+                self.assertEqual(tree.inorder(), list(range(n)))
+                self.assertEqual(tree.height(), math.ceil(math.log2(n + 1)))
+        letters = AVLTree.from_iterable('QWERTYUIOP')
+        self.assertEqual(letters.inorder(), sorted('QWERTYUIOP'))
+        for value in 'ABCDEFGH':
+            letters.add(value)
+        for value in 'QWRTY':
+            letters.remove(value)
+        self.assertTrue(letters._invariant())
+        self.assertEqual(letters.inorder(), sorted('ABCDEFGHUIOP'))
+
+    def test_irange(self) -> None:
+        tree: AVLTree[int] = AVLTree[int](0)
+        for i in range(1, 50):
+            tree.add(i * 2)
+        self.assertEqual(list(tree.irange(11, 21)), [12, 14, 16, 18, 20])
+        self.assertEqual(list(tree.irange(90, reverse=True)), [98, 96, 94, 92, 90])
+        self.assertEqual((tree.floor(11), tree.ceiling(11)), (10, 12))
+
+    def test_mixed_add_remove(self) -> None:
+        rng = random.Random(203)
+        tree: AVLTree[int] = AVLTree[int](300)
+        present = {300}
+        for step in range(1000):
+            value = rng.randrange(600)
+            if value in present and len(present) > 1:
+                tree.remove(value)
+                present.remove(value)
+            else:
+                tree.add(value)
+                present.add(value)
+            if step % 100 == 0:
+                self.assertTrue(tree._invariant())
+        self.assertTrue(tree._invariant())
+        self.assertEqual(tree.inorder(), sorted(present))
+        self.assertEqual(len(tree), len(present))
+        # AVL height bound
+        self.assertLessEqual(tree.height(), 1.45 * math.log2(len(present) + 2))
+
+    def test_remove_keeps_balance(self) -> None:
+        tree: AVLTree[int] = AVLTree[int](0)
+        for i in range(1, 64):
+            tree.add(i)
+        for i in range(0, 60):
+            tree.remove(i)   # Always removes the minimum
+            self.assertTrue(tree._invariant())
+        self.assertEqual(tree.inorder(), [60, 61, 62, 63])
+        self.assertEqual(tree.height(), 3)
+
 if __name__ == '__main__':
     unittest.main()
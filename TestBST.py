@@ -1,9 +1,10 @@
 # Empty unit-testing class
 # Peter Brown, 26 Jan 2017
 
+import sys
 import unittest
 from BST import BST
-from typing import cast, List
+from typing import cast, List, Optional
 
 class TestBST(unittest.TestCase):
     def setUp(self) -> None:
@@ -78,6 +79,29 @@ class TestBST(unittest.TestCase):
         self.assertEqual(self._7nodes.rightChild().findSuccessor().data(), 70)                          # type: ignore
         self.assertEqual(self._7nodes.rightChild().rightChild().findSuccessor(), None)                  # type: ignore
 
+    def testSuccessorNoMutation(self) -> None:
+        # Walking the whole tree by successors leaves it unchanged
+        before = self._10nodes.preorder()
+        node: Optional[BST[int]] = self._10nodes._minNode()
+        values = []
+        while node is not None:
+            values.append(node.data())
+            node = node.findSuccessor()
+        self.assertEqual(values, self._10nodes.inorder())
+        self.assertEqual(self._10nodes.preorder(), before)
+
+    def testPredecessor(self) -> None:
+        self.assertEqual(self._1node.findPredecessor(), None)
+        self.assertEqual(self._7nodes.findPredecessor().data(), 31)                             # type: ignore
+        self.assertEqual(self._7nodes.rightChild().leftChild().findPredecessor().data(), 34)    # type: ignore
+        self.assertEqual(self._7nodes.leftChild().leftChild().findPredecessor(), None)          # type: ignore
+        node: Optional[BST[int]] = self._10nodes._maxNode()
+        values = []
+        while node is not None:
+            values.append(node.data())
+            node = node.findPredecessor()
+        self.assertEqual(values, list(reversed(self._10nodes.inorder())))
+
     def testRemove_1node(self) -> None:
         with self.assertRaises(ValueError):
             self._1node.remove(31)
@@ -129,6 +153,148 @@ class TestBST(unittest.TestCase):
         self.assertEqual(self._7nodes.rightChild().data(), 47)  # Right child should be 47
         self.assertEqual(self._7nodes.inorder(), cast(List[int], [6, 15, 31, 42, 47, 70]))                  # That should be the whole tree
 
+    def test_len_height(self) -> None:
+        self.assertEqual((len(self._1node), self._1node.height()), (1, 1))
+        self.assertEqual((len(self._3nodes), self._3nodes.height()), (3, 2))
+        self.assertEqual((len(self._7nodes), self._7nodes.height()), (7, 4))
+        self.assertEqual((len(self._10nodes), self._10nodes.height()), (10, 5))
+        self.assertEqual(len(self._7nodes.leftChild()), 3)
+        self._7nodes.add(42)    # Already present
+        self.assertEqual(len(self._7nodes), 7)
+        self._7nodes.remove(15)
+        self.assertEqual((len(self._7nodes), self._7nodes.height()), (6, 3))
+        self._7nodes.remove(34)
+        self.assertEqual((len(self._7nodes), self._7nodes.height()), (5, 3))
+        self.assertTrue(self._7nodes._invariant())
+
+    def test_rank(self) -> None:
+        self.assertEqual(self._1node.rank(34), 0)
+        self.assertEqual(self._1node.rank(35), 1)
+        for i, value in enumerate(self._10nodes.inorder()):
+            with self.subTest(value=value):
+                self.assertEqual(self._10nodes.rank(value), i)
+                self.assertEqual(self._10nodes.rank(value + 0.5), i + 1) # type: ignore
+        self.assertEqual(self._10nodes.rank(0), 0)
+        self.assertEqual(self._10nodes.rank(100), 10)
+
+    def test_select(self) -> None:
+        self.assertEqual(self._1node.select(0), 34)
+        for i, value in enumerate(self._10nodes.inorder()):
+            with self.subTest(i=i):
+                self.assertEqual(self._10nodes.select(i), value)
+        with self.assertRaises(IndexError):
+            self._10nodes.select(10)
+        with self.assertRaises(IndexError):
+            self._10nodes.select(-1)
+        self._7nodes.remove(34)
+        self.assertEqual(self._7nodes.select(3), 42)
+
+    def test_count_range(self) -> None:
+        self.assertEqual(self._7nodes.count_range(0, 100), 7)
+        self.assertEqual(self._7nodes.count_range(15, 47), 4)    # 15, 31, 34, 42
+        self.assertEqual(self._7nodes.count_range(16, 48), 4)    # 31, 34, 42, 47
+        self.assertEqual(self._7nodes.count_range(35, 41), 0)
+        self.assertEqual(self._7nodes.count_range(47, 15), 0)
+
+    def test_sorted_input_no_recursion(self) -> None:
+        # Sorted input makes a chain as deep as the tree is big.  With a
+        # low recursion limit, any recursive walk down the chain would fail.
+        n = 400
+        oldLimit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            chain: BST[int] = BST[int](0)
+            for i in range(1, n):
+                chain.add(i)
+            self.assertEqual(chain.height(), n)
+            self.assertTrue((n-1) in chain)
+            self.assertFalse(n in chain)
+            for i in range(0, n, 2):
+                chain.remove(i)
+            self.assertEqual(len(chain), n // 2)
+            self.assertEqual(chain.inorder(), list(range(1, n, 2)))
+        finally:
+            sys.setrecursionlimit(oldLimit)
+
+    def test_from_sorted(self) -> None:
+        tree: BST[int] = BST.from_sorted(range(100))
+        self.assertTrue(tree._invariant())
+        self.assertEqual(tree.inorder(), list(range(100)))
+        self.assertEqual(len(tree), 100)
+        self.assertEqual(tree.height(), 7)
+        self.assertTrue(tree.isRoot())
+        tree.add(100)
+        tree.remove(50)
+        self.assertTrue(tree._invariant())
+        self.assertEqual(BST.from_sorted([1, 1, 2, 3, 3]).inorder(), [1, 2, 3])
+        with self.assertRaises(ValueError):
+            BST.from_sorted([])
+        with self.assertRaises(ValueError):
+            BST.from_sorted([1, 3, 2])
+
+    def test_from_iterable(self) -> None:
+        tree: BST[int] = BST.from_iterable([47, 31, 34, 70, 6, 15, 42, 6])
+        self.assertEqual(tree.inorder(), [6, 15, 31, 34, 42, 47, 70])
+        self.assertEqual(tree.height(), 3)
+        self.assertEqual(type(tree), BST)
+        with self.assertRaises(ValueError):
+            BST.from_iterable([])
+
+    def test_min_max(self) -> None:
+        self.assertEqual((self._1node.min(), self._1node.max()), (34, 34))
+        self.assertEqual((self._7nodes.min(), self._7nodes.max()), (6, 70))
+        self.assertEqual((self._10nodes.min(), self._10nodes.max()), (11, 32))
+
+    def test_floor_ceiling(self) -> None:
+        self.assertEqual(self._7nodes.floor(34), 34)
+        self.assertEqual(self._7nodes.floor(33), 31)
+        self.assertEqual(self._7nodes.floor(100), 70)
+        self.assertEqual(self._7nodes.floor(5), None)
+        self.assertEqual(self._7nodes.ceiling(34), 34)
+        self.assertEqual(self._7nodes.ceiling(35), 42)
+        self.assertEqual(self._7nodes.ceiling(0), 6)
+        self.assertEqual(self._7nodes.ceiling(71), None)
+
+    def test_irange(self) -> None:
+        tree = self._7nodes     # 6, 15, 31, 34, 42, 47, 70
+        self.assertEqual(list(tree.irange()), [6, 15, 31, 34, 42, 47, 70])
+        self.assertEqual(list(tree.irange(15, 42)), [15, 31, 34, 42])
+        self.assertEqual(list(tree.irange(15, 42, inclusive=(False, False))), [31, 34])
+        self.assertEqual(list(tree.irange(15, 42, inclusive=(True, False))), [15, 31, 34])
+        self.assertEqual(list(tree.irange(16, 41)), [31, 34])
+        self.assertEqual(list(tree.irange(lo=40)), [42, 47, 70])
+        self.assertEqual(list(tree.irange(hi=15)), [6, 15])
+        self.assertEqual(list(tree.irange(35, 41)), [])
+        self.assertEqual(list(tree.irange(15, 42, reverse=True)), [42, 34, 31, 15])
+        self.assertEqual(list(tree.irange(15, 42, inclusive=(False, False), reverse=True)), [34, 31])
+        self.assertEqual(list(tree.irange(reverse=True)), [70, 47, 42, 34, 31, 15, 6])
+        # On a subtree, the range stays inside the subtree
+        self.assertEqual(list(cast(BST[int], tree.leftChild()).irange()), [6, 15, 31])
+
+    def test_cursor(self) -> None:
+        cursor = self._10nodes.cursor(16)
+        self.assertTrue(cursor.isValid())
+        self.assertEqual(cursor.value(), 17)
+        self.assertTrue(cursor.moveNext())
+        self.assertEqual(cursor.value(), 18)
+        self.assertTrue(cursor.movePrev())
+        self.assertTrue(cursor.movePrev())
+        self.assertEqual(cursor.value(), 15)
+        cursor = self._10nodes.cursor()
+        values = []
+        while cursor.isValid():
+            values.append(cursor.value())
+            cursor.moveNext()
+        self.assertEqual(values, self._10nodes.inorder())
+        self.assertFalse(cursor.moveNext())
+        with self.assertRaises(ValueError):
+            cursor.value()
+        cursor = self._10nodes.cursor(reverse=True)
+        self.assertEqual(cursor.value(), 32)
+        cursor = self._10nodes.cursor(26, reverse=True)
+        self.assertEqual(cursor.value(), 22)
+        self.assertFalse(self._10nodes.cursor(33).isValid())
+
     def test_inorder(self) -> None:
         self.assertEqual(self._1node.inorder(), cast(List[int], [34]))
         self.assertEqual(self._3nodes.inorder(), cast(List[int], [31, 34, 47]))
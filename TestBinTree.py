@@ -118,6 +118,27 @@ class TestBinTree(unittest.TestCase):
         self.assertEqual(len(self._full), 11)
         self.assertFalse(self._full.hasRightChild())
 
+    def test_metadata_nested(self) -> None:
+        # Changes deep in the tree are reflected in the root's cached values
+        self._full.leftChild().leftChild().addLeft('mammal-ish')
+        self.assertEqual(len(self._full), 16)
+        self.assertEqual(self._full.height(), 6)
+        self.assertTrue(self._full._invariant())
+        self._full.leftChild().removeLeft()
+        self.assertEqual(len(self._full), 9)
+        self.assertEqual(self._full.height(), 5)
+        self._full.rightChild().removeRight()
+        self.assertEqual(len(self._full), 6)
+        self.assertEqual(self._full.height(), 5)
+        self._full.leftChild().rightChild().removeRight()
+        self.assertEqual(len(self._full), 4)
+        self.assertEqual(self._full.height(), 3)
+
+    def test_slots(self) -> None:
+        self.assertFalse(hasattr(self._full, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self._full.color = 'red' # type: ignore
+
     def test_preorder(self) -> None:
         self.assertEqual(self._empty.preorder(), [])
         self.assertEqual(self._leftOnly.preorder(), ['animal', 'mammal'])
@@ -137,5 +158,34 @@ class TestBinTree(unittest.TestCase):
         self.assertEqual(self._full.inorder(), ['lion', 'feline', 'cat', 'carnivore', 'canine', 'wolf', 'mammal', 'ungulate', 'bovid', 'gazelle', 'animal', 'bird', 'passerine', 'corvid', 'crow'])
 
 
+    def test_levelorder(self) -> None:
+        self.assertEqual(self._empty.levelorder(), [])
+        self.assertEqual(self._leftOnly.levelorder(), ['animal', 'mammal'])
+        self.assertEqual(self._rightOnly.levelorder(), ['animal', 'bird'])
+        self.assertEqual(self._full.levelorder(), ['animal', 'mammal', 'bird', 'carnivore', 'ungulate', 'passerine', 'feline', 'canine', 'bovid', 'corvid', 'lion', 'cat', 'wolf', 'gazelle', 'crow'])
+
+    def test_iter(self) -> None:
+        self.assertEqual(list(self._empty), [])
+        self.assertEqual(list(self._full), self._full.inorder())
+
+    def test_iter_lazy(self) -> None:
+        it = self._full.iter_preorder()
+        self.assertEqual(next(it), 'animal')
+        self.assertEqual(next(it), 'mammal')
+        it = self._full.iter_postorder()
+        self.assertEqual(next(it), 'lion')
+
+    def test_deep_traversals(self) -> None:
+        # A chain much deeper than the recursion limit
+        n = 5000
+        chain = BinTree[int](0)
+        for i in range(1, n):
+            chain.addLeft(i)   # Pushes the existing left child down
+        self.assertEqual(list(chain.iter_preorder()), [0] + list(range(n-1, 0, -1)))
+        self.assertEqual(list(chain.iter_inorder()), list(range(1, n)) + [0])
+        self.assertEqual(list(chain.iter_postorder()), list(range(1, n)) + [0])
+        self.assertEqual(list(chain.iter_levelorder()), [0] + list(range(n-1, 0, -1)))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,141 @@
+import random
+import unittest
+from AVLTree import AVLTree
+from CompactAVLTree import CompactAVLTree
+
+class TestCompactAVLTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self._empty: CompactAVLTree[int] = CompactAVLTree[int]()
+
+        self._1node: CompactAVLTree[str] = CompactAVLTree[str]('F')
+
+        self._5nodes: CompactAVLTree[str] = CompactAVLTree[str]('F')    #       F
+        self._5nodes.add('H')                                           #      / \
+        self._5nodes.add('D')                                           #     D   H
+        self._5nodes.add('B')                                           #    /     \
+        self._5nodes.add('J')                                           #   B       J
+
+        self._ints: CompactAVLTree[int] = CompactAVLTree[int](typecode='q')
+        for i in range(0, 100, 2):
+            self._ints.add(i)
+
+    def test_empty(self) -> None:
+        self.assertTrue(self._empty.isEmpty())
+        self.assertEqual(len(self._empty), 0)
+        self.assertEqual(self._empty.height(), 0)
+        self.assertEqual(self._empty.inorder(), [])
+        self.assertFalse(3 in self._empty)
+        with self.assertRaises(ValueError):
+            self._empty.remove(3)
+        with self.assertRaises(ValueError):
+            self._empty.min()
+
+    def test_structure(self) -> None:
+        self.assertTrue(self._5nodes._invariant())
+        self.assertEqual(self._5nodes.inorder(), ['B', 'D', 'F', 'H', 'J'])
+        self.assertEqual(self._5nodes.preorder(), ['F', 'D', 'B', 'H', 'J'])
+        self.assertEqual(self._5nodes.postorder(), ['B', 'D', 'J', 'H', 'F'])
+        self.assertEqual(self._5nodes.levelorder(), ['F', 'D', 'H', 'B', 'J'])
+        self._5nodes.add('K') # Force a left rotation
+        self.assertEqual(self._5nodes.preorder(), ['F', 'D', 'B', 'J', 'H', 'K'])
+        self._5nodes.add('A') # Force a right rotation
+        self.assertEqual(self._5nodes.preorder(), ['F', 'B', 'A', 'D', 'J', 'H', 'K'])
+        self.assertTrue(self._5nodes._invariant())
+
+    def test_remove(self) -> None:
+        self._1node.remove('F')
+        self.assertTrue(self._1node.isEmpty())
+        self._1node.add('G')
+        self.assertEqual(self._1node.inorder(), ['G'])
+        self._5nodes.remove('F')
+        self.assertEqual(self._5nodes.preorder(), ['H', 'D', 'B', 'J'])
+        self.assertTrue(self._5nodes._invariant())
+        with self.assertRaises(ValueError):
+            self._5nodes.remove('F')
+
+    def test_free_list(self) -> None:
+        slots = len(self._ints._keys)
+        for i in range(0, 20, 2):
+            self._ints.remove(i)
+        for i in range(1, 20, 2):
+            self._ints.add(i)
+        self.assertEqual(len(self._ints._keys), slots) # Slots were reused
+        self.assertEqual(len(self._ints), 50)
+        self.assertTrue(self._ints._invariant())
+
+    def test_queries(self) -> None:
+        tree = self._ints   # 0, 2, 4, ..., 98
+        self.assertEqual(len(tree), 50)
+        self.assertEqual(tree.height(), 6)
+        self.assertTrue(42 in tree)
+        self.assertFalse(43 in tree)
+        self.assertEqual((tree.min(), tree.max()), (0, 98))
+        self.assertEqual((tree.floor(43), tree.ceiling(43)), (42, 44))
+        self.assertEqual((tree.floor(-1), tree.ceiling(99)), (None, None))
+        self.assertEqual(tree.rank(43), 22)
+        self.assertEqual(tree.select(22), 44)
+        self.assertEqual(tree.count_range(10, 20), 5)
+        self.assertEqual(list(tree.irange(11, 21)), [12, 14, 16, 18, 20])
+        self.assertEqual(list(tree.irange(10, 20, inclusive=(False, False))), [12, 14, 16, 18])
+        self.assertEqual(list(tree.irange(90, reverse=True)), [98, 96, 94, 92, 90])
+        with self.assertRaises(IndexError):
+            tree.select(50)
+
+    def test_cursor(self) -> None:
+        cursor = self._ints.cursor(43)
+        self.assertTrue(cursor.isValid())
+        self.assertEqual(cursor.value(), 44)
+        self.assertTrue(cursor.moveNext())
+        self.assertEqual(cursor.value(), 46)
+        self.assertTrue(cursor.movePrev())
+        self.assertTrue(cursor.movePrev())
+        self.assertEqual(cursor.value(), 42)
+        letters = self._5nodes.cursor()
+        values = []
+        while letters.isValid():
+            values.append(letters.value())
+            letters.moveNext()
+        self.assertEqual(values, self._5nodes.inorder())
+        self.assertFalse(letters.moveNext())
+        with self.assertRaises(ValueError):
+            letters.value()
+        self.assertEqual(self._ints.cursor(reverse=True).value(), 98)
+        self.assertEqual(self._ints.cursor(43, reverse=True).value(), 42)
+        self.assertFalse(self._ints.cursor(99).isValid())
+        self.assertFalse(self._empty.cursor().isValid())
+
+    def test_from_sorted(self) -> None:
+        for n in range(0, 40):
+            with self.subTest(n=n):
+                tree = CompactAVLTree.from_sorted(range(n), 'i')
+                self.assertEqual(tree.inorder(), list(range(n)))
+                self.assertEqual(tree.preorder(), AVLTree.from_sorted(range(n)).preorder() if n else [])
+        letters = CompactAVLTree.from_iterable('QWERTYUIOP')
+        self.assertEqual(letters.inorder(), sorted('QWERTYUIOP'))
+        with self.assertRaises(ValueError):
+            CompactAVLTree.from_sorted([3, 2, 1])
+
+    def test_matches_AVLTree(self) -> None:
+        # Same operations give the same shape as the node-based AVLTree
+        rng = random.Random(8)
+        tree: AVLTree[int] = AVLTree[int](250)
+        compact: CompactAVLTree[int] = CompactAVLTree[int](250, 'q')
+        present = {250}
+        for step in range(1000):
+            value = rng.randrange(500)
+            if value in present and len(present) > 1:
+                tree.remove(value)
+                compact.remove(value)
+                present.remove(value)
+            else:
+                tree.add(value)
+                compact.add(value)
+                present.add(value)
+        self.assertTrue(compact._invariant())
+        self.assertEqual(compact.preorder(), tree.preorder())
+        self.assertEqual(compact.height(), tree.height())
+        self.assertEqual(len(compact), len(tree))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import random
+import sys
+import threading
+import unittest
+from ConcurrentSkiplist import ConcurrentSkiplist
+from Skiplist import Skiplist
+
+class TestConcurrentSkiplist(unittest.TestCase):
+
+    def setUp(self):
+        self._skiplist = ConcurrentSkiplist(seed=144000) # Predictable structure
+        self._skiplist.update_sorted((i, -i) for i in range(0, 300, 3))
+        # Switch threads often, so that they interleave a lot
+        self._interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._interval)
+
+    def checkStructure(self, skiplist):
+        """Every level is sorted, and every link's width is the distance
+        between its ends on the bottom level."""
+        position = {key: i for i, key in enumerate(skiplist)}
+        head = skiplist._head
+        while head is not None:
+            start, width, node = -1, head.width, head.next
+            while node is not None:
+                self.assertEqual(position[node.key] - start, width)
+                start, width, node = position[node.key], node.width, node.next
+            self.assertEqual(len(skiplist) - start, width)
+            head = head.down
+
+    def runThreads(self, targets):
+        """Run each of TARGETS in its own thread, and re-raise the first
+        exception any of them raised."""
+        errors = []
+        def wrap(target):
+            def run():
+                try:
+                    target()
+                except BaseException as error:
+                    errors.append(error)
+            return run
+        threads = [threading.Thread(target=wrap(target)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def testIsSkiplist(self):
+        self.assertIsInstance(self._skiplist, Skiplist)
+        self.assertEqual(len(self._skiplist), 100)
+        self.assertEqual(self._skiplist[42], -42)
+        self.assertEqual(self._skiplist.at(14), 42)
+        self.assertEqual(self._skiplist.index_of(42), 14)
+        self.assertEqual(self._skiplist.floor(43), 42)
+        self.assertEqual(self._skiplist.ceiling(43), 45)
+        self.assertEqual(list(self._skiplist.items(3, 10)), [(3, -3), (6, -6), (9, -9)])
+        self.assertEqual(self._skiplist.pop(3), -3)
+        self.assertEqual(self._skiplist.pop(3, None), None)
+        self.assertEqual(self._skiplist.setdefault(4, 'four'), 'four')
+        self.assertEqual(self._skiplist.setdefault(4, 'FOUR'), 'four')
+        self.assertEqual(self._skiplist.pop_min(), (0, 0))
+        self.assertEqual(self._skiplist.delete_at(0), (4, 'four'))
+        self.assertEqual(list(self._skiplist.values())[:2], [-6, -9])
+        self.checkStructure(self._skiplist)
+        self.assertEqual(list(ConcurrentSkiplist()), [])
+
+    def testStress(self):
+        # Writers add and remove keys that aren't multiples of 3, while
+        # readers check that the multiples of 3, which stay in the list
+        # throughout, can always be found, and that iteration is sorted.
+        skiplist = self._skiplist
+        stable = list(range(0, 300, 3))
+        done = threading.Event()
+
+        def writer(seed):
+            rng = random.Random(seed)
+            for step in range(1500):
+                key = rng.randrange(300)
+                if key % 3 == 0:
+                    continue
+                if rng.randrange(2) == 0:
+                    skiplist[key] = step
+                else:
+                    skiplist.pop(key, None)
+
+        def reader(seed):
+            rng = random.Random(seed)
+            while not done.is_set():
+                key = rng.choice(stable)
+                self.assertEqual(skiplist[key], -key)
+                self.assertIn(key, skiplist)
+                self.assertEqual(skiplist.floor(key), key)
+                keys = list(skiplist)
+                self.assertEqual(keys, sorted(set(keys)))
+                self.assertTrue(set(stable) <= set(keys))
+                self.assertEqual([k for k, v in skiplist.items(key, key + 1)], [key])
+
+        def writers():
+            try:
+                self.runThreads([lambda seed=seed: writer(seed) for seed in range(4)])
+            finally:
+                done.set()
+
+        self.runThreads([writers] + [lambda seed=seed: reader(seed) for seed in range(10, 14)])
+        self.checkStructure(skiplist)
+        keys = list(skiplist)
+        self.assertEqual(len(keys), len(skiplist))
+        self.assertEqual([skiplist.at(i) for i in range(len(keys))], keys)
+
+    def testDrainAndRefill(self):
+        # Emptying the list (which removes its head) while readers run
+        skiplist = self._skiplist
+        done = threading.Event()
+
+        def writer():
+            try:
+                for repeat in range(20):
+                    while len(skiplist) > 0:
+                        skiplist.pop_min()
+                    skiplist.update_sorted((i, -i) for i in range(0, 300, 3))
+            finally:
+                done.set()
+
+        def reader():
+            while not done.is_set():
+                for key in skiplist:
+                    self.assertEqual(key % 3, 0)
+                ceiling = skiplist.ceiling(150)
+                self.assertTrue(ceiling is None or (ceiling >= 150 and ceiling % 3 == 0))
+                skiplist.get(150)
+
+        self.runThreads([writer, reader, reader])
+        self.checkStructure(skiplist)
+        self.assertEqual(list(skiplist.items()), [(i, -i) for i in range(0, 300, 3)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,7 @@
+import os
+import random
+import tempfile
+import tracemalloc
 import unittest
 from Matcher import Matcher
 
@@ -106,6 +110,309 @@ class TestMatcher(unittest.TestCase):
         self.assertEqual(self._bookText.find(self._repeatN),
                         Matcher.BM_matcher(self._repeatN, self._bookText))
 
+    def test_BM_galil_regression(self):
+        # Galil's rule used to skip comparisons after a bad character shift
+        self.assertEqual(Matcher.BM_matcher('baba', 'baabaababbbbb'), -1)
+        text = 'bbbaaabbbbbbabbaabaababaaaaaababbbabbbbbba'
+        self.assertEqual(Matcher.BM_matcher('baba', text), text.find('baba'))
+
+    def test_debug_agrees(self):
+        # The fast paths and the checked loops give the same answers
+        rng = random.Random(24)
+        matchers = [Matcher.simple_matcher, Matcher.KMP_matcher, Matcher.BM_matcher]
+        for trial in range(300):
+            pattern = ''.join(rng.choice('ab') for i in range(rng.randint(1, 6)))
+            text = ''.join(rng.choice('ab') for i in range(rng.randint(1, 40)))
+            for matcher in matchers:
+                results = []
+                for debug in (False, True):
+                    Matcher.DEBUG = debug
+                    try:
+                        results.append(matcher(pattern, text))
+                    finally:
+                        Matcher.DEBUG = False
+                self.assertEqual(results, [text.find(pattern)] * 2,
+                                 (matcher.__name__, pattern, text))
+        self.assertEqual(Matcher.simple_matcher('ACGT', 'ACG'), -1)
+
+    def test_suffix_shift_table(self):
+        # S[0] is the period; the rest is the good suffix rule's shifts
+        self.assertEqual(Matcher.suffix_shift_table('ANPANMAN'), [6, 6, 6, 6, 6, 6, 3, 8, 1])
+        self.assertEqual(Matcher.suffix_shift_table(b'abab'), [2, 2, 2, 4, 1])
+        self.assertEqual(Matcher.suffix_shift_table('a'), [1, 1])
+
+    def test_finditer(self):
+        cases = [(self._ACATA, self._bookText, [5]),
+                 (self._repeat2, self._bookText3, [7]),
+                 ('ACA', self._bookText, [3, 5]),      # Overlapping
+                 ('TTT', self._t8a1, [0, 1, 2, 3, 4, 5]),
+                 ('ACT', 'ACTACTACT', [0, 3, 6]),
+                 (self._ACACAT, self._bookText2, []),
+                 ('A', 'AAA', [0, 1, 2]),
+                 ('ACGT', 'ACG', [])]
+        for algorithm in Matcher.ALGORITHMS:
+            for pattern, text, expected in cases:
+                with self.subTest(algorithm=algorithm, pattern=pattern, text=text):
+                    self.assertEqual(list(Matcher.finditer(pattern, text, algorithm)),
+                                     expected)
+            self.assertEqual(list(Matcher.finditer('', 'ACG', algorithm)), [0, 1, 2, 3])
+
+    def test_finditer_is_lazy(self):
+        matches = Matcher.finditer('A', 'A' * 10**6 + 'C', 'BM')
+        self.assertEqual(next(matches), 0)
+        self.assertEqual(next(matches), 1)
+        with self.assertRaises(ValueError):
+            Matcher.finditer('A', 'A', 'regex')
+
+    def test_finditer_agrees(self):
+        # Every algorithm agrees with a brute-force search
+        rng = random.Random(17)
+        for trial in range(300):
+            pattern = ''.join(rng.choice('ab') for i in range(rng.randint(1, 6)))
+            text = ''.join(rng.choice('ab') for i in range(rng.randint(0, 40)))
+            expected = [i for i in range(len(text)) if text.startswith(pattern, i)]
+            for algorithm in Matcher.ALGORITHMS:
+                self.assertEqual(list(Matcher.finditer(pattern, text, algorithm)),
+                                 expected, (algorithm, pattern, text))
+
+    def test_compile(self):
+        for algorithm in Matcher.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                compiled = Matcher.compile('ACA', algorithm)
+                self.assertEqual(compiled.pattern, 'ACA')
+                self.assertEqual(compiled.algorithm, algorithm)
+                self.assertEqual(compiled.search(self._bookText), 3)
+                self.assertEqual(list(compiled.finditer(self._bookText)), [3, 5])
+                self.assertEqual(compiled.search(self._t8a1), -1)
+                self.assertEqual(list(compiled.finditer('ACACA')), [0, 2])
+                self.assertEqual(Matcher.compile('', algorithm).search('ACG'), 0)
+        with self.assertRaises(ValueError):
+            Matcher.compile('ACA', 'regex')
+
+    def test_compile_cache(self):
+        Matcher.purge()
+        first = Matcher.compile(self._ACATA, 'BM')
+        self.assertIs(Matcher.compile(self._ACATA, 'BM'), first)
+        self.assertIsNot(Matcher.compile(self._ACATA, 'KMP'), first)
+        self.assertEqual(Matcher._cache.cache_info().hits, 1)
+        list(Matcher.finditer(self._ACATA, self._bookText, 'BM'))   # Uses the cache too
+        self.assertEqual(Matcher._cache.cache_info().hits, 2)
+        Matcher.purge()
+        self.assertIsNot(Matcher.compile(self._ACATA, 'BM'), first)
+        # Changing CACHE_SIZE takes effect on the next compile
+        size = Matcher.CACHE_SIZE
+        try:
+            Matcher.CACHE_SIZE = 1
+            Matcher.compile('ACA', 'KMP')
+            Matcher.compile('CAT', 'KMP')
+            self.assertEqual(Matcher._cache.cache_info().currsize, 1)
+        finally:
+            Matcher.CACHE_SIZE = size
+            Matcher.purge()
+        # An alphabet can be any iterable of characters, hashable or not
+        compiled = Matcher.compile('ACA', 'DFA', alphabet=['T', 'G', 'C', 'A'])
+        self.assertIs(Matcher.compile('ACA', 'DFA', alphabet='ACGT'), compiled)
+        self.assertEqual(Matcher.compile(b'ACA', 'DFA', alphabet=list(b'ACGT'))
+                         .search(b'GGACAT'), 2)
+
+    def test_compile_DFA_alphabet(self):
+        # By default the DFA's alphabet is the pattern's characters; other
+        # characters just send it back to the start
+        compiled = Matcher.compile('ACA', 'DFA')
+        self.assertEqual(list(compiled.finditer('xACAyACACA')), [1, 5, 7])
+
+    def test_DFA_table(self):
+        # The fast construction agrees with the DFA's definition
+        rng = random.Random(19)
+        for trial in range(100):
+            pattern = ''.join(rng.choice('ACG') for i in range(rng.randint(0, 8)))
+            symbols, DFA = Matcher._make_DFA(pattern, 'ACGT')
+            width = len(symbols) + 1
+            self.assertEqual(len(DFA), (len(pattern) + 1) * width)
+            for state in range(len(pattern) + 1):
+                for symbol in 'ACGT':
+                    self.assertEqual(DFA[state * width + symbols[symbol]],
+                                     Matcher._find_next_state(pattern, state, symbol),
+                                     (pattern, state, symbol))
+                self.assertEqual(DFA[state * width + width - 1], 0)
+
+    def test_DFA_outside_alphabet(self):
+        self.assertEqual(Matcher.DFA_matcher(self._ACATA, 'xx' + self._bookText, 'ACGT'),
+                         self._bookText.find(self._ACATA) + 2)
+        self.assertEqual(Matcher.DFA_matcher('ACA', 'AC-ACA', 'ACGT'), 3)
+        # Pattern characters missing from the alphabet are added to it
+        self.assertEqual(Matcher.DFA_matcher('ACN', 'ACACNAC', 'ACGT'), 2)
+
+    def test_DFA_long_pattern(self):
+        pattern = 'AB' * 2000 + 'C'
+        text = 'AB' * 5000 + 'C'
+        self.assertEqual(Matcher.DFA_matcher(pattern, text, 'ABC'), text.find(pattern))
+
+    def test_BM_tables(self):
+        table = Matcher.last_occurrence_table(b'abcab')
+        self.assertEqual(len(table), 256)
+        self.assertEqual((table[ord('a')], table[ord('b')], table[ord('c')], table[0]),
+                         (3, 4, 2, -1))
+        table = Matcher.last_occurrence_table('\u00e9t\u00e9!')
+        self.assertEqual(len(table), 3)     # Only the pattern's characters
+        self.assertEqual((table['\u00e9'], table['!'], table['x']), (2, 3, -1))
+        self.assertEqual(len(table), 3)     # Looking up 'x' didn't add it
+        compiled = Matcher.compile('été!', 'BM')
+        self.assertEqual(compiled.search('un été!'), 3)
+        self.assertEqual(len(compiled._tables[0]), 3)  # Nor did searching
+        table = Matcher.horspool_table('abcab')
+        self.assertEqual((table['a'], table['b'], table['c'], table['x']), (1, 3, 2, 5))
+        self.assertEqual(Matcher.horspool_table(b'abcab')[ord('b')], 3)
+
+    def test_BM_any_text(self):
+        text = 'GET /index.html 200, GET /404.html 404; get /INDEX.HTML 200'
+        for algorithm in ('BM', 'Horspool'):
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(list(Matcher.finditer('/index.html', text, algorithm)), [4])
+                self.assertEqual(list(Matcher.finditer('/index.html', text, algorithm,
+                                                       ignore_case=True)), [4, 44])
+                self.assertEqual(list(Matcher.finditer(b'404', text.encode(), algorithm)),
+                                 [26, 35])
+                self.assertEqual(list(Matcher.finditer('\u00e9t\u00e9', 'un \u00e9t\u00e9 \u00c9T\u00c9',
+                                                       algorithm, ignore_case=True)), [3, 7])
+
+    def test_bytes_and_case(self):
+        text = b'ACGACACATAGTCACTTGGCA'
+        for algorithm in Matcher.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(list(Matcher.finditer(b'ACA', text, algorithm)), [3, 5])
+                self.assertEqual(list(Matcher.finditer(b'aca', text, algorithm)), [])
+                self.assertEqual(list(Matcher.finditer(b'aca', text, algorithm,
+                                                       ignore_case=True)), [3, 5])
+                self.assertEqual(Matcher.compile('aca', algorithm, ignore_case=True)
+                                 .search(self._bookText), 3)
+        self.assertEqual(Matcher.fold_case('Stra\u00dfe \u0130'), 'stra\u00dfe \u0130')
+        self.assertEqual(len(Matcher.fold_case('\u0130stanbul')), len('\u0130stanbul'))
+        # A final sigma folds as any other sigma, in the pattern or the text
+        self.assertEqual(Matcher.fold_case('ΟΔΟΣ Σ'), Matcher.fold_case('οδοσ σ'))
+        for algorithm in Matcher.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(list(Matcher.finditer('Σ', 'ΑΣ', algorithm, ignore_case=True)),
+                                 [1])
+                self.assertEqual(list(Matcher.finditer('ος', 'ΟΔΟΣ ΟΣΑ', algorithm,
+                                                       ignore_case=True)), [2, 5])
+        self.assertEqual(list(Matcher.compile_set(['Σ'], True).finditer('ΑΣ')), [(0, 1)])
+
+    def test_compile_set(self):
+        patterns = ['ACA', 'CA', 'ACATA', 'GG', 'TTT', 'CA']
+        found = Matcher.compile_set(patterns)
+        self.assertEqual(len(found), 6)
+        self.assertEqual(list(found.finditer(self._bookText)),
+                         [(0, 3), (1, 4), (5, 4), (0, 5), (1, 6), (5, 6), (2, 5),
+                          (1, 12), (5, 12), (3, 17), (1, 19), (5, 19)])
+        self.assertEqual(list(found.finditer(self._t8a1)),
+                         [(4, i) for i in range(6)])
+        self.assertEqual(list(found.finditer('')), [])
+        self.assertEqual(list(Matcher.compile_set([]).finditer(self._bookText)), [])
+
+    def test_compile_set_links(self):
+        # With one pattern, the links are KMP's mismatched links: state k
+        # here (k characters matched) is state k+1 there
+        for pattern in (self._ACATA, self._repeat2, self._repeatN, self._ACACAT):
+            found = Matcher.compile_set([pattern])
+            self.assertEqual([link + 1 for link in found._mismatched[1:]],
+                             Matcher.mismatched_links(pattern, True)[2:])
+
+    def test_compile_set_agrees(self):
+        rng = random.Random(21)
+        for trial in range(200):
+            patterns = [''.join(rng.choice('ab') for i in range(rng.randint(1, 4)))
+                        for j in range(rng.randint(1, 6))]
+            text = ''.join(rng.choice('aAbB') for i in range(rng.randint(0, 30)))
+            for ignore_case in (False, True):
+                folded = text.lower() if ignore_case else text
+                expected = sorted((pattern_id, offset)
+                                  for pattern_id, pattern in enumerate(patterns)
+                                  for offset in Matcher.finditer(pattern, folded))
+                found = Matcher.compile_set(patterns, ignore_case)
+                self.assertEqual(sorted(found.finditer(text)), expected)
+                self.assertEqual(sorted(Matcher.compile_set([p.encode() for p in patterns],
+                                                            ignore_case).finditer(text.encode())),
+                                 expected)
+
+    def write_file(self, data):
+        """Write DATA to a temporary file, and return its path."""
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as file:
+            file.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_search_file(self):
+        data = b'ACGACACATAGTCACTTGGCA\n' * 50 + b'acataACATA'
+        path = self.write_file(data)
+        for algorithm in Matcher.ALGORITHMS:
+            for chunk_size in (1, 3, 7, 64, None):   # Matches span chunks
+                with self.subTest(algorithm=algorithm, chunk_size=chunk_size):
+                    self.assertEqual(list(Matcher.search_file(path, 'ACATA', algorithm,
+                                                              chunk_size=chunk_size)),
+                                     list(Matcher.finditer(b'ACATA', data)))
+                    self.assertEqual(list(Matcher.search_file(path, b'acata', algorithm, True,
+                                                              chunk_size)),
+                                     list(Matcher.finditer(b'acata', data.lower())))
+                    self.assertEqual(list(Matcher.search_file(path, 'CAC', algorithm,
+                                                              chunk_size=chunk_size)),
+                                     list(Matcher.finditer(b'CAC', data)))
+
+    def test_search_file_edges(self):
+        empty = self.write_file(b'')
+        self.assertEqual(list(Matcher.search_file(empty, 'A')), [])
+        self.assertEqual(list(Matcher.search_file(empty, '')), [0])
+        path = self.write_file(b'AAA')
+        self.assertEqual(list(Matcher.search_file(path, 'AA', 'BM', chunk_size=1)), [0, 1])
+        self.assertEqual(list(Matcher.search_file(path, '\u00e9')), [])
+        with self.assertRaises(ValueError):
+            Matcher.search_file(path, 'A', chunk_size=0)
+        with self.assertRaises(TypeError):
+            Matcher.compile('A').search_file(path)
+
+    def test_search_file_memory(self):
+        # Memory use depends on the chunk size, not the file size
+        path = self.write_file(b'0123456789abcdef' * (1 << 17) + b'needle')   # 2 MiB
+        tracemalloc.start()
+        found = list(Matcher.search_file(path, 'needle', 'Horspool', chunk_size=1 << 16))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertEqual(found, [1 << 21])
+        self.assertLess(peak, 1 << 18)
+
+    def test_parallel(self):
+        rng = random.Random(23)
+        text = ''.join(rng.choice('AC') for i in range(3000))
+        for pattern in ('A', 'ACA', 'CCCCC', 'ACACACAC', ''):
+            expected = list(Matcher.finditer(pattern, text))
+            for algorithm in ('KMP', 'Horspool'):
+                with self.subTest(pattern=pattern, algorithm=algorithm):
+                    self.assertEqual(Matcher.parallel_finditer(pattern, text, algorithm,
+                                                               processes=2, segment_size=97),
+                                     expected)
+        self.assertEqual(Matcher.parallel_finditer('aca', text, ignore_case=True,
+                                                   processes=2, segment_size=500),
+                         list(Matcher.finditer('ACA', text)))
+        self.assertEqual(Matcher.parallel_finditer('ACA', text, processes=1),
+                         list(Matcher.finditer('ACA', text)))
+        with self.assertRaises(ValueError):
+            Matcher.parallel_finditer('ACA', text, processes=0)
+
+    def test_parallel_search_file(self):
+        rng = random.Random(23)
+        data = bytes(rng.choice(b'AC') for i in range(3000))
+        path = self.write_file(data)
+        for pattern in (b'ACA', b'CCCCC', b'ACACACAC'):
+            expected = list(Matcher.finditer(pattern, data))
+            for algorithm in ('KMP', 'BM'):
+                with self.subTest(pattern=pattern, algorithm=algorithm):
+                    self.assertEqual(Matcher.parallel_search_file(path, pattern, algorithm,
+                                                                  processes=2, segment_size=101,
+                                                                  chunk_size=13),
+                                     expected)
+        self.assertEqual(Matcher.parallel_search_file(path, '', processes=2, segment_size=100),
+                         list(range(3001)))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import random
+import unittest
+from PughSkiplist import PughSkiplist
+
+class TestPughSkiplist(unittest.TestCase):
+
+    def setUp(self):
+        # Make "random" results predictable
+        self._empty = PughSkiplist(seed=144000)
+
+        self._1node = PughSkiplist(seed=144000)
+        self._1node[37] = 'thirty-seven'
+
+        self._3nodes = PughSkiplist(seed=144000)
+        self._3nodes[37] = 'thirty-seven'
+        self._3nodes[50] = 'fifty' # Insert at end
+        self._3nodes[6] = 'six' # Insert at beginning
+
+    def testEmpty(self):
+        self.assertEqual(self._empty._levels, 0)
+        self.assertEqual(len(self._empty), 0)
+        self.assertEqual(list(self._empty), [])
+        with self.assertRaises(KeyError):
+            self._empty[37]
+        with self.assertRaises(KeyError):
+            del self._empty[37]
+
+    def testStructure(self):
+        # Every level is a sorted list, and each level's keys are a
+        # subset of the keys on the level below
+        head = self._3nodes._head
+        below = None
+        for level in range(self._3nodes._levels):
+            keys = []
+            node = head[level]
+            while node is not None:
+                self.assertTrue(len(node) > level)
+                keys.append(node.key)
+                node = node[level]
+            self.assertEqual(keys, sorted(keys))
+            if below is not None:
+                self.assertTrue(set(keys) <= set(below))
+            below = keys
+        self.assertEqual(list(self._3nodes), [6, 37, 50])
+
+    def testSearch(self):
+        self.assertEqual(self._1node[37], 'thirty-seven')
+        self.assertEqual(self._3nodes[6], 'six')
+        self.assertEqual(self._3nodes.search(50), 'fifty')
+        with self.assertRaises(KeyError):
+            self._3nodes[16]
+        self.assertTrue(37 in self._3nodes)
+        self.assertFalse(38 in self._3nodes)
+
+    def testUpsertAndNone(self):
+        self._3nodes[37] = None
+        self.assertIsNone(self._3nodes[37])
+        self.assertEqual(len(self._3nodes), 3)
+
+    def testDelete(self):
+        self._1node.delete(37)
+        self.assertEqual(self._1node._levels, 0)
+        self.assertEqual(len(self._1node), 0)
+        del self._3nodes[37]
+        self.assertEqual(list(self._3nodes.items()), [(6, 'six'), (50, 'fifty')])
+        with self.assertRaises(KeyError):
+            del self._3nodes[37]
+
+    def testMaxLevel(self):
+        skiplist = PughSkiplist(max_level=3, p_inv=4)
+        for i in range(1000):
+            skiplist[i] = i
+        self.assertLessEqual(skiplist._levels, 3)
+        self.assertEqual(list(skiplist), list(range(1000)))
+        with self.assertRaises(ValueError):
+            PughSkiplist(max_level=0)
+        # Positional arguments mean the same as for Skiplist
+        self.assertEqual(PughSkiplist(7, 3)._max_level, 3)
+
+    def testMatchesDict(self):
+        rng = random.Random(11)
+        skiplist = PughSkiplist()
+        reference = {}
+        for step in range(3000):
+            key = rng.randrange(300)
+            if key in reference and rng.randrange(2) == 0:
+                del skiplist[key]
+                del reference[key]
+            else:
+                skiplist[key] = step
+                reference[key] = step
+        self.assertEqual(len(skiplist), len(reference))
+        self.assertEqual(list(skiplist.items()), sorted(reference.items()))
+
+    def testSeed(self):
+        def levels(seed, p_inv):
+            skiplist = PughSkiplist(p_inv=p_inv, seed=seed)
+            for i in range(500):
+                skiplist[i] = i
+            counts = []
+            node = skiplist._head[0]
+            while node is not None:
+                counts.append(len(node))
+                node = node[0]
+            return counts
+        for p_inv in (2, 3, 4):
+            with self.subTest(p_inv=p_inv):
+                self.assertEqual(levels(5, p_inv), levels(5, p_inv))
+                self.assertNotEqual(levels(5, p_inv), levels(6, p_inv))
+                # About 1/P_INV of the nodes reach each next level
+                counts = levels(5, p_inv)
+                above = sum(1 for n in counts if n > 1)
+                self.assertAlmostEqual(above / len(counts), 1 / p_inv, delta=0.07)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,24 @@
+import bisect
 import random
 import unittest
 from Skiplist import Skiplist
 
 class TestSkiplist(unittest.TestCase):
 
+    SEED = 4 # Towers of height 1, 2, 1 for the first three inserts
+
     def setUp(self):
-        random.seed(144000) # Make "random" results predictable
-        self._empty = Skiplist()
+        # Make "random" results predictable
+        self._empty = Skiplist(self.SEED)
 
-        self._1node = Skiplist()
+        self._1node = Skiplist(self.SEED)
         self._1node[37] = 'thirty-seven'
 
-        self._2nodes = Skiplist()
+        self._2nodes = Skiplist(self.SEED)
         self._2nodes[37] = 'thirty-seven'
         self._2nodes[50] = 'fifty'
 
-        self._3nodes = Skiplist()
+        self._3nodes = Skiplist(self.SEED)
         self._3nodes[37] = 'thirty-seven'
         self._3nodes[50] = 'fifty' # Insert at end
         self._3nodes[6] = 'six' # Insert at beginning
@@ -94,6 +97,10 @@ class TestSkiplist(unittest.TestCase):
                     self.assertTrue(head.down is None)
                 head = head.down
 
+    def testSlots(self):
+        self.assertFalse(hasattr(self._3nodes._head, '__dict__'))
+        self.assertFalse(hasattr(self._3nodes._head.next, '__dict__'))
+
     def testSearch37(self):
         with self.assertRaises(KeyError):
             self._empty.search(37)
@@ -227,5 +234,241 @@ class TestSkiplist(unittest.TestCase):
         self.assertEqual(len(self._2nodes), 2)
         self.assertEqual(len(self._3nodes), 3)
 
+    def testUpsert(self):
+        self._3nodes[37] = 'XXXVII'
+        self.assertEqual(self._3nodes[37], 'XXXVII')
+        self._3nodes[50] = 'L'   # Key with a 2-level tower
+        self.assertEqual(self._3nodes._head.next.data, 'L')
+        self.assertEqual(self._3nodes._head.down.next.next.next.data, 'L')
+        self.assertEqual(len(self._3nodes), 3)
+        self.assertEqual(list(self._3nodes), [6, 37, 50])
+
+    def testNoneValue(self):
+        self._3nodes[20] = None
+        self.assertIsNone(self._3nodes[20])
+        self.assertTrue(20 in self._3nodes)
+        self.assertEqual(self._3nodes.get(20, 'missing'), None)
+        self.assertEqual(self._3nodes.get(21, 'missing'), 'missing')
+
+    def testDelitem(self):
+        del self._3nodes[37]
+        self.assertFalse(37 in self._3nodes)
+        self.assertEqual(len(self._3nodes), 2)
+        with self.assertRaises(KeyError):
+            del self._3nodes[37]
+        self.assertEqual(self._3nodes.pop(50), 'fifty')
+        self.assertEqual(list(self._3nodes.items()), [(6, 'six')])
+
+    def testMatchesDict(self):
+        rng = random.Random(10)
+        skiplist = Skiplist(seed=10)
+        reference = {}
+        for step in range(3000):
+            key = rng.randrange(300)
+            if key in reference and rng.randrange(2) == 0:
+                del skiplist[key]
+                del reference[key]
+            else:
+                skiplist[key] = step
+                reference[key] = step
+        self.assertEqual(len(skiplist), len(reference))
+        self.assertEqual(list(skiplist.items()), sorted(reference.items()))
+        self.checkStructure(skiplist)
+        for key in list(reference):
+            del skiplist[key]
+        self.assertEqual(len(skiplist), 0)
+        self.assertIsNone(skiplist._head)
+
+    def checkStructure(self, skiplist):
+        """Every level is sorted, every down link joins two copies of the
+        same key, the bottom level has every key, and every link's width
+        is the distance between its ends on the bottom level."""
+        position = {key: i for i, key in enumerate(skiplist)}
+        head = skiplist._head
+        while head is not None:
+            node = head.next
+            previous = None
+            start = -1
+            width = head.width
+            while node is not None:
+                if previous is not None:
+                    self.assertLess(previous, node.key)
+                if node.down is not None:
+                    self.assertEqual(node.down.key, node.key)
+                self.assertEqual(position[node.key] - start, width)
+                previous = node.key
+                start = position[node.key]
+                width = node.width
+                node = node.next
+            self.assertEqual(len(skiplist) - start, width)
+            if head.down is None:
+                self.assertEqual(len(list(skiplist)), len(skiplist))
+            head = head.down
+
+    def testUpdateSorted(self):
+        skiplist = Skiplist(self.SEED)
+        skiplist.update_sorted((i, str(i)) for i in range(0, 1000, 2))
+        self.checkStructure(skiplist)
+        self.assertEqual(len(skiplist), 500)
+        # Interleave a second sorted run, with some keys already present
+        skiplist.update_sorted((i, 'new') for i in range(500, 1500, 3))
+        self.checkStructure(skiplist)
+        expected = {i: str(i) for i in range(0, 1000, 2)}
+        expected.update((i, 'new') for i in range(500, 1500, 3))
+        self.assertEqual(list(skiplist.items()), sorted(expected.items()))
+
+    def testUpdateSortedUnsorted(self):
+        # Out-of-order input still works
+        self._3nodes.update_sorted([(40, 'forty'), (1, 'one'), (60, 'sixty'), (37, 'XXXVII'), (2, 'two')])
+        self.checkStructure(self._3nodes)
+        self.assertEqual(list(self._3nodes), [1, 2, 6, 37, 40, 50, 60])
+        self.assertEqual(self._3nodes[37], 'XXXVII')
+
+    def testExtend(self):
+        self._empty.extend({5: 'five', 3: 'three'})
+        self._empty.extend([(4, 'four'), (3, 'THREE'), (3, 'Three')])
+        self.checkStructure(self._empty)
+        self.assertEqual(list(self._empty.items()), [(3, 'Three'), (4, 'four'), (5, 'five')])
+
+    def testFromSorted(self):
+        skiplist = Skiplist.from_sorted((i, i * i) for i in range(2000))
+        self.checkStructure(skiplist)
+        self.assertEqual(len(skiplist), 2000)
+        self.assertEqual(skiplist[1234], 1234 * 1234)
+        self.assertEqual(list(skiplist), list(range(2000)))
+
+    def testItemsRange(self):
+        skiplist = Skiplist.from_sorted((i, str(i)) for i in range(0, 100, 5))
+        self.assertEqual(list(skiplist.items(10, 30)), [(10, '10'), (15, '15'), (20, '20'), (25, '25')])
+        self.assertEqual(list(skiplist.items(11, 29)), [(15, '15'), (20, '20'), (25, '25')])
+        self.assertEqual(list(skiplist.items(hi=10)), [(0, '0'), (5, '5')])
+        self.assertEqual(list(skiplist.items(lo=90)), [(90, '90'), (95, '95')])
+        self.assertEqual(list(skiplist.items(41, 44)), [])
+        self.assertEqual(len(skiplist.items()), 20)   # Still a view
+        self.assertEqual(list(self._empty.items(1, 2)), [])
+
+    def testKeysFrom(self):
+        self.assertEqual(list(self._3nodes.keys_from(7)), [37, 50])
+        self.assertEqual(list(self._3nodes.keys_from(6)), [6, 37, 50])
+        self.assertEqual(list(self._3nodes.keys_from(51)), [])
+        self.assertEqual(list(self._empty.keys_from(0)), [])
+        keys = self._3nodes.keys_from(0)
+        self.assertEqual(next(keys), 6)
+
+    def testFloorCeiling(self):
+        self.assertEqual(self._3nodes.floor(37), 37)
+        self.assertEqual(self._3nodes.floor(49), 37)
+        self.assertEqual(self._3nodes.floor(100), 50)
+        self.assertEqual(self._3nodes.floor(5), None)
+        self.assertEqual(self._3nodes.ceiling(37), 37)
+        self.assertEqual(self._3nodes.ceiling(38), 50)
+        self.assertEqual(self._3nodes.ceiling(0), 6)
+        self.assertEqual(self._3nodes.ceiling(51), None)
+        self.assertEqual(self._empty.floor(1), None)
+        self.assertEqual(self._empty.ceiling(1), None)
+
+    def testPopMin(self):
+        self.assertEqual(self._3nodes.pop_min(), (6, 'six'))
+        self.assertEqual(self._3nodes.pop_min(), (37, 'thirty-seven'))
+        self.assertEqual(len(self._3nodes), 1)
+        self.assertEqual(self._3nodes.pop_min(), (50, 'fifty'))  # Two-level tower
+        self.assertIsNone(self._3nodes._head)
+        with self.assertRaises(KeyError):
+            self._3nodes.pop_min()
+        skiplist = Skiplist.from_sorted((i, i) for i in range(200))
+        self.assertEqual([skiplist.pop_min()[0] for i in range(100)], list(range(100)))
+        self.checkStructure(skiplist)
+
+    def testAt(self):
+        self.assertEqual([self._3nodes.at(i) for i in range(3)], [6, 37, 50])
+        self.assertEqual(self._3nodes.at(-1), 50)
+        self.assertEqual(self._3nodes.at(-3), 6)
+        for i in (3, -4):
+            with self.assertRaises(IndexError):
+                self._3nodes.at(i)
+        with self.assertRaises(IndexError):
+            self._empty.at(0)
+        skiplist = Skiplist.from_sorted((i, str(i)) for i in range(0, 1000, 2))
+        self.assertEqual([skiplist.at(i) for i in range(500)], list(range(0, 1000, 2)))
+
+    def testIndexOf(self):
+        self.assertEqual([self._3nodes.index_of(key) for key in (6, 37, 50)], [0, 1, 2])
+        for key in (5, 38, 51):
+            with self.assertRaises(ValueError):
+                self._3nodes.index_of(key)
+        with self.assertRaises(ValueError):
+            self._empty.index_of(6)
+
+    def testDeleteAt(self):
+        self.assertEqual(self._3nodes.delete_at(1), (37, 'thirty-seven'))
+        self.assertEqual(self._3nodes.delete_at(-1), (50, 'fifty'))
+        self.assertEqual(list(self._3nodes), [6])
+        self.checkStructure(self._3nodes)
+        with self.assertRaises(IndexError):
+            self._3nodes.delete_at(1)
+
+    def testPositionsMatchList(self):
+        rng = random.Random(12)
+        skiplist = Skiplist(seed=12)
+        reference = []
+        for step in range(2000):
+            key = rng.randrange(400)
+            if reference and rng.randrange(3) == 0:
+                i = rng.randrange(len(reference))
+                self.assertEqual(skiplist.delete_at(i)[0], reference.pop(i))
+            elif key not in skiplist:
+                skiplist[key] = step
+                reference.insert(bisect.bisect(reference, key), key)
+        self.checkStructure(skiplist)
+        self.assertEqual([skiplist.at(i) for i in range(len(reference))], reference)
+        self.assertEqual([skiplist.index_of(key) for key in reference],
+                         list(range(len(reference))))
+
+    def testSeed(self):
+        # The same seed and operations give the same structure
+        def shape(skiplist):
+            levels = []
+            head = skiplist._head
+            while head is not None:
+                level = []
+                node = head.next
+                while node is not None:
+                    level.append(node.key)
+                    node = node.next
+                levels.append(level)
+                head = head.down
+            return levels
+        first = Skiplist.from_sorted(((i, i) for i in range(300)), seed=7)
+        second = Skiplist(seed=7)
+        for i in range(300):
+            second[i] = i
+        self.assertEqual(shape(first), shape(second))
+        third = Skiplist.from_sorted(((i, i) for i in range(300)), seed=8)
+        self.assertNotEqual(shape(first), shape(third))
+
+    def testMaxLevel(self):
+        skiplist = Skiplist(seed=1, max_level=3)
+        for i in range(1000):
+            skiplist[i] = i
+        levels = 0
+        head = skiplist._head
+        while head is not None:
+            levels += 1
+            head = head.down
+        self.assertEqual(levels, 3)
+        self.checkStructure(skiplist)
+        self.assertEqual([Skiplist(max_level=1)._random_height() for i in range(10)], [0] * 10)
+        with self.assertRaises(ValueError):
+            Skiplist(max_level=0)
+
+    def testHeightDistribution(self):
+        skiplist = Skiplist(seed=3)
+        heights = [skiplist._random_height() for i in range(20000)]
+        # About half the towers reach each next level
+        for height in range(4):
+            reaching = sum(1 for h in heights if h >= height)
+            above = sum(1 for h in heights if h > height)
+            self.assertAlmostEqual(above / reaching, 0.5, delta=0.05)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+import os
+import random
+import tempfile
+import unittest
+from Matcher import Matcher
+from TextIndex import TextIndex
+
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._bookText = 'ACGACACATAGTCACTTGGCA'
+        self._banana = TextIndex('banana')
+        self._indexes = [TextIndex(self._bookText), TextIndex(self._bookText, fm_index=True)]
+
+    def test_suffix_array(self):
+        # Row 0 is the empty suffix, at position 6
+        self.assertEqual(list(TextIndex.suffix_array('banana')), [6, 5, 3, 1, 0, 4, 2])
+        self.assertEqual(list(TextIndex.suffix_array(b'banana')), [6, 5, 3, 1, 0, 4, 2])
+        self.assertEqual(list(TextIndex.suffix_array('aaaa')), [4, 3, 2, 1, 0])
+        self.assertEqual(list(TextIndex.suffix_array('')), [0])
+        rng = random.Random(25)
+        for trial in range(50):
+            text = ''.join(rng.choice('ab') for i in range(rng.randint(0, 50)))
+            self.assertEqual(list(TextIndex.suffix_array(text)),
+                             sorted(range(len(text) + 1), key=lambda i: text[i:]))
+
+    def test_lcp_array(self):
+        sa = TextIndex.suffix_array('banana')
+        self.assertEqual(list(TextIndex.lcp_array('banana', sa)), [0, 0, 1, 3, 0, 0, 2])
+        rng = random.Random(26)
+        for trial in range(50):
+            text = ''.join(rng.choice('ab') for i in range(rng.randint(0, 50)))
+            sa = TextIndex.suffix_array(text)
+            expected = [0] + [Matcher.match_length(text + '$', sa[i - 1], sa[i])
+                              for i in range(1, len(sa))]
+            self.assertEqual(list(TextIndex.lcp_array(text, sa)), expected)
+
+    def test_find(self):
+        for index in self._indexes:
+            with self.subTest(index=index):
+                self.assertEqual(index.find('ACATA'), 5)
+                self.assertEqual(index.find('CA'), 4)
+                self.assertEqual(index.find('ACACAT'), 3)
+                self.assertEqual(index.find('ACAG'), -1)
+                self.assertEqual(index.find('N'), -1)
+                self.assertEqual(index.find(''), 0)
+                self.assertEqual(index.find(self._bookText + 'A'), -1)
+                self.assertEqual(index.count('ACA'), 2)
+                self.assertEqual(index.find_all('ACA'), [3, 5])   # Overlapping
+                self.assertEqual(index.find_all('A'),
+                                 [i for i, c in enumerate(self._bookText) if c == 'A'])
+                self.assertEqual(index.count(''), len(self._bookText) + 1)
+                self.assertEqual(index.count('TTT'), 0)
+        self.assertEqual(self._banana.find_all('ana'), [1, 3])
+        self.assertEqual(len(self._banana), 6)
+
+    def test_agrees(self):
+        # Every query agrees with Matcher.finditer(), on str and bytes
+        rng = random.Random(27)
+        for trial in range(100):
+            text = ''.join(rng.choice('abc') for i in range(rng.randint(0, 60)))
+            if trial % 2:
+                text = text.encode()
+            for fm_index in (False, True):
+                index = TextIndex(text, fm_index)
+                for query in range(10):
+                    pattern = ''.join(rng.choice('abcd') for i in range(rng.randint(1, 4)))
+                    if trial % 2:
+                        pattern = pattern.encode()
+                    expected = list(Matcher.finditer(pattern, text))
+                    self.assertEqual(index.find_all(pattern), expected, (text, pattern))
+                    self.assertEqual(index.count(pattern), len(expected))
+                    self.assertEqual(index.find(pattern), text.find(pattern))
+
+    def test_find_first(self):
+        # Runs of rows longer than TextIndex.STEP go through the sparse table
+        rng = random.Random(28)
+        text = ''.join(rng.choice('ab') for i in range(3000))
+        for fm_index in (False, True):
+            index = TextIndex(text, fm_index)
+            for length in range(7):
+                for trial in range(20):
+                    pattern = ''.join(rng.choice('ab') for i in range(length))
+                    self.assertEqual(index.find(pattern), text.find(pattern), pattern)
+            for lo in range(0, len(text) + 1, 37):
+                for hi in range(lo + 1, len(text) + 2, 113):
+                    self.assertEqual(index._first(lo, hi), min(index._sa[lo:hi]))
+
+    def test_fm_index(self):
+        # The rank counts and starting rows agree with counting directly
+        rng = random.Random(29)
+        for text in ('', 'a', self._bookText,
+                     ''.join(chr(rng.randrange(0x370, 0x3d0)) for i in range(500)),
+                     bytes(rng.randrange(256) for i in range(300))):
+            with self.subTest(text=text[:10]):
+                index = TextIndex(text, fm_index=True)
+                bwt, start, counts, primary = index._fm
+                row = 1
+                for c in sorted(set(text)):
+                    self.assertEqual(start[c], row)
+                    row += text.count(c)
+                    for block in range(len(counts[c])):
+                        self.assertEqual(counts[c][block],
+                                         bwt.count(c, 0, block * TextIndex.STEP))
+                self.assertEqual(len(start), len(set(text)))
+
+    def test_types(self):
+        with self.assertRaises(TypeError):
+            self._banana.find(b'an')
+        with self.assertRaises(TypeError):
+            TextIndex(b'banana', fm_index=True).count('an')
+
+    def test_save_load(self):
+        text = 'un été à Paris, ' * 20
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            for original in (TextIndex(text), TextIndex(text.encode(), fm_index=True)):
+                with self.subTest(original=original):
+                    original.save(path)
+                    loaded = TextIndex.load(path)
+                    self.assertEqual(loaded.text, original.text)
+                    self.assertEqual(repr(loaded), repr(original))
+                    self.assertEqual(loaded._sa, original._sa)
+                    self.assertEqual(loaded._lcp, original._lcp)
+                    self.assertEqual(loaded._minima, original._minima)
+                    pattern = 'été'
+                    if isinstance(original.text, bytes):
+                        pattern = pattern.encode()
+                    self.assertEqual(loaded.find_all(pattern), original.find_all(pattern))
+                    self.assertEqual(loaded.count(original.text[:4]), 20)
+            with open(path, 'wb') as file:
+                file.write(b'not an index')
+            with self.assertRaises(ValueError):
+                TextIndex.load(path)
+            TextIndex(text).save(path)
+            with open(path, 'r+b') as file:
+                file.truncate(os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                TextIndex.load(path)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
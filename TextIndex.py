@@ -0,0 +1,361 @@
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import repeat
+from typing import Any, BinaryIO, Dict, Generic, List, Optional, Tuple, Union
+
+from Matcher import AnyText, Matcher, Text
+
+class TextIndex(Generic[AnyText]):
+    """An index of a fixed text, built once, that finds any pattern in
+    it without reading the whole text again.  Each of Matcher's
+    algorithms takes O(n) time per search in the length n of the text;
+    this answers find(), count() and find_all() in O(m log n) time in
+    the length m of the pattern (plus the number of matches, for
+    find_all()), or find() and count() in O(m) with the FM-index.
+
+    The index is the text's suffix array: the starting positions of all
+    its suffixes, in sorted order, so that the suffixes that start with
+    a pattern are next to each other, and binary search finds them.
+    The empty suffix, at position n, is included, and sorts first.
+    Beside it is the LCP array: lcp[i] is the length of the longest
+    common prefix of the suffixes at rows i-1 and i of the suffix
+    array.  The matches of a pattern of length m are a run of rows with
+    lcp >= m, so once the first is found, the rest follow.  For find(),
+    a sparse table of the smallest position in each block of STEP rows,
+    and in each run of 2**j blocks, gives the first match in a run of
+    any length in O(STEP) time.
+
+    With FM_INDEX, the index also keeps the Burrows-Wheeler transform
+    of the text (the character before each suffix, in suffix array
+    order) and rank counts for it, which find the run of rows for a
+    pattern a character at a time, from its end, without comparing any
+    strings.
+
+    The text may be str or bytes; patterns must be of the same type.
+    Building the suffix array takes O(n log n) time for typical text,
+    and O(n log**2 n) at worst, so build the index once and save() it
+    for reuse."""
+
+    STEP: int = 64      # Rows per block of rank counts and of minima
+    MAGIC: bytes = b'TXTINDEX'
+    # Whether the text is str, the arrays' typecode, whether there is an
+    # FM-index, and the length of the (UTF-8 encoded) text in bytes
+    _HEADER = struct.Struct('<?c?Q')
+
+    def __init__(self, text: AnyText, fm_index: bool = False) -> None:
+        """Build the index of TEXT, with an FM-index if FM_INDEX."""
+        self.text: AnyText = text
+        self._sa: array = TextIndex.suffix_array(text)
+        self._lcp: array = TextIndex.lcp_array(text, self._sa)
+        self._minima: List[array] = TextIndex._make_minima(self._sa)
+        self._fm: Optional[Tuple[AnyText, Dict, Dict, int]] = None
+        if fm_index:
+            self._fm = self._make_fm_index()
+
+    def __len__(self) -> int:
+        """Return the length of the indexed text."""
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        return 'TextIndex(<{0} of length {1}>, fm_index={2})'.format(
+            type(self.text).__name__, len(self.text), self._fm is not None)
+
+    # Construction
+
+    @staticmethod
+    def suffix_array(text: Text) -> array:
+        """Return the suffix array of TEXT, including the empty suffix,
+        as an array of len(TEXT) + 1 positions.  This sorts by prefix
+        doubling: once the suffixes are sorted by their first k
+        characters, as a rank for each, sorting them by the pairs of
+        ranks of suffix i and suffix i + k sorts them by their first 2k.
+        It stops as soon as the ranks are all different, after about
+        log2 of the longest repeated substring's length rounds."""
+        n: int = len(text)
+        typecode: str = 'i' if n < 2**31 - 1 else 'q'
+        keys: List[int] = list(text) if isinstance(text, bytes) else [ord(c) for c in text]
+        keys.append(-1)     # The empty suffix comes first
+        sa: List[int] = sorted(range(n + 1), key=keys.__getitem__)
+        rank, classes = TextIndex._ranks(sa, keys)
+        k: int = 1
+        while classes < n + 1:
+            # A suffix shorter than k already has a rank of its own, so
+            # the 0 past the end never decides anything
+            keys = [first * (n + 1) + second
+                    for first, second in zip(rank, rank[k:] + [0] * k)]
+            sa.sort(key=keys.__getitem__)
+            rank, classes = TextIndex._ranks(sa, keys)
+            k = 2 * k
+        return array(typecode, sa)
+
+    @staticmethod
+    def _ranks(sa: List[int], keys: List[int]) -> Tuple[List[int], int]:
+        """Given SA sorted by KEYS, number the distinct keys in order.
+        Return the number for each position, and how many there are."""
+        rank: List[int] = [0] * len(sa)
+        number: int = -1
+        previous: Optional[int] = None
+        for i in sa:
+            if keys[i] != previous:
+                number += 1
+                previous = keys[i]
+            rank[i] = number
+        return rank, number + 1
+
+    @staticmethod
+    def lcp_array(text: Text, sa: array) -> array:
+        """Return the LCP array for TEXT and its suffix array SA, in O(n)
+        time, by Kasai et al.'s algorithm: going through the suffixes in
+        text order, each one's common prefix with its predecessor in SA
+        is at most one shorter than the last one's, so matching can
+        start from there, using Matcher.match_length()."""
+        n: int = len(text)
+        rank: List[int] = [0] * (n + 1)
+        for row, position in enumerate(sa):
+            rank[position] = row
+        lcp: array = array(sa.typecode, [0]) * (n + 1)
+        h: int = 0
+        for position in range(n):
+            row = rank[position]
+            previous = sa[row - 1]  # row > 0: only the empty suffix is at row 0
+            if h == 0:
+                h = Matcher.match_length(text, position, previous)
+            else:
+                h += Matcher.match_length(text, position + h, previous + h)
+            lcp[row] = h
+            if h > 0:
+                h -= 1
+        return lcp
+
+    @staticmethod
+    def _make_minima(sa: array) -> List[array]:
+        """Build the sparse table for find(): level 0 holds the smallest
+        position in each block of STEP rows of SA, and level j + 1 the
+        smaller of level j's entries i and i + 2**j, so level j holds
+        the smallest in each run of 2**j blocks.  That takes O(n/STEP *
+        log n) time and space."""
+        step: int = TextIndex.STEP
+        level: array = array(sa.typecode, (min(sa[i:i + step])
+                                           for i in range(0, len(sa), step)))
+        minima: List[array] = [level]
+        width: int = 1
+        while width < len(level):
+            level = array(sa.typecode, map(min, level, level[width:]))
+            minima.append(level)
+            width = 2 * width
+        return minima
+
+    def _make_fm_index(self) -> Tuple[AnyText, Dict, Dict, int]:
+        """Build the FM-index: the BWT, the row where each character's
+        rows start, the rank counts, and the row of the whole text.
+        This counts the BWT's characters in one pass, a block of STEP at
+        a time, so it takes O(n) time, plus O(sigma * n/STEP) time and
+        space for the rank counts of the sigma distinct characters."""
+        text: AnyText = self.text
+        # The whole text, at row primary, is preceded by the end of the
+        # text, which isn't a character; put text[:1] in its place, and
+        # take it off again in _occ()
+        primary: int = self._sa.index(0)
+        bwt: AnyText = text[:0].join(text[p - 1:p] if p > 0 else text[:1]
+                                     for p in self._sa)
+        step: int = TextIndex.STEP
+        counts: Dict = {}   # counts[c][b] is the number of c's in bwt[:b*step]
+        total: Counter = Counter()
+        for block, i in enumerate(range(0, len(bwt), step)):
+            for c, k in Counter(bwt[i:i + step]).items():
+                if c not in counts:
+                    counts[c] = array(self._sa.typecode, [0])
+                # The count stays the same through blocks without a c
+                counts[c].extend(repeat(total[c], block + 1 - len(counts[c])))
+                total[c] += k
+        blocks: int = -(-len(bwt) // step)
+        for c in counts:
+            counts[c].extend(repeat(total[c], blocks + 1 - len(counts[c])))
+        if text:
+            total[text[0]] -= 1     # The stand-in for the end of the text
+        start: Dict = {}
+        row: int = 1        # After the empty suffix
+        for c in sorted(total):
+            start[c] = row
+            row += total[c]
+        return bwt, start, counts, primary
+
+    # Queries
+
+    def _check(self, pattern: AnyText) -> None:
+        if isinstance(pattern, bytes) != isinstance(self.text, bytes):
+            raise TypeError('Pattern and text must both be str or both be bytes')
+
+    def _lower_bound(self, pattern: AnyText) -> int:
+        """Return the first row whose suffix starts with PATTERN or
+        comes after it.  Comparing only the suffixes' first m characters
+        keeps them in order, and the comparison runs in C."""
+        text, sa, m = self.text, self._sa, len(pattern)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid]:sa[mid] + m] < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _upper_bound(self, pattern: AnyText, lo: int) -> int:
+        """Return the first row from LO on whose suffix comes after all
+        the suffixes that start with PATTERN."""
+        text, sa, m = self.text, self._sa, len(pattern)
+        hi = len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid]:sa[mid] + m] <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _occ(self, c, row: int) -> int:
+        """Return the number of C's in the FM-index's BWT[:ROW]."""
+        bwt, start, counts, primary = self._fm    # type: ignore
+        block = row // TextIndex.STEP
+        count = counts[c][block] + bwt.count(c, block * TextIndex.STEP, row)
+        if primary < row and bwt[primary] == c:
+            count -= 1      # The stand-in for the end of the text
+        return count
+
+    def _backward_search(self, pattern: AnyText) -> Tuple[int, int]:
+        """Return the rows [lo, hi) of the suffixes that start with
+        PATTERN, using the FM-index: if [lo, hi) are the rows for some
+        string s, then the rows for c + s start at start[c] plus the
+        number of c's in the BWT before lo, and end at start[c] plus the
+        number before hi."""
+        bwt, start, counts, primary = self._fm    # type: ignore
+        lo, hi = 0, len(self._sa)
+        for c in reversed(pattern):
+            if c not in start:
+                return 0, 0
+            lo = start[c] + self._occ(c, lo)
+            hi = start[c] + self._occ(c, hi)
+            if lo >= hi:
+                return 0, 0
+        return lo, hi
+
+    def _rows(self, pattern: AnyText) -> Tuple[int, int]:
+        """Return the rows [lo, hi) of the suffixes that start with
+        PATTERN, by two binary searches, or with the FM-index."""
+        self._check(pattern)
+        if self._fm is not None:
+            return self._backward_search(pattern)
+        lo = self._lower_bound(pattern)
+        return lo, self._upper_bound(pattern, lo)
+
+    def _run(self, pattern: AnyText) -> Tuple[int, int]:
+        """Return the same rows as _rows(), for find_all(), which reads
+        them all anyway: after the first row, the LCP array gives the
+        rest of the run, without comparing strings again."""
+        self._check(pattern)
+        if self._fm is not None:
+            return self._backward_search(pattern)
+        m, sa, lcp = len(pattern), self._sa, self._lcp
+        lo = hi = self._lower_bound(pattern)
+        if lo < len(sa) and self.text.startswith(pattern, sa[lo]):
+            hi = lo + 1
+            while hi < len(lcp) and lcp[hi] >= m:
+                hi += 1
+        return lo, hi
+
+    def _first(self, lo: int, hi: int) -> int:
+        """Return the smallest position in rows [LO, HI) of the suffix
+        array, LO < HI: the whole blocks in between from two entries of
+        the sparse table, and the rows at either end directly."""
+        sa, step = self._sa, TextIndex.STEP
+        first, last = -(-lo // step), hi // step    # The whole blocks
+        if first >= last:
+            return min(sa[lo:hi])
+        j = (last - first).bit_length() - 1
+        level = self._minima[j]
+        return min(level[first], level[last - (1 << j)],
+                   *sa[lo:first * step], *sa[last * step:hi])
+
+    def count(self, pattern: AnyText) -> int:
+        """Return the number of occurrences of PATTERN in the text,
+        including ones that overlap, in O(m log n) time, or O(m) with
+        the FM-index."""
+        lo, hi = self._rows(pattern)
+        return hi - lo
+
+    def find_all(self, pattern: AnyText) -> List[int]:
+        """Return the starting index of every occurrence of PATTERN in
+        the text, in order, as Matcher.finditer() would find them."""
+        lo, hi = self._run(pattern)
+        return sorted(self._sa[lo:hi])
+
+    def find(self, pattern: AnyText) -> int:
+        """Find the first occurrence of PATTERN in the text, and return
+        the starting index.  If PATTERN does not occur, return -1.  This
+        takes O(m log n + STEP) time, or O(m + STEP) with the FM-index,
+        however many times PATTERN occurs."""
+        lo, hi = self._rows(pattern)
+        return self._first(lo, hi) if lo < hi else -1
+
+    # Persistence
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Write the index, text included, to the file at PATH.  The
+        FM-index isn't written, only whether there is one, nor find()'s
+        sparse table; load() builds them again from the suffix array, in
+        O(n + sigma * n/STEP) time for sigma distinct characters."""
+        encoded: bytes = self.text if isinstance(self.text, bytes) else self.text.encode()
+        with open(path, 'wb') as file:
+            file.write(TextIndex.MAGIC)
+            file.write(TextIndex._HEADER.pack(isinstance(self.text, str),
+                                              self._sa.typecode.encode(),
+                                              self._fm is not None, len(encoded)))
+            file.write(encoded)
+            for column in (self._sa, self._lcp):
+                TextIndex._write_array(file, column)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> 'TextIndex[Any]':
+        """Read an index written by save() from the file at PATH.  Raise
+        a ValueError if it isn't one.  The file says whether the text is
+        str or bytes, so the type checker can't tell."""
+        with open(path, 'rb') as file:
+            if file.read(len(TextIndex.MAGIC)) != TextIndex.MAGIC:
+                raise ValueError('{0} is not a TextIndex file'.format(path))
+            header = file.read(TextIndex._HEADER.size)
+            if len(header) != TextIndex._HEADER.size:
+                raise ValueError('{0} is truncated'.format(path))
+            is_str, typecode, fm_index, size = TextIndex._HEADER.unpack(header)
+            encoded = file.read(size)
+            if len(encoded) != size:
+                raise ValueError('{0} is truncated'.format(path))
+            index: 'TextIndex[Any]' = cls.__new__(cls)
+            index.text = encoded.decode() if is_str else encoded
+            index._sa = TextIndex._read_array(file, typecode.decode(), len(index.text) + 1)
+            index._lcp = TextIndex._read_array(file, typecode.decode(), len(index.text) + 1)
+        index._minima = TextIndex._make_minima(index._sa)
+        index._fm = index._make_fm_index() if fm_index else None
+        return index
+
+    @staticmethod
+    def _write_array(file: BinaryIO, column: array) -> None:
+        """Write COLUMN to FILE, little-endian whatever the machine."""
+        if sys.byteorder == 'big':
+            column = array(column.typecode, column)
+            column.byteswap()
+        column.tofile(file)
+
+    @staticmethod
+    def _read_array(file: BinaryIO, typecode: str, length: int) -> array:
+        """Read an array of LENGTH items written by _write_array()."""
+        column = array(typecode)
+        try:
+            column.fromfile(file, length)
+        except EOFError:
+            raise ValueError('{0} is truncated'.format(file.name)) from None
+        if sys.byteorder == 'big':
+            column.byteswap()
+        return column
@@ -0,0 +1,110 @@
+"""Concurrency benchmark: throughput of a shared ConcurrentSkiplist
+against a plain Skiplist behind one lock, for 1 to 16 threads.
+
+The map starts with N keys.  Each thread then does OPS operations on
+random keys, a given fraction of them writes (half inserts, half
+deletes) and the rest lookups.  The benchmark reports the total
+operations per second across all threads.  With the coarse lock every
+lookup waits for the lock; ConcurrentSkiplist's lookups never do.
+
+Under a GIL, threads still run Python code one at a time, so extra
+threads cannot speed things up; what this shows is how much each design
+loses to lock handoffs as the thread count grows.  On a free-threaded
+build, the lock-free lookups can also run in parallel.
+
+Run from the repository root, preferably with assertions turned off:
+
+    python -O benchmarks/bench_concurrent.py [WRITE_FRACTION ...]
+
+The default write fractions are 0.1 and 0.5; N is 10**5 and OPS is
+20000.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ConcurrentSkiplist import ConcurrentSkiplist
+from Skiplist import Skiplist
+
+N = 10**5
+OPS = 20000
+THREADS = [1, 2, 4, 8, 16]
+
+
+class LockedSkiplist:
+    """A Skiplist with every operation behind one lock."""
+
+    def __init__(self, skiplist: Skiplist) -> None:
+        self._skiplist = skiplist
+        self._lock = threading.Lock()
+
+    def get(self, key: int) -> Any:
+        with self._lock:
+            return self._skiplist.get(key)
+
+    def __setitem__(self, key: int, value: Any) -> None:
+        with self._lock:
+            self._skiplist[key] = value
+
+    def pop(self, key: int, default: Any) -> Any:
+        with self._lock:
+            return self._skiplist.pop(key, default)
+
+
+def build_locked() -> LockedSkiplist:
+    return LockedSkiplist(Skiplist.from_sorted(((i, i) for i in range(0, 2 * N, 2)), seed=15))
+
+def build_concurrent() -> ConcurrentSkiplist:
+    return ConcurrentSkiplist.from_sorted(((i, i) for i in range(0, 2 * N, 2)), seed=15)
+
+IMPLEMENTATIONS: List[Callable[[], Any]] = [build_locked, build_concurrent]
+
+
+def worker(shared: Any, seed: int, write_fraction: float, start: threading.Barrier) -> None:
+    rng = random.Random(seed)
+    keys = [rng.randrange(2 * N) for i in range(OPS)]
+    writes = [rng.random() < write_fraction for i in range(OPS)]
+    start.wait()
+    for key, write in zip(keys, writes):
+        if not write:
+            shared.get(key)
+        elif key & 2:
+            shared[key] = key
+        else:
+            shared.pop(key, None)
+
+
+def throughput(factory: Callable[[], Any], threads: int, write_fraction: float) -> float:
+    """Return the operations per second for THREADS threads."""
+    shared = factory()
+    start = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(shared, seed, write_fraction, start))
+               for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * OPS / (time.perf_counter() - began)
+
+
+def main(fractions: List[float]) -> None:
+    print('{0:<18}{1:>8}'.format('structure', 'writes') +
+          ''.join('{0:>12}'.format(str(t) + ' thr') for t in THREADS) + '   (ops/s)')
+    for write_fraction in fractions:
+        for factory in IMPLEMENTATIONS:
+            row = '{0:<18}{1:>8.0%}'.format(factory.__name__[len('build_'):], write_fraction)
+            for threads in THREADS:
+                row += '{0:>12.0f}'.format(throughput(factory, threads, write_fraction))
+            print(row, flush=True)
+
+
+if __name__ == '__main__':
+    main([float(arg) for arg in sys.argv[1:]] or [0.1, 0.5])
@@ -0,0 +1,108 @@
+"""Matcher benchmark: every algorithm in Matcher.ALGORITHMS against
+str.find(), in MB/s.
+
+Each case finds every (possibly overlapping) occurrence of a pattern in
+a text, so every algorithm reads the whole text.  The patterns are
+compiled first, so the times leave out building the tables.  There are
+three groups of cases:
+
+  * random text over alphabets of 2, 4 and 26 letters, searched for
+    random patterns of 4, 16 and 64 letters taken from the text;
+  * adversarial inputs: a pattern that almost matches everywhere
+    ('a' * (m-1) + 'b' in a text of 'a's, the simple matcher's worst
+    case), one that mismatches at its other end ('b' + 'a' * (m-1),
+    bad for BM without Galil's rule), and one that does match
+    everywhere ('a' * m);
+  * the public simple_matcher(), KMP_matcher() and BM_matcher() on an
+    absent pattern, with their fast paths and with Matcher.DEBUG set.
+
+Run from the repository root, preferably with assertions turned off:
+
+    python -O benchmarks/bench_matcher.py [MEGABYTES]
+
+The default is 1 MB of text.
+"""
+
+import os
+import random
+import string
+import sys
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Matcher import Matcher
+
+ALPHABETS: List[str] = ['ab', 'ACGT', string.ascii_lowercase]
+LENGTHS: List[int] = [4, 16, 64]
+NAMES: List[str] = list(Matcher.ALGORITHMS) + ['str.find']
+
+
+def find_all(pattern: str, text: str) -> int:
+    """Count the occurrences of PATTERN in TEXT with str.find()."""
+    count = 0
+    i = text.find(pattern)
+    while i >= 0:
+        count += 1
+        i = text.find(pattern, i + 1)
+    return count
+
+
+def rate(search: Callable[[], object], size: int) -> float:
+    """Return the MB/s of SEARCH over SIZE characters, best of 3."""
+    best = float('inf')
+    for trial in range(3):
+        start = time.perf_counter()
+        search()
+        best = min(best, time.perf_counter() - start)
+    return size / 2**20 / best
+
+
+def row(label: str, pattern: str, text: str, alphabet: str) -> None:
+    rates = []
+    for algorithm in Matcher.ALGORITHMS:
+        compiled = Matcher.compile(pattern, algorithm, alphabet)
+        rates.append(rate(lambda: sum(1 for i in compiled.finditer(text)), len(text)))
+    rates.append(rate(lambda: find_all(pattern, text), len(text)))
+    print('{0:<24}'.format(label) + ''.join('{0:>10.2f}'.format(r) for r in rates),
+          flush=True)
+
+
+def main(megabytes: float) -> None:
+    n = int(megabytes * 2**20)
+    rng = random.Random(24)
+    print('{0:<24}'.format('case (MB/s)') + ''.join('{0:>10}'.format(name) for name in NAMES))
+    for alphabet in ALPHABETS:
+        text = ''.join(rng.choice(alphabet) for i in range(n))
+        for m in LENGTHS:
+            start = rng.randrange(n - m)
+            row('|A|={0:<3} m={1}'.format(len(alphabet), m),
+                text[start:start + m], text, alphabet)
+
+    text = 'a' * n
+    adversarial: List[Tuple[str, Callable[[int], str]]] = [
+        ('a..ab', lambda m: 'a' * (m - 1) + 'b'),
+        ('ba..a', lambda m: 'b' + 'a' * (m - 1)),
+        ('a..a', lambda m: 'a' * m)]
+    for name, make in adversarial:
+        for m in LENGTHS:
+            row('{0} m={1}'.format(name, m), make(m), text, 'ab')
+
+    print()
+    print('{0:<24}{1:>10}{2:>10}'.format('first match (MB/s)', 'fast', 'DEBUG'))
+    text = ''.join(rng.choice('ACGT') for i in range(n))
+    pattern = 'ACGT' * 4 + 'A'
+    while pattern in text:
+        pattern += 'A'
+    for matcher in (Matcher.simple_matcher, Matcher.KMP_matcher, Matcher.BM_matcher):
+        rates = []
+        for debug in (False, True):
+            Matcher.DEBUG = debug
+            rates.append(rate(lambda: matcher(pattern, text), n))
+        Matcher.DEBUG = False
+        print('{0:<24}{1:>10.2f}{2:>10.2f}'.format(matcher.__name__, *rates), flush=True)
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,73 @@
+"""Memory benchmark: bytes per entry for the repo's ordered containers.
+
+Each structure is built from the same keys, and tracemalloc reports how
+much memory the finished structure holds, not counting the key objects
+themselves (they are shared with a list made beforehand).  A dict is
+included as a point of reference.
+
+Run from the repository root, preferably with assertions turned off:
+
+    python -O benchmarks/bench_memory.py [SIZE ...]
+
+The default sizes are 10**5 and 10**6.
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from AVLTree import AVLTree
+from BST import BST
+from CompactAVLTree import CompactAVLTree
+from Skiplist import Skiplist
+
+
+def build_skiplist(keys: List[int]) -> Skiplist:
+    skiplist = Skiplist(seed=203)
+    for key in keys:
+        skiplist[key] = key
+    return skiplist
+
+def build_dict(keys: List[int]) -> dict:
+    return {key: key for key in keys}
+
+
+# (name, builder) pairs; each builder takes a list of distinct keys
+STRUCTURES: List[Tuple[str, Callable[[List[int]], Any]]] = [
+    ('dict (reference)', build_dict),
+    ('BST', BST.from_iterable),
+    ('AVLTree', AVLTree.from_iterable),
+    ('CompactAVLTree', CompactAVLTree.from_iterable),
+    ("CompactAVLTree('q')", lambda keys: CompactAVLTree.from_iterable(keys, 'q')),
+    ('Skiplist', build_skiplist),
+]
+
+
+def bytes_per_entry(builder: Callable[[List[int]], Any], keys: List[int]) -> float:
+    """Build a structure from KEYS and return the memory it holds per key."""
+    tracemalloc.start()
+    structure = builder(keys)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return current / len(keys)
+
+
+def main(sizes: List[int]) -> None:
+    random.seed(203)
+    print('{0:<22}'.format('structure') +
+          ''.join('{0:>14}'.format('n=' + str(n)) for n in sizes))
+    keysBySize = {n: random.sample(range(10 * n), n) for n in sizes}
+    for name, builder in STRUCTURES:
+        row = '{0:<22}'.format(name)
+        for n in sizes:
+            row += '{0:>14.1f}'.format(bytes_per_entry(builder, keysBySize[n]))
+        print(row, flush=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10**5, 10**6])
@@ -0,0 +1,73 @@
+"""Parallel search benchmark: Matcher.parallel_search_file() with 1, 2,
+4, ... processes, up to the number of CPUs, against search_file().
+
+The benchmark writes a file of random lower-case text with a pattern
+planted 16 times in each megabyte, searches it with each algorithm and number
+of processes, and reports MB/s and the speedup over one process.
+
+Run from the repository root:
+
+    python -O benchmarks/bench_parallel.py [MEGABYTES]
+
+The default is 32 MB.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Matcher import Matcher
+
+PATTERN = b'needle in a haystack'
+ALGORITHMS: List[str] = ['KMP', 'Horspool']
+
+
+def make_file(megabytes: int) -> str:
+    """Write the test file, and return its path."""
+    rng = random.Random(23)
+    handle, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(handle, 'wb') as file:
+        for i in range(megabytes):
+            block = bytearray(rng.choice(b'abcdefghijklmnopqrstuvwxyz \n')
+                              for j in range(1 << 20))
+            for j in range(16):
+                at = rng.randrange(len(block) - len(PATTERN))
+                block[at:at + len(PATTERN)] = PATTERN
+            file.write(block)
+    return path
+
+
+def main(megabytes: int) -> None:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    path = make_file(megabytes)
+    try:
+        print('{0:<10}{1:>10}{2:>10}{3:>10}{4:>10}'.format(
+            'algorithm', 'processes', 'matches', 'MB/s', 'speedup'))
+        for algorithm in ALGORITHMS:
+            base = None
+            for processes in counts:
+                start = time.perf_counter()
+                if processes == 1:
+                    found = list(Matcher.search_file(path, PATTERN, algorithm))
+                else:
+                    found = Matcher.parallel_search_file(path, PATTERN, algorithm,
+                                                         processes=processes)
+                elapsed = time.perf_counter() - start
+                base = base or elapsed
+                print('{0:<10}{1:>10}{2:>10}{3:>10.2f}{4:>10.2f}'.format(
+                    algorithm, processes, len(found), megabytes / elapsed, base / elapsed),
+                    flush=True)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
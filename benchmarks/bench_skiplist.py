@@ -0,0 +1,100 @@
+"""Skiplist benchmark: the tower layout (Skiplist) against the
+forward-pointer-array layout (PughSkiplist).
+
+For each size, both structures get the same random keys, and each is
+built with the same seed, so runs are reproducible.  The benchmark
+reports the time to insert them all, look them all up, iterate over them
+in order and delete them all, plus the memory held per entry.  A
+second table times loading a sorted batch into a Skiplist, one insert()
+at a time against update_sorted() and from_sorted().
+
+Run from the repository root, preferably with assertions turned off:
+
+    python -O benchmarks/bench_skiplist.py [SIZE ...]
+
+The default sizes are 10**4 and 10**5.
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from PughSkiplist import PughSkiplist
+from Skiplist import Skiplist
+
+IMPLEMENTATIONS: List[Callable[..., Any]] = [Skiplist, PughSkiplist]
+
+
+def run(factory: Callable[..., Any], keys: List[int]) -> List[float]:
+    """Return [insert s, search s, iterate s, delete s, bytes/entry]."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    skiplist = factory(seed=16)
+    for key in keys:
+        skiplist[key] = key
+    insert = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0] / len(keys)
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for key in keys:
+        skiplist[key]
+    search = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in skiplist:
+        pass
+    iterate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        del skiplist[key]
+    delete = time.perf_counter() - start
+    return [insert, search, iterate, delete, memory]
+
+
+def sorted_batch(n: int) -> List[float]:
+    """Return [insert() s, update_sorted() s, from_sorted() s] for adding
+    n sorted keys to a Skiplist that already holds n other keys."""
+    results = []
+    for method in ('insert', 'update_sorted', 'from_sorted'):
+        if method == 'from_sorted':
+            start = time.perf_counter()
+            Skiplist.from_sorted(((2 * i + 1, i) for i in range(n)), seed=16)
+        else:
+            skiplist = Skiplist.from_sorted(((2 * i, i) for i in range(n)), seed=16)
+            start = time.perf_counter()
+            if method == 'insert':
+                for i in range(n):
+                    skiplist.insert(2 * i + 1, i)
+            else:
+                skiplist.update_sorted((2 * i + 1, i) for i in range(n))
+        results.append(time.perf_counter() - start)
+    return results
+
+
+def main(sizes: List[int]) -> None:
+    print('{0:<14}{1:>10}{2:>10}{3:>10}{4:>10}{5:>10}{6:>12}'.format(
+        'structure', 'n', 'insert s', 'search s', 'iter s', 'delete s', 'bytes/key'))
+    for n in sizes:
+        keys = random.Random(n).sample(range(10 * n), n)
+        for factory in IMPLEMENTATIONS:
+            results = run(factory, keys)
+            print('{0:<14}{1:>10}{2:>10.3f}{3:>10.3f}{4:>10.3f}{5:>10.3f}{6:>12.1f}'.format(
+                factory.__name__, n, *results), flush=True)
+
+    print()
+    print('{0:>10}{1:>12}{2:>16}{3:>16}'.format(
+        'n', 'insert() s', 'update_sorted s', 'from_sorted s'))
+    for n in sizes:
+        print('{0:>10}{1:>12.3f}{2:>16.3f}{3:>16.3f}'.format(n, *sorted_batch(n)),
+              flush=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10**4, 10**5])
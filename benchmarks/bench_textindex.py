@@ -0,0 +1,82 @@
+"""TextIndex benchmark: many queries against one fixed text, with a
+TextIndex (with and without the FM-index) against compiled Matcher
+patterns and str.find().
+
+The text is random words from wordlist.txt; the queries are words and
+word pairs from the same list, some present and some not.  The
+benchmark reports the time to build each index, and the time per query
+to count a pattern's occurrences.
+
+Run from the repository root, preferably with assertions turned off:
+
+    python -O benchmarks/bench_textindex.py [MEGABYTES]
+
+The default is 1 MB of text.
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from Matcher import Matcher
+from TextIndex import TextIndex
+
+QUERIES = 200
+
+
+def count_find(pattern: str, text: str) -> int:
+    """Count the occurrences of PATTERN in TEXT with str.find()."""
+    count = 0
+    i = text.find(pattern)
+    while i >= 0:
+        count += 1
+        i = text.find(pattern, i + 1)
+    return count
+
+
+def per_query(search: Callable[[str], int], patterns: List[str]) -> float:
+    """Return the mean seconds per call of SEARCH over PATTERNS."""
+    start = time.perf_counter()
+    for pattern in patterns:
+        search(pattern)
+    return (time.perf_counter() - start) / len(patterns)
+
+
+def main(megabytes: float) -> None:
+    with open(os.path.join(ROOT, 'wordlist.txt')) as file:
+        words = file.read().split()
+    rng = random.Random(25)
+    parts: List[str] = []
+    size = 0
+    while size < megabytes * 2**20:
+        parts.append(rng.choice(words))
+        size += len(parts[-1]) + 1
+    text = ' '.join(parts)
+    patterns = [rng.choice(words) if i % 2 else rng.choice(words) + ' ' + rng.choice(words)
+                for i in range(QUERIES)]
+
+    print('{0:<22}{1:>10}{2:>14}'.format('method', 'build s', 'ms/query'))
+    for fm_index in (False, True):
+        start = time.perf_counter()
+        index = TextIndex(text, fm_index)
+        build = time.perf_counter() - start
+        print('{0:<22}{1:>10.2f}{2:>14.4f}'.format(
+            'TextIndex' + (' + FM' if fm_index else ''), build,
+            1000 * per_query(index.count, patterns)), flush=True)
+    for algorithm in ('KMP', 'Horspool'):
+        compiled = {pattern: Matcher.compile(pattern, algorithm) for pattern in patterns}
+        print('{0:<22}{1:>10}{2:>14.4f}'.format(
+            'Matcher ' + algorithm, '-',
+            1000 * per_query(lambda p: sum(1 for i in compiled[p].finditer(text)),
+                             patterns)), flush=True)
+    print('{0:<22}{1:>10}{2:>14.4f}'.format(
+        'str.find', '-', 1000 * per_query(lambda p: count_find(p, text), patterns)))
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1)